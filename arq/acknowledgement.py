@@ -0,0 +1,88 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+
+class Acknowledgement:
+    '''
+    The feedback sent by the receiver about a single package
+
+    Attributes
+    ----------
+    sequence : int
+        Sequence number of the package
+    positive : bool
+        True for the acknowledgement (ACK), False for the negative one (NAK)
+
+    Methods
+    -------
+    getSequence()
+        Get the sequence number of the package
+    isPositive()
+        Check if the package was received intact
+    getBitsNumber()
+        Get the amount of bits sent over the connection
+    '''
+
+    __slots__ = ('sequence', 'positive')
+
+    # The sequence number and the type of the feedback
+    BITS = 32 + 8
+
+    def __init__(self, sequence: int, positive: bool = True) -> None:
+        '''
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        positive : bool
+            True for the acknowledgement (ACK), False for the negative one (NAK)
+        '''
+        self.sequence = sequence
+        self.positive = positive
+
+    def getSequence(self) -> int:
+        ''' Get the sequence number of the package
+
+        Returns
+        ----------
+        int
+            Sequence number of the package
+        '''
+        return self.sequence
+
+    def isPositive(self) -> bool:
+        ''' Check if the package was received intact
+
+        Returns
+        ----------
+        bool
+            True for the acknowledgement (ACK), False for the negative one (NAK)
+        '''
+        return self.positive
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the feedback
+        '''
+        return self.BITS
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -14,9 +14,17 @@
     limitations under the License.
 '''
 
-import struct
-
 from arq.package import Package
+from arq.packagebatch import PackageBatch
+from arq.reassemblybuffer import ReassemblyBuffer
+from utils.bits import xorBytes
+from utils.profiler import span
+
+# Maps the XOR of the received and recalculated parity to the validity flag
+VALIDITY_TABLE = bytes([1] + [0] * 255)
+
+# Maps every byte to the flag showing if it has any bit set
+NONZERO_TABLE = bytes([0] + [1] * 255)
 
 
 class Codec:
@@ -29,6 +37,14 @@ class Codec:
         Size of the package
     pbits: int
         Amount of parity bits
+    frame_size : int
+        Amount of bytes of the data of every package
+    encoded_counter : Counter
+        Amount of the packages packed, None without the metrics
+    decoded_counter : Counter
+        Amount of the packages unpacked, None without the metrics
+    failed_counter : Counter
+        Amount of the altered packages unpacked, None without the metrics
 
     Methods
     -------
@@ -36,13 +52,32 @@ class Codec:
         Pack the data into packages
     unpack(data)
         Unpack the packages
+    unpackInto(data, buffer, index)
+        Unpack the packages into the reassembly buffer
+    packBatch(data)
+        Pack the whole buffer into a single batch
+    unpackBatch(batch)
+        Unpack the whole batch at once
     calculateParity(data, bits)
         Calculate parity for the data
     checkParity(data, bits, parity)
         Check if the parity is correct
+    calculateChecksum(frame)
+        Calculate the check bits of the package data
+    decodeFrame(frame, parity)
+        Check the package data
+    getCheckWidth()
+        Get the amount of check bits of a package
+    getFailureProbability(ber, size)
+        Estimate the probability of a package to be reported as altered
+    setMetrics(metrics)
+        Sets the registry of the metrics
     '''
 
-    def __init__(self, package_size: int, pbits: int) -> None:
+    # The range of the supported amount of bytes in a package
+    FRAME_SIZES = range(1, 65537)
+
+    def __init__(self, package_size: int, pbits: int, frame_size: int = 1) -> None:
         '''
         Parameters
         ----------
@@ -50,13 +85,27 @@ class Codec:
             Size of the package
         pbits: int
             Amount of parity bits
+        frame_size : int
+            Amount of bytes of the data of every package
         '''
         # Check if the size of package is correct
         if package_size not in range(5, 8):
             raise ValueError("Package size must be in range [5, 7]")
 
+        # Check if the size of frame is correct
+        if frame_size not in self.FRAME_SIZES:
+            raise ValueError("Frame size must be in range [1, 65536]")
+
         self.package_size = package_size
         self.pbits = pbits
+        self.frame_size = frame_size
+
+        # Parity of every possible byte, used by the batch mode
+        self.parity_tables = self._buildParityTables()
+
+        self.encoded_counter = None
+        self.decoded_counter = None
+        self.failed_counter = None
 
     def pack(self, data: bytearray) -> list:
         '''Pack the data into packages
@@ -71,21 +120,27 @@ class Codec:
         list
             Packages with the parts of the data
         '''
-        packed = list()
+        with span("codec.pack"):
+            packed = list()
 
-        # Iterate over the bytes
-        for byte in data:
-            parity = self.calculateParity(byte, self.pbits)
+            # Iterate over the frames
+            for offset in range(0, len(data), self.frame_size):
+                frame = bytes(data[offset:offset + self.frame_size])
+                parity = self.calculateChecksum(frame)
 
-            # Fill the package
-            package = Package(self.package_size, self.pbits)
-            package.setValue(struct.pack("B", byte))
-            package.setParityBits(parity)
+                # Fill the package
+                package = Package(self.package_size, self.pbits,
+                                  self.frame_size, self.getCheckWidth())
+                package.setValue(frame)
+                package.setParityBits(parity)
 
-            # Append the package
-            packed.append(package)
+                # Append the package
+                packed.append(package)
 
-        return packed
+            if self.encoded_counter != None:
+                self.encoded_counter.inc(len(packed))
+
+            return packed
 
     def unpack(self, data: list) -> dict:
         '''Unpack the packages
@@ -108,15 +163,108 @@ class Codec:
             parity = package.getParityBits()
 
             # If the package was altered, push the error value to the array
-            if self.checkParity(struct.unpack("B", value)[0], self.pbits, parity) == True:
-                unpacked[index] = value
-            else:
-                unpacked[index] = None
+            unpacked[index] = self.decodeFrame(value, parity)
 
             index += 1
 
         return unpacked
 
+    def unpackInto(self, data: list, buffer: ReassemblyBuffer, index: int = 0) -> ReassemblyBuffer:
+        '''Unpack the packages into the reassembly buffer
+
+        Parameters
+        ----------
+        data : list
+            A list of packages to unpack
+        buffer : ReassemblyBuffer
+            The buffer to store the intact packages to
+        index : int
+            Index of the first package in the buffer
+
+        Returns
+        -------
+        ReassemblyBuffer
+            The buffer with the intact packages stored and the altered ones
+            counted
+        '''
+        for package in data:
+            value = self.decodeFrame(package.getValue(), package.getParityBits())
+
+            if value != None:
+                buffer.store(index, value)
+            else:
+                buffer.markFailed(index)
+
+            index += 1
+
+        return buffer
+
+    def packBatch(self, data: bytearray) -> PackageBatch:
+        '''Pack the whole buffer into a single batch
+
+        Parameters
+        ----------
+        data : bytearray
+            The data to pack, any object supporting the buffer protocol
+
+        Returns
+        -------
+        PackageBatch
+            The batch with all the data and its parity bits
+        '''
+        with span("codec.pack"):
+            value = bytearray(data)
+            parity = self._calculateBatchParity(value)
+
+            batch = PackageBatch(self.package_size, self.pbits, value, parity,
+                                 self.getCheckWidth(), self.frame_size)
+            if self.encoded_counter != None:
+                self.encoded_counter.inc(len(batch))
+
+            return batch
+
+    def unpackBatch(self, batch: PackageBatch) -> tuple:
+        '''Unpack the whole batch at once
+
+        Parameters
+        ----------
+        batch : PackageBatch
+            The batch to unpack
+
+        Returns
+        -------
+        tuple
+            The unpacked data and the validity mask, which holds 1 for
+            every intact package and 0 for every altered one
+        '''
+        # Only the packages of a single byte can be looked up in the tables,
+        # the rest are measured by decodeFrame()
+        if self.frame_size != 1:
+            return self._unpackFrames(batch)
+
+        with span("codec.unpack"):
+            value = batch.getValue()
+            parity = self._calculateBatchParity(bytes(value))
+
+            # Packages are valid where the parity hasn't changed
+            altered = xorBytes(parity, batch.getParityBits()).translate(NONZERO_TABLE)
+
+            # Merge the flags of all the bytes holding the parity of a package
+            check_size = len(self.parity_tables)
+            if check_size > 1:
+                flags = int.from_bytes(altered[0::check_size], 'big')
+                for index in range(1, check_size):
+                    flags |= int.from_bytes(altered[index::check_size], 'big')
+
+                altered = flags.to_bytes(len(value), 'big')
+
+            # The packages looked up in the tables skip decodeFrame()
+            mask = bytearray(altered.translate(VALIDITY_TABLE))
+            if self.decoded_counter != None:
+                self._countDecoded(len(mask), mask.count(0))
+
+            return value, mask
+
     def calculateParity(self, data: int, bits: int) -> int:
         ''' Calculate parity for the data
 
@@ -163,6 +311,220 @@ class Codec:
 
         return parity == current_parity
 
+    def calculateChecksum(self, frame: bytes) -> int:
+        ''' Calculate the check bits of the package data
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+
+        Returns
+        -------
+        int
+            Parity bit of the whole package
+        '''
+        if len(frame) == 1:
+            return self.calculateParity(frame[0], self.pbits)
+
+        # Every bit of the multi-byte package is covered by the parity
+        return int.from_bytes(frame, 'big').bit_count() & 1
+
+    def decodeFrame(self, frame: bytes, parity: int) -> bytes:
+        ''' Check the package data
+
+        Every package checked is counted by the metrics, the check itself
+        is done by _decodeFrame(), which the codecs override.
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+        parity : int
+            Received check bits
+
+        Returns
+        -------
+        bytes
+            The data of the package, None if it was altered
+        '''
+        with span("codec.unpack"):
+            value = self._decodeFrame(frame, parity)
+
+        if self.decoded_counter != None:
+            self._countDecoded(1, value == None)
+
+        return value
+
+    def _decodeFrame(self, frame: bytes, parity: int) -> bytes:
+        '''Helper method checking the package data
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+        parity : int
+            Received check bits
+        '''
+        if len(frame) == 1:
+            valid = self.checkParity(frame[0], self.pbits, parity)
+        else:
+            valid = self.calculateChecksum(frame) == parity
+
+        return frame if valid else None
+
+    def getCheckWidth(self) -> int:
+        ''' Get the amount of check bits of a package
+
+        Returns
+        -------
+        int
+            Amount of check bits
+        '''
+        return 1
+
+    def getFrameSize(self) -> int:
+        ''' Get the amount of bytes of the data of every package
+
+        Returns
+        -------
+        int
+            Amount of bytes of the data of every package
+        '''
+        return self.frame_size
+
+    def getFailureProbability(self, ber: float, size: int = None) -> float:
+        ''' Estimate the probability of a package to be reported as altered
+
+        The noise of the connection alters the data of a package only.
+
+        Parameters
+        ----------
+        ber : float
+            The probability of a bit to be flipped
+        size : int
+            Amount of bytes of the data, the frame size is used if it's None
+
+        Returns
+        -------
+        float
+            The probability of the package to fail the check
+        '''
+        # A single bit of the single byte package is checked, every bit of
+        # the longer one
+        size = size if size != None else self.frame_size
+        bits = 1 if size == 1 else size * 8
+
+        # The parity only detects the odd amount of the flipped bits
+        return (1 - (1 - 2 * ber) ** bits) / 2
+
+    def setMetrics(self, metrics) -> None:
+        ''' Sets the registry of the metrics
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        labels = {"codec": type(self).__name__}
+        self.encoded_counter = metrics.counter(
+            "arq_codec_encoded_total", "Packages packed", labels)
+        self.decoded_counter = metrics.counter(
+            "arq_codec_decoded_total", "Packages unpacked", labels)
+        self.failed_counter = metrics.counter(
+            "arq_codec_failed_total", "Altered packages unpacked", labels)
+
+    def _countDecoded(self, frames: int, failed: int) -> None:
+        '''Helper method counting the unpacked packages
+
+        Parameters
+        ----------
+        frames : int
+            Amount of the packages unpacked
+        failed : int
+            Amount of the altered ones
+        '''
+        self.decoded_counter.inc(frames)
+        self.failed_counter.inc(failed)
+
+    def _buildParityTables(self) -> list:
+        '''Helper method for the batch parity tables calculation
+
+        Every table maps a byte to a single byte of its parity, starting from
+        the most significant one.
+        '''
+        parity = [self.calculateParity(byte, self.pbits)
+                  for byte in range(0, 256)]
+
+        check_size = (self.getCheckWidth() + 7) // 8
+        tables = list()
+        for index in reversed(range(0, check_size)):
+            shift = index * 8
+            tables.append(bytes((value >> shift) & 0xFF for value in parity))
+
+        return tables
+
+    def _calculateBatchParity(self, value: bytes) -> bytes:
+        '''Helper method for the parity calculation of the whole batch
+
+        Parameters
+        ----------
+        value : bytes
+            The data of the batch
+        '''
+        check_size = len(self.parity_tables)
+
+        if self.frame_size != 1:
+            parity = list()
+            for offset in range(0, len(value), self.frame_size):
+                checksum = self.calculateChecksum(value[offset:offset + self.frame_size])
+                parity.append(checksum.to_bytes(check_size, 'big'))
+
+            return b''.join(parity)
+
+        if check_size == 1:
+            return value.translate(self.parity_tables[0])
+
+        # Interleave the bytes of the parity of every package
+        parity = bytearray(len(value) * check_size)
+        for index, table in enumerate(self.parity_tables):
+            parity[index::check_size] = value.translate(table)
+
+        return bytes(parity)
+
+    def _unpackFrames(self, batch: PackageBatch) -> tuple:
+        '''Helper method unpacking the batch of multi-byte packages one by one
+
+        Parameters
+        ----------
+        batch : PackageBatch
+            The batch to unpack
+        '''
+        value = bytes(batch.getValue())
+        parity = batch.getParityBits()
+        check_size = batch.getCheckSize()
+
+        unpacked = bytearray(value)
+        mask = bytearray(len(batch))
+
+        for index in range(0, len(batch)):
+            start = index * self.frame_size
+            frame = value[start:start + self.frame_size]
+            checksum = int.from_bytes(
+                parity[index * check_size:(index + 1) * check_size], 'big')
+
+            decoded = self.decodeFrame(frame, checksum)
+            if decoded == None:
+                continue
+
+            # The codec may have corrected the data
+            if decoded != frame:
+                unpacked[start:start + len(decoded)] = decoded
+
+            mask[index] = 1
+
+        return unpacked, mask
+
 
 if __name__ == '__main__':
     print("This file shouldn't be used as a separate script!")
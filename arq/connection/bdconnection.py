@@ -17,6 +17,7 @@
 import arq
 from arq.connection import iconnection
 from arq.package import Package
+from arq.simulation.scheduler import Scheduler
 from arq.transceiver import Transceiver
 
 
@@ -24,10 +25,28 @@ class BidirectionalConnection(iconnection.IConnection):
     '''
     Bi-directional connection implementation
 
+    Without a scheduler the data is delivered immediately. With a scheduler
+    the delivery is an event happening after the transmission time of the
+    data and the propagation delay, while the data sent in the same
+    direction is queued until the previous one is transmitted.
+
     Attributes
     ----------
     nodes: list
         List of transceivers used in the connection
+    scheduler : Scheduler
+        The scheduler of the simulation, None for the immediate delivery
+    delay : float
+        The propagation delay (in seconds)
+    bitrate : float
+        The transmission rate (in bits per second), None for no limit
+    busy : list
+        The virtual time until which every direction is transmitting
+    bits_counters : list
+        Amount of bits sent in every direction, None without the metrics
+    latency_histograms : list
+        The distribution of the delivery time in every direction, None
+        without the metrics
 
     Methods
     -------
@@ -35,6 +54,14 @@ class BidirectionalConnection(iconnection.IConnection):
         Send the data over the connection
     connect(transceiver)
         Connect the transceiver
+    setScheduler(scheduler, delay, bitrate)
+        Simulate the timing of the connection with the scheduler
+    getTransmissionTime(data)
+        Get the time needed to transmit the data
+    getBitsNumber(data)
+        Get the amount of bits of the data
+    setMetrics(metrics)
+        Sets the registry of the metrics
     '''
 
     def __init__(self, a: Transceiver, b: Transceiver) -> None:
@@ -49,6 +76,13 @@ class BidirectionalConnection(iconnection.IConnection):
 
         self.nodes = list()
 
+        self.scheduler = None
+        self.delay = 0.0
+        self.bitrate = None
+        self.busy = [0.0, 0.0]
+        self.bits_counters = None
+        self.latency_histograms = None
+
         # Connect the transceivers
         self.connect(a)
         self.connect(b)
@@ -67,8 +101,93 @@ class BidirectionalConnection(iconnection.IConnection):
         # Get the right receiver
         receiver = self.nodes[0 if id == 1 else 1]
 
+        if self.bits_counters != None:
+            self.bits_counters[id].inc(self.getBitsNumber(data))
+
         # Pass the signal
-        receiver.receive(data)
+        if self.scheduler == None:
+            receiver.receive(data)
+            return
+
+        # Wait for the previous data sent in the same direction
+        start = max(self.scheduler.now(), self.busy[id])
+        self.busy[id] = start + self.getTransmissionTime(data)
+
+        # The data waits for the queue, the transmission and the propagation
+        if self.latency_histograms != None:
+            self.latency_histograms[id].record(self.busy[id] + self.delay - self.scheduler.now())
+
+        self.scheduler.scheduleAt(self.busy[id] + self.delay, receiver.receive, data)
+
+    def setScheduler(self, scheduler: Scheduler, delay: float = 0.0, bitrate: float = None) -> None:
+        '''Simulate the timing of the connection with the scheduler
+
+        Parameters
+        ----------
+        scheduler : Scheduler
+            The scheduler of the simulation
+        delay : float
+            The propagation delay (in seconds)
+        bitrate : float
+            The transmission rate (in bits per second), None for no limit
+        '''
+        self.scheduler = scheduler
+        self.delay = delay
+        self.bitrate = bitrate
+
+    def getTransmissionTime(self, data: list) -> float:
+        '''Get the time needed to transmit the data
+
+        Parameters
+        ----------
+        data: list
+            The data to send, a list of packages or a package batch
+
+        Returns
+        -------
+        float
+            The transmission time (in seconds)
+        '''
+        if not self.bitrate:
+            return 0.0
+
+        return self.getBitsNumber(data) / self.bitrate
+
+    def getBitsNumber(self, data: list) -> int:
+        '''Get the amount of bits of the data
+
+        Parameters
+        ----------
+        data: list
+            The data to send, a list of packages, a single package, a
+            package batch or a feedback frame
+
+        Returns
+        -------
+        int
+            Amount of bits sent over the connection
+        '''
+        if isinstance(data, list):
+            return sum(package.getBitsNumber() for package in data)
+
+        return data.getBitsNumber()
+
+    def setMetrics(self, metrics) -> None:
+        '''Sets the registry of the metrics
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        self.bits_counters = list()
+        self.latency_histograms = list()
+        for id in range(0, 2):
+            labels = {"direction": id}
+            self.bits_counters.append(metrics.counter(
+                "arq_connection_bits_total", "Bits sent over the connection", labels))
+            self.latency_histograms.append(metrics.histogram(
+                "arq_connection_latency_seconds", "Time from sending to the delivery on the virtual clock", labels))
 
     def connect(self, transceiver: Transceiver) -> None:
         '''Connect the transceiver
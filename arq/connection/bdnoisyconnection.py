@@ -14,12 +14,13 @@
     limitations under the License.
 '''
 
-import random
-
 from arq.connection.inoisyconnection import INoisyConnection
 from arq.connection.bdconnection import BidirectionalConnection
+from arq.connection.noisegenerator import NoiseGenerator
 from arq.package import Package
+from arq.packagebatch import PackageBatch
 from arq.transceiver import Transceiver
+from utils.profiler import span
 
 
 class BidirectionalNoisyConnection(BidirectionalConnection, INoisyConnection):
@@ -30,6 +31,10 @@ class BidirectionalNoisyConnection(BidirectionalConnection, INoisyConnection):
     ----------
     probability : int
         The probability of the bit to be flipped
+    generator : NoiseGenerator
+        The generator of the bit flips
+    flips : int
+        Amount of the bits flipped
 
     Methods
     -------
@@ -37,6 +42,8 @@ class BidirectionalNoisyConnection(BidirectionalConnection, INoisyConnection):
         Send the data over the connection
     connect(transceiver)
         Connect the transceiver
+    setMetrics(metrics)
+        Sets the registry of the metrics
     '''
 
     def __init__(self, a: Transceiver, b: Transceiver, probability: float) -> None:
@@ -54,6 +61,8 @@ class BidirectionalNoisyConnection(BidirectionalConnection, INoisyConnection):
         super(BidirectionalNoisyConnection, self).__init__(a, b)
 
         self.probability = probability
+        self.generator = NoiseGenerator()
+        self.flips = 0
 
     def applyNoise(self, package: Package, probability: float) -> Package:
         '''Apply noise to the package
@@ -65,17 +74,13 @@ class BidirectionalNoisyConnection(BidirectionalConnection, INoisyConnection):
         probability : int
             The probability of a bit to be flipped
         '''
-        data = bytearray(package.getValue())
-
-        for byte in range(0, len(data)):
-            # Iterate over bits
-            for index in range(8):
-                # Don't do anything, if the probability is not met
-                if random.random() > self.probability:
-                    continue
+        # The batch data is altered in place
+        if isinstance(package, PackageBatch):
+            self.flips += self.generator.apply(package.getValue(), probability)
+            return package
 
-                # Flip the bit
-                data[byte] = data[byte] ^ (1 << index)
+        data = bytearray(package.getValue())
+        self.flips += self.generator.apply(data, probability)
 
         package.setValue(data)
         return package
@@ -86,19 +91,41 @@ class BidirectionalNoisyConnection(BidirectionalConnection, INoisyConnection):
         Parameters
         ----------
         data: list
-            The data to send
+            The data to send, a list of packages, a single package, a package
+            batch or a feedback frame
         id : int
             Transceiver ID in the connection
         '''
 
         # Apply noise to the data
-        noisy_data = list()
-        for package in data:
-            noisy_data.append(self.applyNoise(package, self.probability))
+        with span("connection.noise"):
+            if isinstance(data, (PackageBatch, Package)):
+                # The batch exposes the whole buffer as a single value
+                noisy_data = self.applyNoise(data, self.probability)
+            elif isinstance(data, list):
+                noisy_data = list()
+                for package in data:
+                    noisy_data.append(self.applyNoise(package, self.probability))
+            else:
+                # The feedback of the protocol is assumed to be reliable
+                noisy_data = data
 
         # Call the superclass'es method
         super(BidirectionalNoisyConnection, self).send(noisy_data, id)
 
+    def setMetrics(self, metrics) -> None:
+        '''Sets the registry of the metrics
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        super(BidirectionalNoisyConnection, self).setMetrics(metrics)
+
+        metrics.counter("arq_connection_flips_total", "Bits flipped by the noise",
+                        function=lambda: self.flips)
+
 
 if __name__ == '__main__':
     print("This file shouldn't be used as a separate script")
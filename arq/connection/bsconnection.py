@@ -16,14 +16,31 @@
 
 from arq.connection.bdnoisyconnection import BidirectionalNoisyConnection
 from arq.package import Package
+from arq.packagebatch import PackageBatch
 from arq.transceiver import Transceiver
-import komm
+from utils.profiler import span
+
+# The komm module is optional, the native noise is used without it
+try:
+    import komm
+    import numpy
+except ImportError:
+    komm = None
 
 
 class BinarySymmetricConnection(BidirectionalNoisyConnection):
     '''
     Bi-directional binary symmetric and noisy connection implementation
 
+    The data of all the packages is passed through the channel as a single
+    stream of bits. Without the komm module the channel is simulated by the
+    noise generator of the noisy connection, which has the same statistics.
+
+    Attributes
+    ----------
+    channel : komm.BinarySymmetricChannel
+        The channel to pass the data through, None without the komm module
+
     Methods
     -------
     send(data, id)
@@ -32,7 +49,7 @@ class BinarySymmetricConnection(BidirectionalNoisyConnection):
         Connect the transceiver
     '''
 
-    def __init__(self, a: Transceiver, b: Transceiver, probability: float) -> None:
+    def __init__(self, a: Transceiver, b: Transceiver, probability: float, seed: int = None) -> None:
         '''
         Parameters
         ----------
@@ -42,10 +59,24 @@ class BinarySymmetricConnection(BidirectionalNoisyConnection):
             One of the transceivers to be connected
         probability : int
             The crossover probability
+        seed : int
+            Seed of the noise of the channel, None for the random one
         '''
 
         super(BinarySymmetricConnection, self).__init__(a, b, probability)
 
+        self.channel = None
+        if komm != None and seed != None:
+            try:
+                self.channel = komm.BinarySymmetricChannel(
+                    probability, rng=numpy.random.default_rng(seed))
+            except TypeError:
+                # The older komm versions take the noise from numpy
+                numpy.random.seed(seed)
+                self.channel = komm.BinarySymmetricChannel(probability)
+        elif komm != None:
+            self.channel = komm.BinarySymmetricChannel(probability)
+
     def applyNoise(self, package: Package, probability: float) -> Package:
         '''Apply noise to the package
 
@@ -56,54 +87,65 @@ class BinarySymmetricConnection(BidirectionalNoisyConnection):
         probability : int
             The crossover probability
         '''
-        data = bytearray(package.getValue())
-
-        bsc = komm.BinarySymmetricChannel(self.probability)
-        # data = bsc(data).tobytes()
+        # The channel only exists for the probability of the connection
+        if self.channel == None or probability != self.probability:
+            return super(BinarySymmetricConnection, self).applyNoise(package, probability)
 
-        converted_data = self._toList(data)
-        data = bytearray()
-        for index in range(0, int(len(converted_data) / 8)):
-            offset = index * 8
-            noisy_data = bsc(converted_data[offset:offset + 8])
+        data = package.getValue()
+        noisy_data = self._passChannel(data)
 
-            data.extend(self._fromList(noisy_data))
+        # The batch data is altered in place
+        if isinstance(package, PackageBatch):
+            data[:] = noisy_data
+        else:
+            package.setValue(bytearray(noisy_data))
 
-        # print(data, type(data), len(data))
-
-        package.setValue(data)
         return package
 
-    def _toList(self, data: bytearray) -> list:
-        '''Helper method for the connection variables casting into list
+    def send(self, data: list, id: int) -> None:
+        '''Send the data over the connection
 
         Parameters
         ----------
-        data : bytearray
-            The data to cast
+        data: list
+            The data to send, a list of packages, a single package, a package
+            batch or a feedback frame
+        id : int
+            Transceiver ID in the connection
         '''
-        result = list()
-        for byte in data:
-            for index in range(0, 8):
-                bit = (int(byte) >> index) & 0x1
-                result.insert(0, bit)
+        if not isinstance(data, list) or self.channel == None:
+            super(BinarySymmetricConnection, self).send(data, id)
+            return
+
+        # Pass the data of all the packages through the channel at once
+        with span("connection.noise"):
+            noisy_data = self._passChannel(b''.join(bytes(package.getValue()) for package in data))
 
-        return result
+            offset = 0
+            for package in data:
+                size = len(package.getValue())
+                package.setValue(bytearray(noisy_data[offset:offset + size]))
+                offset += size
 
-    def _fromList(self, data: list) -> bytearray:
-        '''Helper method for the connection variables casting into bytearray
+        # Skip the noise of the superclass
+        super(BidirectionalNoisyConnection, self).send(data, id)
+
+    def _passChannel(self, data: bytes) -> bytes:
+        '''Helper method passing the data through the channel as a stream of bits
 
         Parameters
         ----------
-        data : list
-            The data to cast
+        data : bytes
+            The data to pass
         '''
-        result = int()
-        for bit in data[0:7]:
-            result = (result | bit) << 1
-        result = (result | bit)
+        # Older komm versions call the channel instead of its transmit()
+        transmit = getattr(self.channel, 'transmit', self.channel)
+
+        bits = numpy.unpackbits(numpy.frombuffer(data, dtype=numpy.uint8))
+        noisy_bits = numpy.asarray(transmit(bits), dtype=numpy.uint8)
+        self.flips += int(numpy.count_nonzero(bits != noisy_bits))
 
-        return bytearray(int(result).to_bytes(1, 'big'))
+        return numpy.packbits(noisy_bits).tobytes()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,193 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import math
+import sys
+
+from arq.connection.bdnoisyconnection import BidirectionalNoisyConnection
+from arq.package import Package
+from arq.packagebatch import PackageBatch
+from arq.transceiver import Transceiver
+
+
+class GilbertElliottConnection(BidirectionalNoisyConnection):
+    '''
+    Bi-directional connection with the Gilbert-Elliott burst errors
+
+    The connection is either in the good or in the bad state, each with its
+    own probability of the bit to be flipped, and switches between them
+    with the given transition probabilities after every bit. The lengths
+    of the states are sampled as whole runs of bits, which are geometrically
+    distributed, so the state is never simulated bit by bit. The state is
+    kept between the transmissions.
+
+    Attributes
+    ----------
+    probability : float
+        The probability of the bit to be flipped in the good state
+    bad_probability : float
+        The probability of the bit to be flipped in the bad state
+    good_to_bad : float
+        The probability to switch from the good state to the bad one
+    bad_to_good : float
+        The probability to switch from the bad state to the good one
+    bad : bool
+        Whether the connection is in the bad state
+    remaining : int
+        Amount of bits left until the state is switched
+    bits : int
+        Amount of bits sent over the connection
+    flips : int
+        Amount of the flipped bits
+    bursts : int
+        Amount of the bad states entered
+
+    Methods
+    -------
+    send(data, id)
+        Send the data over the connection
+    connect(transceiver)
+        Connect the transceiver
+    applyNoise(package, probability)
+        Apply noise to the package
+    getErrorRate()
+        Get the average probability of the bit to be flipped
+    '''
+
+    def __init__(self, a: Transceiver, b: Transceiver, probability: float, bad_probability: float, good_to_bad: float, bad_to_good: float) -> None:
+        '''
+        Parameters
+        ----------
+        a : Transceiver
+            One of the transceivers to be connected
+        b : Transceiver
+            One of the transceivers to be connected
+        probability : float
+            The probability of the bit to be flipped in the good state
+        bad_probability : float
+            The probability of the bit to be flipped in the bad state
+        good_to_bad : float
+            The probability to switch from the good state to the bad one
+        bad_to_good : float
+            The probability to switch from the bad state to the good one
+        '''
+        super(GilbertElliottConnection, self).__init__(a, b, probability)
+
+        # Check if the probability of the bad state is correct
+        if not 0 <= bad_probability <= 1:
+            raise ValueError("Probability of the bad state must be in range [0, 1]")
+
+        # Check if the transition probabilities are correct
+        if not 0 <= good_to_bad <= 1 or not 0 < bad_to_good <= 1:
+            raise ValueError("Transition probabilities must be in range (0, 1]")
+
+        self.bad_probability = bad_probability
+        self.good_to_bad = good_to_bad
+        self.bad_to_good = bad_to_good
+
+        # Start in the good state
+        self.bad = False
+        self.remaining = self._sampleRun(good_to_bad)
+
+        self.bits = 0
+        self.flips = 0
+        self.bursts = 0
+
+    def applyNoise(self, package: Package, probability: float) -> Package:
+        '''Apply noise to the package
+
+        Parameters
+        ----------
+        package : Package
+            The package to alter
+        probability : float
+            The probability of the bit to be flipped in the good state
+        '''
+        # The batch data is altered in place
+        if isinstance(package, PackageBatch):
+            self._applyRuns(package.getValue(), probability)
+            return package
+
+        data = bytearray(package.getValue())
+        self._applyRuns(data, probability)
+
+        package.setValue(data)
+        return package
+
+    def getErrorRate(self) -> float:
+        '''Get the average probability of the bit to be flipped
+
+        Returns
+        -------
+        float
+            The probability weighted by the stationary shares of the states
+        '''
+        bad_share = self.good_to_bad / (self.good_to_bad + self.bad_to_good)
+        return (1 - bad_share) * self.probability + bad_share * self.bad_probability
+
+    def _applyRuns(self, buffer: bytearray, probability: float) -> None:
+        '''Helper method flipping the bits of the buffer state run by state run
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer to alter
+        probability : float
+            The probability of the bit to be flipped in the good state
+        '''
+        size = len(buffer) * 8
+
+        position = 0
+        while position < size:
+            run = min(self.remaining, size - position)
+
+            state_probability = self.bad_probability if self.bad else probability
+            self.flips += self.generator.apply(buffer, state_probability, position, position + run)
+
+            position += run
+            self.remaining -= run
+
+            # Switch the state after the whole run
+            if self.remaining == 0:
+                self.bad = not self.bad
+                if self.bad:
+                    self.bursts += 1
+
+                self.remaining = self._sampleRun(
+                    self.bad_to_good if self.bad else self.good_to_bad)
+
+        self.bits += size
+
+    def _sampleRun(self, transition: float) -> int:
+        '''Helper method sampling the amount of bits until the state is switched
+
+        Parameters
+        ----------
+        transition : float
+            The probability to leave the state after a bit
+        '''
+        if transition <= 0:
+            return sys.maxsize
+
+        if transition >= 1:
+            return 1
+
+        uniform = self.generator.rng.random()
+        return 1 + int(math.log(1.0 - uniform) / math.log1p(-transition))
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script")
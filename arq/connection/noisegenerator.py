@@ -0,0 +1,173 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import math
+import random
+
+
+class NoiseGenerator:
+    '''
+    Flips every bit of a buffer independently with the given probability
+
+    Rare flips are applied one by one after sampling the geometrically
+    distributed gaps between them. Frequent flips are applied with a mask
+    built for a whole chunk of the buffer from random integers, combined
+    according to the binary expansion of the probability.
+
+    Attributes
+    ----------
+    rng : random.Random
+        The source of randomness
+
+    Methods
+    -------
+    apply(buffer, probability, start, end)
+        Flip the bits of the buffer in place
+    '''
+
+    # Cost of a flip sampled alone compared to a bit of a single mask
+    SPARSE_COST = 1024
+
+    # Amount of bits of the probability used to build the masks
+    PRECISION = 32
+
+    # Amount of bytes covered by a single mask
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, rng: random.Random = None) -> None:
+        '''
+        Parameters
+        ----------
+        rng : random.Random
+            The source of randomness, the random module by default
+        '''
+        self.rng = rng if rng != None else random
+
+    def apply(self, buffer: bytearray, probability: float, start: int = 0, end: int = None) -> int:
+        '''Flip the bits of the buffer in place
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer to alter, any writable object supporting the buffer protocol
+        probability : float
+            The probability of a bit to be flipped
+        start : int
+            Index of the first bit to alter
+        end : int
+            Index of the bit after the last one to alter, the end of the
+            buffer by default
+
+        Returns
+        -------
+        int
+            Amount of the flipped bits
+        '''
+        if end == None:
+            end = len(buffer) * 8
+
+        if probability <= 0 or start >= end:
+            return 0
+
+        # Every digit of the probability costs a mask
+        digits = self._getDigits(probability)
+        if probability * self.SPARSE_COST < len(digits):
+            return self._applySparse(buffer, probability, start, end)
+
+        return self._applyDense(buffer, digits, start, end)
+
+    def _applySparse(self, buffer: bytearray, probability: float, start: int, end: int) -> int:
+        '''Helper method flipping the bits at the geometrically distributed gaps'''
+        scale = 1 / math.log1p(-probability)
+        uniform = self.rng.random
+
+        flips = 0
+        position = start
+        while True:
+            # Amount of the intact bits before the next flip
+            position += int(math.log(1.0 - uniform()) * scale)
+            if position >= end:
+                break
+
+            buffer[position >> 3] ^= 0x80 >> (position & 7)
+            flips += 1
+            position += 1
+
+        return flips
+
+    def _applyDense(self, buffer: bytearray, digits: list, start: int, end: int) -> int:
+        '''Helper method flipping the bits with the masks of whole chunks'''
+        flips = 0
+        first = start >> 3
+        last = (end + 7) >> 3
+        for offset in range(first, last, self.CHUNK_SIZE):
+            size = min(self.CHUNK_SIZE, last - offset)
+            bits = size * 8
+
+            mask = self._createMask(bits, digits)
+
+            # Keep the bits outside of the range intact
+            head = start - offset * 8
+            if head > 0:
+                mask &= (1 << (bits - head)) - 1
+
+            tail = (offset + size) * 8 - end
+            if tail > 0:
+                mask &= ~((1 << tail) - 1)
+
+            chunk = int.from_bytes(buffer[offset:offset + size], 'big')
+            buffer[offset:offset + size] = (chunk ^ mask).to_bytes(size, 'big')
+
+            flips += bin(mask).count("1")
+
+        return flips
+
+    def _getDigits(self, probability: float) -> list:
+        '''Helper method returning the binary digits of the probability
+
+        The digits start from the least significant one, the last digit is
+        the 1/2 one. The trailing zero digits are skipped, since they would
+        keep the mask empty.
+        '''
+        scaled = min(int(probability * (1 << self.PRECISION)), (1 << self.PRECISION) - 1)
+        digits = [(scaled >> index) & 1 for index in range(0, self.PRECISION)]
+
+        while digits and digits[0] == 0:
+            digits.pop(0)
+
+        return digits
+
+    def _createMask(self, bits: int, digits: list) -> int:
+        '''Helper method building the mask with every bit set with the probability
+
+        Every step doubles down the probability of a bit to be set, and a set
+        digit adds 1/2 to it, so the digits are processed from the least
+        significant one to obtain the whole probability.
+        '''
+        getrandbits = self.rng.getrandbits
+
+        mask = 0
+        for digit in digits:
+            if digit:
+                mask |= getrandbits(bits)
+            else:
+                mask &= getrandbits(bits)
+
+        return mask
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script")
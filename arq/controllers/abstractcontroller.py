@@ -17,7 +17,9 @@
 from arq.controllers.icontroller import IController
 from arq.data.idatasource import IDataSource
 from arq.codec import Codec
+from arq.metrics.metricsregistry import MetricsRegistry
 from utils.logger import Logger
+from arq.simulation.scheduler import Scheduler
 from arq.transceiver import Transceiver
 
 
@@ -35,6 +37,10 @@ class AbstractController(IController):
         The tag of the class
     logger : Logger
         The logger class
+    scheduler : Scheduler
+        The scheduler of the simulation, None for the real time
+    metrics : MetricsRegistry
+        The registry of the metrics, None if they aren't collected
 
     Methods
     -------
@@ -54,6 +60,9 @@ class AbstractController(IController):
         self.transceiver = transceiver
         self.codec = codec
         self.tag = "Controller"
+        self.logger = None
+        self.scheduler = None
+        self.metrics = None
 
     def setLogger(self, logger: Logger) -> None:
         '''Sets the new logger object
@@ -66,6 +75,51 @@ class AbstractController(IController):
         if logger != None:
             self.logger = logger
 
+    def setScheduler(self, scheduler: Scheduler) -> None:
+        '''Sets the scheduler of the simulation
+
+        Parameters
+        ----------
+        scheduler : Scheduler
+            The scheduler to use, None for the real time
+        '''
+        self.scheduler = scheduler
+
+    def setMetrics(self, metrics: MetricsRegistry) -> None:
+        '''Sets the registry of the metrics
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        self.metrics = metrics
+        if metrics != None:
+            self._registerMetrics(metrics)
+
+    def _registerMetrics(self, metrics: MetricsRegistry) -> None:
+        '''Helper method registering the metrics of the controller
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        pass
+
+    def _formatValue(self, value) -> str:
+        '''Helper method formatting a single value of the statistics
+
+        Parameters
+        ----------
+        value
+            The value to format
+        '''
+        if isinstance(value, float):
+            return "{:.6g}".format(value)
+
+        return str(value)
+
 
 if __name__ == '__main__':
     print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,146 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from bisect import bisect_right
+
+from arq.controllers.srreceivercontroller import SelectiveRepeatReceiverController
+from arq.data.idatasink import IDataSink
+from arq.errorrateestimator import ErrorRateEstimator
+from arq.linkadaptation import LinkAdaptation
+from arq.linkreport import LinkReport
+from arq.package import Package
+from arq.profileswitch import ProfileSwitch
+from arq.transceiver import Transceiver
+
+
+class AdaptiveReceiverController(SelectiveRepeatReceiverController):
+    '''
+    The Selective Repeat receiver reporting the bit error rate to the sender
+
+    Every package is decoded with the profile announced for its sequence
+    number. The failures feed the estimate of the bit error rate, which is
+    reported back after every few packages.
+
+    Attributes
+    ----------
+    adaptation : LinkAdaptation
+        The profiles shared with the sender
+    interval : int
+        Amount of the received packages between the reports
+    estimator : ErrorRateEstimator
+        The estimator of the bit error rate
+    switch_points : list
+        Sequence numbers of the first packages of the announced profiles
+    switch_profiles : list
+        Indexes of the announced profiles
+    pending : int
+        Amount of the packages received since the last report
+
+    Methods
+    -------
+    onPackage(package)
+        Handle the received package or the profile announcement
+    getErrorRate()
+        Get the estimated bit error rate
+    '''
+
+    def __init__(self, transceiver: Transceiver, adaptation: LinkAdaptation, window: int = 8, interval: int = 256, memory: int = 1000, profile: int = 0, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        adaptation : LinkAdaptation
+            The profiles shared with the sender
+        window : int
+            Maximum amount of the packages buffered
+        interval : int
+            Amount of the received packages between the reports
+        memory : int
+            Amount of the recent packages the estimate mostly depends on
+        profile : int
+            Index of the profile used at first
+        sink : IDataSink
+            The destination of the delivered data, None to keep it only
+        '''
+        super(AdaptiveReceiverController, self).__init__(
+            transceiver, adaptation.getProfiles()[profile], window, sink)
+
+        if interval < 1:
+            raise ValueError("Report interval must be at least one package")
+
+        self.adaptation = adaptation
+        self.interval = interval
+        self.estimator = ErrorRateEstimator(memory)
+        self.switch_points = [0]
+        self.switch_profiles = [profile]
+        self.pending = 0
+
+        # Let it be just here
+        self.tag = "AdaptiveReceiverController"
+
+    def onPackage(self, package: Package) -> None:
+        '''Handle the received package or the profile announcement
+
+        Parameters
+        ----------
+        package : Package
+            The numbered package or the profile announcement
+        '''
+        if isinstance(package, ProfileSwitch):
+            self.switch_points.append(package.getSequence())
+            self.switch_profiles.append(package.getProfile())
+            return
+
+        # Decode the package with the profile it was packed with
+        index = bisect_right(self.switch_points, package.getSequence()) - 1
+        self.codec = self.adaptation.getProfiles()[self.switch_profiles[index]]
+
+        failed = self.failed
+        super(AdaptiveReceiverController, self).onPackage(package)
+        self.estimator.update(self.codec, self.failed != failed)
+
+        self.pending += 1
+        if self.pending >= self.interval:
+            self.pending = 0
+            self._sendFeedback(LinkReport(self.getErrorRate()))
+
+    def getErrorRate(self) -> float:
+        '''Get the estimated bit error rate
+
+        Returns
+        -------
+        float
+            The estimated probability of a bit to be flipped
+        '''
+        return self.estimator.getErrorRate()
+
+    def getStats(self) -> dict:
+        '''Get the statistics of the transmission
+
+        Returns
+        -------
+        dict
+            The statistics, including the estimated bit error rate
+        '''
+        stats = super(AdaptiveReceiverController, self).getStats()
+        stats["ber"] = self.getErrorRate()
+
+        return stats
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,138 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.controllers.srsendercontroller import SelectiveRepeatSenderController
+from arq.data.idatasource import IDataSource
+from arq.linkadaptation import LinkAdaptation
+from arq.linkreport import LinkReport
+from arq.profileswitch import ProfileSwitch
+from arq.rtoestimator import RTOEstimator
+from arq.transceiver import Transceiver
+
+
+class AdaptiveSenderController(SelectiveRepeatSenderController):
+    '''
+    The Selective Repeat sender adapting the packages to the connection
+
+    The receiver reports the bit error rate it observes, the sender then
+    selects the frame size and the code which deliver the most data. The
+    switch is announced before the first package of the new profile, the
+    packages packed earlier keep their profile even when they're repeated.
+
+    Attributes
+    ----------
+    adaptation : LinkAdaptation
+        The selection of the profile
+    profile : int
+        Index of the profile in use
+    ber : float
+        The last bit error rate reported by the receiver, None if there's none
+    switches : int
+        Amount of the profile switches
+
+    Methods
+    -------
+    onFeedback(acknowledgement)
+        Handle the feedback of the receiver
+    onReport(report)
+        Adapt the profile to the bit error rate reported by the receiver
+    '''
+
+    def __init__(self, transceiver: Transceiver, adaptation: LinkAdaptation, source: IDataSource, window: int = 8, estimator: RTOEstimator = None, profile: int = 0) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        adaptation : LinkAdaptation
+            The selection of the profile
+        source : IDataSource
+            The source of data to send
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        estimator : RTOEstimator
+            The estimator of the retransmission timeout, the default one is
+            used if it's None
+        profile : int
+            Index of the profile used at first
+        '''
+        super(AdaptiveSenderController, self).__init__(
+            transceiver, adaptation.getProfiles()[profile], source, window, estimator)
+
+        self.adaptation = adaptation
+        self.profile = profile
+        self.ber = None
+        self.switches = 0
+
+        # Let it be just here
+        self.tag = "AdaptiveSenderController"
+
+    def onFeedback(self, acknowledgement) -> None:
+        '''Handle the feedback of the receiver
+
+        Parameters
+        ----------
+        acknowledgement : Acknowledgement
+            The feedback about a single package or the report of the bit
+            error rate
+        '''
+        if isinstance(acknowledgement, LinkReport):
+            self.onReport(acknowledgement)
+            return
+
+        super(AdaptiveSenderController, self).onFeedback(acknowledgement)
+
+    def onReport(self, report: LinkReport) -> None:
+        '''Adapt the profile to the bit error rate reported by the receiver
+
+        Parameters
+        ----------
+        report : LinkReport
+            The report of the receiver
+        '''
+        self.ber = report.getErrorRate()
+
+        profile = self.adaptation.select(self.ber, self.profile)
+        if profile == self.profile:
+            return
+
+        self.profile = profile
+        self.codec = self.adaptation.getProfiles()[profile]
+        self.switches += 1
+
+        # The packages not packed yet will use the new profile
+        announcement = ProfileSwitch(len(self.packages), profile)
+        self.wire_bits += announcement.getBitsNumber()
+        self.transceiver.transmit(announcement)
+
+    def getStats(self) -> dict:
+        '''Get the statistics of the transmission
+
+        Returns
+        -------
+        dict
+            The statistics, including the profile in use
+        '''
+        stats = super(AdaptiveSenderController, self).getStats()
+        stats["profile"] = self.profile
+        stats["switches"] = self.switches
+        stats["ber"] = self.ber
+
+        return stats
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
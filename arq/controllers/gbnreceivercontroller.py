@@ -0,0 +1,91 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.swreceivercontroller import SlidingWindowReceiverController
+from arq.data.idatasink import IDataSink
+from arq.codec import Codec
+from arq.package import Package
+from arq.transceiver import Transceiver
+
+
+class GoBackNReceiverController(SlidingWindowReceiverController):
+    '''
+    The controller which receives the data using the Go-Back-N ARQ
+
+    Only the expected package is accepted, so nothing is buffered. The
+    feedback is cumulative : it holds the sequence number of the next
+    expected package. The altered expected package is reported once, the
+    packages following it are dropped until it is sent again.
+
+    Methods
+    -------
+    onPackage(package)
+        Handle the received package
+    '''
+
+    def __init__(self, transceiver: Transceiver, codec: Codec, window: int = 8, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        sink : IDataSink
+            The destination of the delivered data, None to keep it only
+        '''
+        super(GoBackNReceiverController, self).__init__(transceiver, codec, window, sink)
+
+        # Let it be just here
+        self.tag = "GoBackNReceiverController"
+
+    def onPackage(self, package: Package) -> None:
+        '''Handle the received package
+
+        Parameters
+        ----------
+        package : Package
+            The numbered package
+        '''
+        sequence = package.getSequence()
+        value = self.codec.decodeFrame(package.getValue(), package.getParityBits())
+
+        self.received += 1
+        self.received_bits += package.getBitsNumber()
+        if value == None:
+            self.failed += 1
+
+            # The following packages are dropped anyway, so only the
+            # expected one is reported
+            if sequence == self.expected:
+                self._sendFeedback(Acknowledgement(self.expected, False))
+            return
+
+        if sequence == self.expected:
+            self._deliver(value)
+            self.expected += 1
+        elif sequence > self.expected:
+            # Wait for the expected package to be sent again
+            return
+
+        self._sendFeedback(Acknowledgement(self.expected))
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,111 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.swsendercontroller import SlidingWindowSenderController
+from arq.data.idatasource import IDataSource
+from arq.codec import Codec
+from arq.rtoestimator import RTOEstimator
+from arq.transceiver import Transceiver
+
+
+class GoBackNSenderController(SlidingWindowSenderController):
+    '''
+    The controller which sends the data using the Go-Back-N ARQ
+
+    The feedback is cumulative : it holds the sequence number of the next
+    package expected by the receiver, so every package before it is
+    acknowledged. Once a package is reported as altered or isn't
+    acknowledged in time, it is sent again together with all the packages
+    sent after it.
+
+    Methods
+    -------
+    onFeedback(acknowledgement)
+        Handle the feedback of the receiver
+    onTimeout()
+        Handle the expired retransmission timer
+    '''
+
+    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource, window: int = 8, estimator: RTOEstimator = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        source : IDataSource
+            The source of data to send
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        estimator : RTOEstimator
+            The estimator of the retransmission timeout, the default one is
+            used if it's None
+        '''
+        super(GoBackNSenderController, self).__init__(
+            transceiver, codec, source, window, estimator)
+
+        # Let it be just here
+        self.tag = "GoBackNSenderController"
+
+    def onFeedback(self, acknowledgement: Acknowledgement) -> None:
+        '''Handle the feedback of the receiver
+
+        Parameters
+        ----------
+        acknowledgement : Acknowledgement
+            The cumulative feedback, which holds the sequence number of the
+            next package expected by the receiver
+        '''
+        sequence = acknowledgement.getSequence()
+
+        # Skip the outdated feedback
+        if sequence < self.base or sequence > self.next:
+            return
+
+        # Every package before the expected one was received intact
+        for index in range(self.base, sequence):
+            self._acknowledge(index)
+
+        self._advance(sequence)
+
+        if not acknowledgement.isPositive() and sequence < self.next:
+            self._goBack()
+
+        self._fillWindow()
+
+        if self.isFinished():
+            self._finish()
+
+    def onTimeout(self) -> None:
+        '''Handle the expired retransmission timer
+
+        The oldest package wasn't acknowledged in time, so it's sent again
+        together with all the packages sent after it.
+        '''
+        self._goBack()
+
+    def _goBack(self) -> None:
+        '''Helper method sending all the outstanding packages again'''
+
+        for index in range(self.base, self.next):
+            self.retransmissions += 1
+            self._transmit(index)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,145 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.srreceivercontroller import SelectiveRepeatReceiverController
+from arq.data.idatasink import IDataSink
+from arq.hybridcodec import HybridCodec
+from arq.package import Package
+from arq.redundancypackage import RedundancyPackage
+from arq.transceiver import Transceiver
+
+
+class HybridReceiverController(SelectiveRepeatReceiverController):
+    '''
+    The Selective Repeat receiver of the Type-II hybrid ARQ
+
+    The package which failed the check is kept until it's corrected. The
+    incremental redundancy sent for it is combined with the kept package, the
+    repeated package is combined with the kept redundancy as well.
+
+    Attributes
+    ----------
+    corrupted : dict
+        Maps the sequence number to the data and the CRC of the last altered
+        package
+    redundancy : dict
+        Maps the sequence number to the last received redundancy
+    combined : int
+        Amount of the packages corrected with the redundancy
+
+    Methods
+    -------
+    onPackage(package)
+        Handle the received package or its redundancy
+    '''
+
+    def __init__(self, transceiver: Transceiver, codec: HybridCodec, window: int = 8, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : HybridCodec
+            The codec with the incremental redundancy
+        window : int
+            Maximum amount of the packages buffered
+        sink : IDataSink
+            The destination of the delivered data, None to keep it only
+        '''
+        super(HybridReceiverController, self).__init__(transceiver, codec, window, sink)
+
+        self.corrupted = dict()
+        self.redundancy = dict()
+        self.combined = 0
+
+        # Let it be just here
+        self.tag = "HybridReceiverController"
+
+    def onPackage(self, package: Package) -> None:
+        '''Handle the received package or its redundancy
+
+        Parameters
+        ----------
+        package : Package
+            The numbered package or its redundancy
+        '''
+        sequence = package.getSequence()
+
+        self.received += 1
+        self.received_bits += package.getBitsNumber()
+
+        if isinstance(package, RedundancyPackage):
+            # The package may have been received intact meanwhile
+            if sequence not in self.corrupted:
+                self._sendFeedback(Acknowledgement(sequence))
+                return
+
+            self.redundancy[sequence] = bytes(package.getValue())
+            frame, parity = self.corrupted[sequence]
+        else:
+            frame = bytes(package.getValue())
+            parity = package.getParityBits()
+
+            value = self.codec.decodeFrame(frame, parity)
+            if value != None:
+                self._complete(sequence, value)
+                return
+
+        # Try the redundancy against the altered package
+        value = None
+        if sequence in self.redundancy:
+            value = self.codec.combine(frame, parity, self.redundancy[sequence])
+
+        if value != None:
+            self.combined += 1
+            self._complete(sequence, value)
+            return
+
+        self.failed += 1
+        self.corrupted[sequence] = (frame, parity)
+        self._sendFeedback(Acknowledgement(sequence, False))
+
+    def getStats(self) -> dict:
+        '''Get the statistics of the transmission
+
+        Returns
+        -------
+        dict
+            The statistics, including the packages corrected with the redundancy
+        '''
+        stats = super(HybridReceiverController, self).getStats()
+        stats["combined"] = self.combined
+
+        return stats
+
+    def _complete(self, sequence: int, value: bytes) -> None:
+        '''Helper method accepting the package and dropping its kept parts
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        value : bytes
+            The data of the package
+        '''
+        self.corrupted.pop(sequence, None)
+        self.redundancy.pop(sequence, None)
+        self._accept(sequence, value)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
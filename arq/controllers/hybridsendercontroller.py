@@ -0,0 +1,135 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.srsendercontroller import SelectiveRepeatSenderController
+from arq.data.idatasource import IDataSource
+from arq.hybridcodec import HybridCodec
+from arq.redundancypackage import RedundancyPackage
+from arq.rtoestimator import RTOEstimator
+from arq.transceiver import Transceiver
+
+
+class HybridSenderController(SelectiveRepeatSenderController):
+    '''
+    The Selective Repeat sender of the Type-II hybrid ARQ
+
+    The first negative acknowledgement of a package is answered with its
+    incremental redundancy instead of the whole package. Once the redundancy
+    doesn't help, the package is sent again.
+
+    Attributes
+    ----------
+    naks : dict
+        Maps the sequence number to the amount of the negative
+        acknowledgements of the package
+    redundancy_sent : int
+        Amount of the redundancy packages sent
+
+    Methods
+    -------
+    onFeedback(acknowledgement)
+        Handle the feedback of the receiver
+    '''
+
+    def __init__(self, transceiver: Transceiver,  codec: HybridCodec, source: IDataSource, window: int = 8, estimator: RTOEstimator = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : HybridCodec
+            The codec with the incremental redundancy
+        source : IDataSource
+            The source of data to send
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        estimator : RTOEstimator
+            The estimator of the retransmission timeout, the default one is
+            used if it's None
+        '''
+        super(HybridSenderController, self).__init__(
+            transceiver, codec, source, window, estimator)
+
+        self.naks = dict()
+        self.redundancy_sent = 0
+
+        # Let it be just here
+        self.tag = "HybridSenderController"
+
+    def onFeedback(self, acknowledgement: Acknowledgement) -> None:
+        '''Handle the feedback of the receiver
+
+        Parameters
+        ----------
+        acknowledgement : Acknowledgement
+            The feedback about a single package
+        '''
+        sequence = acknowledgement.getSequence()
+
+        if acknowledgement.isPositive():
+            self.naks.pop(sequence, None)
+            super(HybridSenderController, self).onFeedback(acknowledgement)
+            return
+
+        # Skip the feedback about the packages outside of the window
+        if sequence < self.base or sequence >= self.next or self.acknowledged[sequence]:
+            return
+
+        self.naks[sequence] = self.naks.get(sequence, 0) + 1
+        if self.naks[sequence] == 1:
+            self._transmitRedundancy(sequence)
+            return
+
+        self.retransmissions += 1
+        self._transmit(sequence)
+
+    def getStats(self) -> dict:
+        '''Get the statistics of the transmission
+
+        Returns
+        -------
+        dict
+            The statistics, including the redundancy packages sent
+        '''
+        stats = super(HybridSenderController, self).getStats()
+        stats["redundancy"] = self.redundancy_sent
+
+        return stats
+
+    def _transmitRedundancy(self, sequence: int) -> None:
+        '''Helper method sending the incremental redundancy of the package
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        '''
+        frame = self.packages[sequence].getValue()
+        redundancy = self.codec.calculateRedundancy(frame)
+
+        package = RedundancyPackage(self.codec.package_size, self.codec.pbits, len(redundancy))
+        package.setValue(redundancy)
+        package.setSequence(sequence)
+
+        self.redundancy_sent += 1
+        self.wire_bits += package.getBitsNumber()
+
+        self.transceiver.transmit(package)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -14,11 +14,11 @@
     limitations under the License.
 '''
 
-import time
-
 from arq.controllers.abstractcontroller import AbstractController
 from arq.codec import Codec
 from arq.package import Package
+from arq.packagebatch import PackageBatch
+from arq.reassemblybuffer import ReassemblyBuffer
 from arq.transceiver import Transceiver
 
 
@@ -26,13 +26,24 @@ class ReceiverController(AbstractController):
     '''
     The controller which handes data receiving process
 
+    Attributes
+    ----------
+    received : int
+            Amount of the packages received
+    failed : int
+            Amount of the altered packages
+
     Methods
     -------
     start()
             Starts the controller
+    reassemble(data)
+            Reassemble the received data
 
     countFailed(data)
             Count altered packages
+    countInvalid(mask)
+            Count altered packages using the validity mask
     '''
 
     def __init__(self, transceiver: Transceiver, codec: Codec) -> None:
@@ -48,6 +59,9 @@ class ReceiverController(AbstractController):
 
         super(ReceiverController, self).__init__(transceiver, codec)
 
+        self.received = 0
+        self.failed = 0
+
         # Let it be just here
         self.tag = "ReceiverController"
 
@@ -55,17 +69,66 @@ class ReceiverController(AbstractController):
         '''Starts the controller'''
 
         # Wait for the data to become available
-        while not self.transceiver.isDataReceived():
-            time.sleep(1)
+        if self.scheduler != None:
+            # Nothing else can deliver the data, once the events are over
+            if not self.scheduler.runUntil(self.transceiver.isDataReceived):
+                return
+
+            data = self.transceiver.getReceived()
+        else:
+            data = self.transceiver.getReceived(block=True)
 
         # Print the result of the transmission check
-        data = self.transceiver.getReceived()
-        unpacked = self.codec.unpack(data)
+        buffer = self.reassemble(data)
+        self.received += buffer.getReceivedCount()
+        self.failed += buffer.getFailedCount()
+        failed = buffer.getFailedCount()
+
         if self.logger != None:
-            message = "Received : {}, failed : {}".format(
-                len(data), self.countFailed(unpacked))
+            message = "Received : {}, failed : {}".format(len(data), failed)
+            if self.scheduler != None:
+                message += ", time : {:.6f} s".format(self.scheduler.now())
             self.logger.log(self.tag, message)
 
+    def reassemble(self, data) -> ReassemblyBuffer:
+        '''Reassemble the received data
+
+        Parameters
+        ----------
+        data
+                The list of packages or the package batch
+
+        Returns
+        -------
+        ReassemblyBuffer
+                The buffer with the intact data and the missing packages
+        '''
+        if isinstance(data, PackageBatch):
+            value, mask = self.codec.unpackBatch(data)
+
+            buffer = ReassemblyBuffer(len(value), self.codec.getFrameSize())
+            buffer.storeFrames(0, value, mask)
+            return buffer
+
+        size = sum(len(package.getValue()) for package in data)
+        buffer = ReassemblyBuffer(size, self.codec.getFrameSize())
+
+        return self.codec.unpackInto(data, buffer)
+
+    def _registerMetrics(self, metrics) -> None:
+        '''Helper method registering the metrics of the controller
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+                The registry to report the metrics to
+        '''
+        labels = {"controller": self.tag}
+        metrics.counter("arq_receiver_packages_total", "Packages received",
+                        labels, lambda: self.received)
+        metrics.counter("arq_receiver_failed_total", "Altered packages received",
+                        labels, lambda: self.failed)
+
     def countFailed(self, data: dict) -> int:
         '''Count altered packages
 
@@ -90,6 +153,21 @@ class ReceiverController(AbstractController):
 
         return counter
 
+    def countInvalid(self, mask: bytearray) -> int:
+        '''Count altered packages using the validity mask
+
+        Parameters
+        ----------
+        mask : bytearray
+                The validity mask returned by the batch unpacking
+
+        Returns
+        -------
+        int
+                Amount of failed/altered packages
+        '''
+        return mask.count(0)
+
 
 if __name__ == '__main__':
     print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,206 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from bisect import bisect_right
+
+from arq.controllers.swreceivercontroller import SlidingWindowReceiverController
+from arq.data.idatasink import IDataSink
+from arq.selectiveacknowledgement import SelectiveAcknowledgement
+from arq.codec import Codec
+from arq.package import Package
+from arq.transceiver import Transceiver
+
+
+class SelectiveAckReceiverController(SlidingWindowReceiverController):
+    '''
+    The controller which receives the data acknowledging it with SACK blocks
+
+    The packages are buffered until the missing ones arrive, like in the
+    Selective Repeat ARQ, but the feedback is sent once for many packages :
+    it holds the cumulative acknowledgement and the runs of the packages
+    received after the missing one. The runs are kept up to date with every
+    package, so the feedback is built without scanning the buffer. The
+    feedback is also sent, once no package arrives for a while, so the
+    sender learns about the end of a burst.
+
+    Attributes
+    ----------
+    interval : int
+        Amount of the received packages acknowledged by a single feedback,
+        at most a half of the window
+    delay : float
+        Maximum time the feedback waits for the next package (in seconds)
+    buffer : dict
+        The data of the packages received out of order
+    starts : list
+        The first sequence numbers of the runs of the buffered packages
+    ends : list
+        The past-the-end sequence numbers of the runs of the buffered packages
+    pending : int
+        Amount of the packages received since the last feedback
+    timer : Event
+        The event sending the delayed feedback, None if there's none
+    arrived : float
+        Time when the last package arrived
+
+    Methods
+    -------
+    onPackage(package)
+        Handle the received package
+    flush()
+        Send the feedback about all the received packages
+    '''
+
+    def __init__(self, transceiver: Transceiver, codec: Codec, window: int = 8, interval: int = 64, delay: float = 0.01, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        window : int
+            Maximum amount of the packages buffered
+        interval : int
+            Amount of the received packages acknowledged by a single
+            feedback, it's limited to a half of the window
+        delay : float
+            Maximum time the feedback waits for the next package (in seconds)
+        sink : IDataSink
+            The destination of the delivered data, None to keep it only
+        '''
+        super(SelectiveAckReceiverController, self).__init__(transceiver, codec, window, sink)
+
+        if interval < 1:
+            raise ValueError("Feedback must acknowledge at least one package")
+
+        # The sender stops after a window of packages, so the longer interval
+        # is never reached and every feedback would wait for the timer
+        self.interval = min(interval, max(window // 2, 1))
+        self.delay = delay
+        self.buffer = dict()
+        self.starts = list()
+        self.ends = list()
+        self.pending = 0
+        self.timer = None
+        self.arrived = None
+
+        # Let it be just here
+        self.tag = "SelectiveAckReceiverController"
+
+    def onPackage(self, package: Package) -> None:
+        '''Handle the received package
+
+        Parameters
+        ----------
+        package : Package
+            The numbered package
+        '''
+        sequence = package.getSequence()
+        value = self.codec.decodeFrame(package.getValue(), package.getParityBits())
+
+        self.received += 1
+        self.received_bits += package.getBitsNumber()
+
+        if value == None:
+            self.failed += 1
+        elif sequence == self.expected:
+            self._deliver(value)
+            self.expected += 1
+            self._deliverRun()
+        elif sequence > self.expected and sequence < self.expected + self.window:
+            self._buffer(sequence, bytes(value))
+
+        # Acknowledge the packages in groups, the timer only sends the
+        # feedback once the packages stop arriving
+        self.pending += 1
+        self.arrived = self.scheduler.now()
+        if self.pending >= self.interval:
+            self.flush()
+        elif self.timer == None:
+            self.timer = self.scheduler.schedule(self.delay, self._expire)
+
+    def flush(self) -> None:
+        '''Send the feedback about all the received packages'''
+
+        if self.timer != None:
+            self.timer.cancel()
+            self.timer = None
+
+        self.pending = 0
+        self._sendFeedback(SelectiveAcknowledgement(
+            self.expected, list(zip(self.starts, self.ends))))
+
+    def _expire(self) -> None:
+        '''Helper method sending the feedback, if no package arrived for the delay'''
+
+        # The timer isn't restarted by every package, so it's checked here
+        deadline = self.arrived + self.delay
+        if self.scheduler.now() < deadline:
+            self.timer = self.scheduler.scheduleAt(deadline, self._expire)
+        else:
+            self.timer = None
+            self.flush()
+
+    def _buffer(self, sequence: int, value: bytes) -> None:
+        '''Helper method buffering the package received out of order
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        value : bytes
+            The data of the package
+        '''
+        index = bisect_right(self.starts, sequence)
+
+        # Skip the repeated packages
+        if index > 0 and self.ends[index - 1] > sequence:
+            return
+
+        self.buffer[sequence] = value
+
+        joins_previous = index > 0 and self.ends[index - 1] == sequence
+        joins_next = index < len(self.starts) and self.starts[index] == sequence + 1
+
+        if joins_previous and joins_next:
+            self.ends[index - 1] = self.ends[index]
+            del self.starts[index]
+            del self.ends[index]
+        elif joins_previous:
+            self.ends[index - 1] = sequence + 1
+        elif joins_next:
+            self.starts[index] = sequence
+        else:
+            self.starts.insert(index, sequence)
+            self.ends.insert(index, sequence + 1)
+
+    def _deliverRun(self) -> None:
+        '''Helper method delivering the buffered run following the expected package'''
+
+        if len(self.starts) == 0 or self.starts[0] != self.expected:
+            return
+
+        for sequence in range(self.starts[0], self.ends[0]):
+            self._deliver(self.buffer.pop(sequence))
+
+        self.expected = self.ends[0]
+        del self.starts[0]
+        del self.ends[0]
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
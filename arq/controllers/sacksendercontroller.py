@@ -0,0 +1,239 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import heapq
+
+from arq.controllers.swsendercontroller import SlidingWindowSenderController
+from arq.selectiveacknowledgement import SelectiveAcknowledgement
+from arq.data.idatasource import IDataSource
+from arq.codec import Codec
+from arq.rtoestimator import RTOEstimator
+from arq.transceiver import Transceiver
+
+
+class SelectiveAckSenderController(SlidingWindowSenderController):
+    '''
+    The controller which sends the data using the SACK feedback
+
+    The feedback holds the cumulative acknowledgement and the runs of the
+    packages received after the missing one. Only the difference from the
+    previous feedback is applied. The packages missing before the last
+    reported one are considered altered and sent again. Every retransmitted
+    hole is kept on the scoreboard (RFC 6675) ordered by the time, when it
+    may be sent again : the hole, which the newer feedback still reports
+    missing once about a round-trip time has passed, is sent again, so the
+    lost retransmission doesn't wait for the timer. Every feedback only
+    visits the newly reported holes and the ones due. The packages after
+    the last reported one are recovered by the retransmission timer.
+
+    Attributes
+    ----------
+    runs : list
+        The runs of the packages reported by the previous feedback
+    highest : int
+        The past-the-end sequence number of the packages reported so far
+    holes : list
+        The scoreboard of the retransmitted holes, the heap of the times,
+        when they may be sent again, and their sequence numbers
+
+    Methods
+    -------
+    onFeedback(acknowledgement)
+        Handle the feedback of the receiver
+    '''
+
+    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource, window: int = 8, estimator: RTOEstimator = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        source : IDataSource
+            The source of data to send
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        estimator : RTOEstimator
+            The estimator of the retransmission timeout, the default one is
+            used if it's None
+        '''
+        super(SelectiveAckSenderController, self).__init__(
+            transceiver, codec, source, window, estimator)
+
+        self.runs = list()
+        self.highest = 0
+        self.holes = list()
+
+        # Let it be just here
+        self.tag = "SelectiveAckSenderController"
+
+    def onFeedback(self, acknowledgement: SelectiveAcknowledgement) -> None:
+        '''Handle the feedback of the receiver
+
+        Parameters
+        ----------
+        acknowledgement : SelectiveAcknowledgement
+            The cumulative acknowledgement with the SACK block
+        '''
+        cumulative = acknowledgement.getCumulative()
+        runs = acknowledgement.getRuns()
+
+        # Skip the outdated feedback
+        if cumulative < self.base or cumulative > self.next:
+            return
+
+        # The packages before the cumulative one are passed only once
+        for sequence in range(self.base, cumulative):
+            self._acknowledge(sequence)
+
+        for start, end in self._subtractRuns(runs, self.runs):
+            for sequence in range(start, end):
+                self._acknowledge(sequence)
+
+        self.runs = runs
+
+        # The packages missing before the newly reported ones were altered
+        highest = runs[-1][1] if len(runs) != 0 else cumulative
+        for start, end in self._getNewHoles(max(self.highest, cumulative), runs):
+            for sequence in range(start, end):
+                if not self.acknowledged[sequence]:
+                    self._resend(sequence)
+
+        self.highest = max(self.highest, highest)
+        self._resendLost()
+
+        self._advance(cumulative)
+        self._fillWindow()
+
+        if self.isFinished():
+            self._finish()
+
+    def _getNewHoles(self, lower: int, runs: list) -> list:
+        '''Helper method finding the packages missing after the ones reported before
+
+        Only the runs reported for the first time are visited, starting from
+        the last one.
+
+        Parameters
+        ----------
+        lower : int
+            Sequence number, which the previous feedback reported up to
+        runs : list
+            The runs of the packages received after the missing one
+        '''
+        holes = list()
+        position = runs[-1][1] if len(runs) != 0 else lower
+
+        for start, end in reversed(runs):
+            if end <= lower:
+                break
+
+            if end < position:
+                holes.append((end, position))
+            position = start
+
+        if lower < position:
+            holes.append((lower, position))
+
+        holes.reverse()
+        return holes
+
+    def _resend(self, sequence: int) -> None:
+        '''Helper method sending the missing package again
+
+        The package is put on the scoreboard, so it's sent once more, if
+        it's still missing a round-trip time later.
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        '''
+        self.retransmissions += 1
+        self._transmit(sequence)
+
+        heapq.heappush(self.holes, (self.sent_at[sequence] + self._getHoleTimeout(), sequence))
+
+    def _resendLost(self) -> None:
+        '''Helper method sending again the holes, which are still missing
+
+        The feedback sent after the last transmission of the hole could
+        arrive by now, so the hole which isn't acknowledged was lost again.
+        Only the holes due by now are visited.
+        '''
+        now = self.scheduler.now()
+
+        while len(self.holes) != 0 and self.holes[0][0] <= now:
+            _, sequence = heapq.heappop(self.holes)
+            if self.acknowledged[sequence]:
+                continue
+
+            # The retransmission timer may have sent the hole since
+            due = self.sent_at[sequence] + self._getHoleTimeout()
+            if due > now:
+                heapq.heappush(self.holes, (due, sequence))
+                continue
+
+            self._resend(sequence)
+
+    def _getHoleTimeout(self) -> float:
+        '''Helper method getting the time the retransmitted hole waits for the feedback'''
+
+        rtt = self.estimator.getSmoothedRTT()
+        if rtt == None:
+            return self.estimator.getTimeout()
+
+        return max(rtt, self.estimator.minimum)
+
+    def _subtractRuns(self, runs: list, previous: list) -> list:
+        '''Helper method finding the parts of the runs, which weren't reported
+
+        Both lists are sorted, so they are merged in a single pass.
+
+        Parameters
+        ----------
+        runs : list
+            The runs of the new feedback
+        previous : list
+            The runs of the previous feedback
+        '''
+        difference = list()
+        index = 0
+
+        for start, end in runs:
+            # Skip the previous runs before the current one
+            while index < len(previous) and previous[index][1] <= start:
+                index += 1
+
+            position = start
+            while index < len(previous) and previous[index][0] < end:
+                if previous[index][0] > position:
+                    difference.append((position, previous[index][0]))
+                position = max(position, previous[index][1])
+
+                if previous[index][1] > end:
+                    break
+                index += 1
+
+            if position < end:
+                difference.append((position, end))
+
+        return difference
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -29,6 +29,8 @@ class SenderController(AbstractController):
     ----------
     source : IDataSource
         The source of data
+    batch : bool
+        Whether the data is packed into a single batch
 
     Methods
     -------
@@ -36,7 +38,7 @@ class SenderController(AbstractController):
         Starts the controller
     '''
 
-    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource) -> None:
+    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource, batch: bool = False) -> None:
         '''
         Parameters
         ----------
@@ -46,10 +48,13 @@ class SenderController(AbstractController):
             The class which handles data encoding/decoding
         source : IDataSource
             The source of data to send
+        batch : bool
+            Whether the data is packed into a single batch
         '''
         super(SenderController, self).__init__(transceiver, codec)
 
         self.source = source
+        self.batch = batch
 
         # Let it be just here
         self.tag = "SenderController"
@@ -58,14 +63,17 @@ class SenderController(AbstractController):
         '''Starts the controller'''
 
         data = self.source.getData()
-        packages = self.codec.pack(data)
+        if self.batch:
+            packages = self.codec.packBatch(data)
+        else:
+            packages = self.codec.pack(data)
 
         self.transceiver.transmit(packages)
 
         # Print the result of the transmission check
+        # The data is formatted and truncated by the logger later
         if self.logger != None:
-            message = "Sent : {}, length : {}".format(data, len(data))
-            self.logger.log(self.tag, message)
+            self.logger.log(self.tag, "Sent : {}, length : {}", data, len(data))
 
 
 if __name__ == '__main__':
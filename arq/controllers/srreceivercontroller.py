@@ -0,0 +1,107 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.swreceivercontroller import SlidingWindowReceiverController
+from arq.data.idatasink import IDataSink
+from arq.codec import Codec
+from arq.package import Package
+from arq.transceiver import Transceiver
+
+
+class SelectiveRepeatReceiverController(SlidingWindowReceiverController):
+    '''
+    The controller which receives the data using the Selective Repeat ARQ
+
+    Every package is acknowledged separately, the altered ones are reported
+    back to the sender. The packages received out of order are buffered
+    until the missing ones arrive.
+
+    Attributes
+    ----------
+    buffer : dict
+        The data of the packages received out of order
+
+    Methods
+    -------
+    onPackage(package)
+        Handle the received package
+    '''
+
+    def __init__(self, transceiver: Transceiver, codec: Codec, window: int = 8, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        window : int
+            Maximum amount of the packages buffered
+        sink : IDataSink
+            The destination of the delivered data, None to keep it only
+        '''
+        super(SelectiveRepeatReceiverController, self).__init__(transceiver, codec, window, sink)
+
+        self.buffer = dict()
+
+        # Let it be just here
+        self.tag = "SelectiveRepeatReceiverController"
+
+    def onPackage(self, package: Package) -> None:
+        '''Handle the received package
+
+        Parameters
+        ----------
+        package : Package
+            The numbered package
+        '''
+        sequence = package.getSequence()
+        value = self.codec.decodeFrame(package.getValue(), package.getParityBits())
+
+        self.received += 1
+        self.received_bits += package.getBitsNumber()
+        if value == None:
+            self.failed += 1
+            self._sendFeedback(Acknowledgement(sequence, False))
+            return
+
+        self._accept(sequence, value)
+
+    def _accept(self, sequence: int, value: bytes) -> None:
+        '''Helper method acknowledging the intact package
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        value : bytes
+            The data of the package
+        '''
+        # The repeated packages are acknowledged again, but not buffered
+        if sequence >= self.expected and sequence < self.expected + self.window:
+            self.buffer.setdefault(sequence, bytes(value))
+
+        self._sendFeedback(Acknowledgement(sequence))
+
+        # Deliver the data which is in order now
+        while self.expected in self.buffer:
+            self._deliver(self.buffer.pop(self.expected))
+            self.expected += 1
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
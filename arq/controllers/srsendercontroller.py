@@ -0,0 +1,88 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.swsendercontroller import SlidingWindowSenderController
+from arq.data.idatasource import IDataSource
+from arq.codec import Codec
+from arq.rtoestimator import RTOEstimator
+from arq.transceiver import Transceiver
+
+
+class SelectiveRepeatSenderController(SlidingWindowSenderController):
+    '''
+    The controller which sends the data using the Selective Repeat ARQ
+
+    Every package is acknowledged separately, only the packages reported as
+    altered or not acknowledged in time are sent again.
+
+    Methods
+    -------
+    onFeedback(acknowledgement)
+        Handle the feedback of the receiver
+    '''
+
+    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource, window: int = 8, estimator: RTOEstimator = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        source : IDataSource
+            The source of data to send
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        estimator : RTOEstimator
+            The estimator of the retransmission timeout, the default one is
+            used if it's None
+        '''
+        super(SelectiveRepeatSenderController, self).__init__(
+            transceiver, codec, source, window, estimator)
+
+        # Let it be just here
+        self.tag = "SelectiveRepeatSenderController"
+
+    def onFeedback(self, acknowledgement: Acknowledgement) -> None:
+        '''Handle the feedback of the receiver
+
+        Parameters
+        ----------
+        acknowledgement : Acknowledgement
+            The feedback about a single package
+        '''
+        sequence = acknowledgement.getSequence()
+
+        # Skip the feedback about the packages outside of the window
+        if sequence < self.base or sequence >= self.next or self.acknowledged[sequence]:
+            return
+
+        if not acknowledgement.isPositive():
+            self.retransmissions += 1
+            self._transmit(sequence)
+            return
+
+        self._acknowledge(sequence)
+        self._advance(self.base)
+        self._fillWindow()
+
+        if self.isFinished():
+            self._finish()
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
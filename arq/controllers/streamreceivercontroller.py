@@ -0,0 +1,177 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.controllers.receivercontroller import ReceiverController
+from arq.data.idatasink import IDataSink
+from arq.codec import Codec
+from arq.packagebatch import PackageBatch
+from arq.transceiver import Transceiver
+from utils.profiler import span
+
+
+class StreamReceiverController(ReceiverController):
+    '''
+    The controller which receives the data streamed in chunks
+
+    Every chunk is unpacked as soon as it's received, the intact data is
+    passed to the sink at its offset in the stream and nothing is kept, so
+    the memory use doesn't depend on the size of the data.
+
+    Attributes
+    ----------
+    sink : IDataSink
+        The destination of the intact data, None to drop it
+    offset : int
+        Offset of the next chunk in the stream (in bytes)
+    delivered : int
+        Amount of bytes of the intact packages
+    chunks : int
+        Amount of the chunks received
+    received : int
+        Amount of the packages received
+    failed : int
+        Amount of the altered packages
+
+    Methods
+    -------
+    start()
+        Starts the controller
+    onChunk(data)
+        Handle the received chunk
+    report()
+        Log the statistics of the transmission
+    '''
+
+    def __init__(self, transceiver: Transceiver, codec: Codec, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        sink : IDataSink
+            The destination of the intact data, None to drop it
+        '''
+        super(StreamReceiverController, self).__init__(transceiver, codec)
+
+        self.sink = sink
+        self.offset = 0
+        self.delivered = 0
+        self.chunks = 0
+        self.received = 0
+        self.failed = 0
+
+        # Let it be just here
+        self.tag = "StreamReceiverController"
+
+    def start(self) -> None:
+        '''Starts the controller'''
+
+        self.transceiver.setListener(self.onChunk)
+
+    def onChunk(self, data) -> None:
+        '''Handle the received chunk
+
+        Parameters
+        ----------
+        data
+            The list of packages or the package batch
+        '''
+        if isinstance(data, PackageBatch):
+            value, mask = self.codec.unpackBatch(data)
+        else:
+            unpacked = self.codec.unpack(data)
+            value = b''.join(unpacked[index] if unpacked[index] != None else package.getValue()
+                             for index, package in enumerate(data))
+            mask = bytearray(0 if unpacked[index] == None else 1 for index in unpacked)
+
+        failed = self.countInvalid(mask)
+        frame_size = self.codec.getFrameSize()
+
+        self.chunks += 1
+        self.received += len(mask)
+        self.failed += failed
+        self.delivered += (len(mask) - failed) * frame_size
+
+        # The last package may be shorter than the others
+        if len(mask) != 0 and mask[-1]:
+            self.delivered -= len(mask) * frame_size - len(value)
+
+        if self.sink != None:
+            with span("sink"):
+                self._write(value, mask)
+
+        self.offset += len(value)
+
+    def report(self) -> None:
+        '''Log the statistics of the transmission'''
+
+        if self.sink != None:
+            self.sink.close()
+
+        if self.logger == None:
+            return
+
+        message = "Received : {}, failed : {}, bytes : {}, delivered : {}, chunks : {}".format(
+            self.received, self.failed, self.offset, self.delivered, self.chunks)
+        if self.scheduler != None:
+            message += ", time : {:.6f} s".format(self.scheduler.now())
+        self.logger.log(self.tag, message)
+
+    def _registerMetrics(self, metrics) -> None:
+        '''Helper method registering the metrics of the controller
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        super(StreamReceiverController, self)._registerMetrics(metrics)
+
+        labels = {"controller": self.tag}
+        metrics.counter("arq_receiver_delivered_bytes_total", "Bytes of the intact packages delivered",
+                        labels, lambda: self.delivered)
+        metrics.counter("arq_receiver_stream_bytes_total", "Bytes of the stream received, including the altered packages",
+                        labels, lambda: self.offset)
+
+    def _write(self, value: bytes, mask: bytearray) -> None:
+        '''Helper method passing the runs of the intact packages to the sink
+
+        Parameters
+        ----------
+        value : bytes
+            The data of the chunk
+        mask : bytearray
+            The validity flags of the packages of the chunk
+        '''
+        frame_size = self.codec.getFrameSize()
+        view = memoryview(value)
+
+        # Skip from an altered package to the next intact one
+        start = mask.find(1)
+        while start != -1:
+            end = mask.find(0, start)
+            if end == -1:
+                end = len(mask)
+
+            self.sink.write(self.offset + start * frame_size,
+                            view[start * frame_size:end * frame_size])
+            start = mask.find(1, end)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
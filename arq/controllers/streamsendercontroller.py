@@ -0,0 +1,144 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.controllers.sendercontroller import SenderController
+from arq.data.idatasource import IDataSource
+from arq.codec import Codec
+from arq.transceiver import Transceiver
+
+
+class StreamSenderController(SenderController):
+    '''
+    The controller which streams the data in chunks
+
+    The data is taken from the source, packed and sent one chunk at a time,
+    so only a few chunks are kept in memory whatever the size of the data
+    is. Every chunk holds a whole amount of packages. On the virtual clock
+    the next chunk is sent once the previous one is transmitted.
+
+    Attributes
+    ----------
+    chunk_size : int
+        Amount of bytes of the data of every chunk
+    chunks : generator
+        The packed chunks, which are not sent yet
+    sent : int
+        Amount of bytes of the data sent
+    packages : int
+        Amount of the packages sent
+
+    Methods
+    -------
+    start()
+        Starts the controller
+    '''
+
+    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource, chunk_size: int, batch: bool = False) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        source : IDataSource
+            The source of data to send
+        chunk_size : int
+            Amount of bytes of the data of every chunk, rounded down to a
+            whole amount of packages
+        batch : bool
+            Whether every chunk is packed into a single batch
+        '''
+        super(StreamSenderController, self).__init__(transceiver, codec, source, batch)
+
+        if chunk_size < 1:
+            raise ValueError("Chunk must hold at least a byte")
+
+        frame_size = codec.getFrameSize()
+        self.chunk_size = max(chunk_size - chunk_size % frame_size, frame_size)
+        self.chunks = None
+        self.sent = 0
+        self.packages = 0
+
+        # Let it be just here
+        self.tag = "StreamSenderController"
+
+    def start(self) -> None:
+        '''Starts the controller'''
+
+        self.chunks = self._packChunks()
+
+        # Every chunk is delivered before the next one is taken
+        if self.scheduler == None:
+            for packages in self.chunks:
+                self.transceiver.transmit(packages)
+
+            self._finish()
+            return
+
+        self._sendNext()
+
+    def _packChunks(self):
+        '''Helper generator packing the data of the source chunk by chunk'''
+
+        for chunk in self.source.getChunks(self.chunk_size):
+            if self.batch:
+                packages = self.codec.packBatch(chunk)
+            else:
+                packages = self.codec.pack(chunk)
+
+            self.sent += len(chunk)
+            self.packages += len(packages)
+            yield packages
+
+    def _registerMetrics(self, metrics) -> None:
+        '''Helper method registering the metrics of the controller
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        labels = {"controller": self.tag}
+        metrics.counter("arq_sender_packages_total", "Packages packed",
+                        labels, lambda: self.packages)
+        metrics.counter("arq_sender_payload_bytes_total", "Bytes of the data sent",
+                        labels, lambda: self.sent)
+
+    def _sendNext(self) -> None:
+        '''Helper method sending the next chunk on the virtual clock'''
+
+        packages = next(self.chunks, None)
+        if packages == None:
+            self._finish()
+            return
+
+        self.transceiver.transmit(packages)
+
+        # The connection is busy until the chunk is transmitted
+        delay = self.transceiver.connection.getTransmissionTime(packages)
+        self.scheduler.schedule(delay, self._sendNext)
+
+    def _finish(self) -> None:
+        '''Helper method logging the amount of the data sent'''
+
+        if self.logger != None:
+            self.logger.log(self.tag, "Sent : {} bytes, packages : {}, chunk size : {}",
+                            self.sent, self.packages, self.chunk_size)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
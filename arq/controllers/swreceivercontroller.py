@@ -0,0 +1,197 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from abc import abstractmethod
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.receivercontroller import ReceiverController
+from arq.data.idatasink import IDataSink
+from arq.codec import Codec
+from arq.package import Package
+from arq.transceiver import Transceiver
+
+
+class SlidingWindowReceiverController(ReceiverController):
+    '''
+    The base of the controllers receiving the data using the sliding window
+
+    The received data is delivered in order, the feedback is sent over the
+    reverse direction of the connection. The delivered data is also passed
+    to the sink at its offset, so the received file matches the sent one
+    once the transmission is finished.
+
+    Attributes
+    ----------
+    window : int
+        Maximum amount of the packages sent, but not acknowledged yet
+    sink : IDataSink
+        The destination of the delivered data, None to keep it only
+    expected : int
+        Sequence number of the next package to deliver
+    delivered : bytearray
+        The data delivered in order
+    received : int
+        Amount of the packages received, including the repeated ones
+    received_bits : int
+        Amount of bits of the received packages
+    failed : int
+        Amount of the altered packages
+    feedback_bits : int
+        Amount of bits of the feedback sent over the connection
+
+    Methods
+    -------
+    start()
+        Starts the controller
+    onPackage(package)
+        Handle the received package
+    getData()
+        Get the data delivered in order
+    getStats()
+        Get the statistics of the transmission
+    report()
+        Log the statistics of the transmission
+    '''
+
+    def __init__(self, transceiver: Transceiver, codec: Codec, window: int = 8, sink: IDataSink = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        sink : IDataSink
+            The destination of the delivered data, None to keep it only
+        '''
+        super(SlidingWindowReceiverController, self).__init__(transceiver, codec)
+
+        if window < 1:
+            raise ValueError("Window must hold at least one package")
+
+        self.window = window
+        self.sink = sink
+        self.expected = 0
+        self.delivered = bytearray()
+
+        self.received = 0
+        self.received_bits = 0
+        self.failed = 0
+        self.feedback_bits = 0
+
+        # Let it be just here
+        self.tag = "SlidingWindowReceiverController"
+
+    def start(self) -> None:
+        '''Starts the controller'''
+
+        self.transceiver.setListener(self.onPackage)
+
+    @abstractmethod
+    def onPackage(self, package: Package) -> None:
+        '''Handle the received package
+
+        Parameters
+        ----------
+        package : Package
+            The numbered package
+        '''
+        pass
+
+    def getData(self) -> bytearray:
+        '''Get the data delivered in order
+
+        Returns
+        -------
+        bytearray
+            The data delivered in order
+        '''
+        return self.delivered
+
+    def getStats(self) -> dict:
+        '''Get the statistics of the transmission
+
+        Returns
+        -------
+        dict
+            The statistics of the transmission
+        '''
+        return {
+            "received": self.received,
+            "failed": self.failed,
+            "delivered": len(self.delivered),
+            "feedback bits": self.feedback_bits,
+            "feedback overhead": self.feedback_bits / max(self.received_bits, 1),
+        }
+
+    def report(self) -> None:
+        '''Log the statistics of the transmission'''
+
+        if self.sink != None:
+            self.sink.close()
+
+        if self.logger == None:
+            return
+
+        message = ", ".join("{} : {}".format(key, self._formatValue(value))
+                            for key, value in self.getStats().items())
+        self.logger.log(self.tag, message)
+
+    def _registerMetrics(self, metrics) -> None:
+        '''Helper method registering the metrics of the controller
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        super(SlidingWindowReceiverController, self)._registerMetrics(metrics)
+
+        labels = {"controller": self.tag}
+        metrics.counter("arq_receiver_delivered_bytes_total", "Bytes delivered in order",
+                        labels, lambda: len(self.delivered))
+        metrics.counter("arq_receiver_feedback_bits_total", "Bits of the feedback sent",
+                        labels, lambda: self.feedback_bits)
+
+    def _deliver(self, value: bytes) -> None:
+        '''Helper method delivering the data of the next package in order
+
+        Parameters
+        ----------
+        value : bytes
+            The data of the package
+        '''
+        if self.sink != None:
+            self.sink.write(len(self.delivered), value)
+
+        self.delivered += value
+
+    def _sendFeedback(self, acknowledgement: Acknowledgement) -> None:
+        '''Helper method sending the feedback over the reverse direction
+
+        Parameters
+        ----------
+        acknowledgement : Acknowledgement
+            The feedback to send
+        '''
+        self.feedback_bits += acknowledgement.getBitsNumber()
+        self.transceiver.transmit(acknowledgement)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,382 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from abc import abstractmethod
+
+from arq.acknowledgement import Acknowledgement
+from arq.controllers.sendercontroller import SenderController
+from arq.rtoestimator import RTOEstimator
+from arq.data.idatasource import IDataSource
+from arq.codec import Codec
+from arq.transceiver import Transceiver
+
+
+class SlidingWindowSenderController(SenderController):
+    '''
+    The base of the controllers sending the data using the sliding window
+
+    The data is packed while the window slides, so every package is packed
+    by the codec in use at the moment. Every package is numbered and kept
+    until it's acknowledged, the way the feedback is handled depends on the
+    protocol. The oldest package is sent again, if it isn't acknowledged
+    before the adaptive retransmission timeout. The controller is driven by
+    the events of the scheduler.
+
+    Attributes
+    ----------
+    window : int
+        Maximum amount of the packages sent, but not acknowledged yet
+    estimator : RTOEstimator
+        The estimator of the retransmission timeout
+    data : bytes
+        The data to send
+    offset : int
+        Amount of bytes of the data packed so far
+    packages : list
+        The numbered packages packed so far
+    acknowledged : bytearray
+        The flags of the acknowledged packages
+    repeated : bytearray
+        The flags of the packages sent more than once
+    sent_at : list
+        Time of the last transmission of every package
+    timer : Event
+        The retransmission timer of the oldest package, None if nothing is
+        outstanding
+    base : int
+        Sequence number of the oldest package which isn't acknowledged
+    next : int
+        Sequence number of the next package to send
+    transmissions : int
+        Amount of the packages sent, including the repeated ones
+    retransmissions : int
+        Amount of the packages sent again
+    timeouts : int
+        Amount of the expired retransmission timers
+    payload_bits : int
+        Amount of bits of the data sent
+    wire_bits : int
+        Amount of bits sent over the connection
+    occupancy : float
+        Sum of the window utilization sampled before every transmission
+    started : float
+        Time of the first transmission
+    finished : float
+        Time when the last package was acknowledged, None if it wasn't yet
+    rtt_histogram : Histogram
+        The distribution of the round-trip time, None without the metrics
+
+    Methods
+    -------
+    start()
+        Starts the controller
+    onFeedback(acknowledgement)
+        Handle the feedback of the receiver
+    onTimeout()
+        Handle the expired retransmission timer
+    isFinished()
+        Check if all the packages were acknowledged
+    getStats()
+        Get the statistics of the transmission
+    report()
+        Log the statistics of the transmission
+    '''
+
+    def __init__(self, transceiver: Transceiver,  codec: Codec, source: IDataSource, window: int = 8, estimator: RTOEstimator = None) -> None:
+        '''
+        Parameters
+        ----------
+        transceiver : Transceiver
+            The transceiver, which sends or receives data
+        codec : Codec
+            The class which handles data encoding/decoding
+        source : IDataSource
+            The source of data to send
+        window : int
+            Maximum amount of the packages sent, but not acknowledged yet
+        estimator : RTOEstimator
+            The estimator of the retransmission timeout, the default one is
+            used if it's None
+        '''
+        super(SlidingWindowSenderController, self).__init__(transceiver, codec, source)
+
+        if window < 1:
+            raise ValueError("Window must hold at least one package")
+
+        self.window = window
+        self.estimator = estimator if estimator != None else RTOEstimator()
+        self.data = bytes()
+        self.offset = 0
+        self.packages = list()
+        self.acknowledged = bytearray()
+        self.repeated = bytearray()
+        self.sent_at = list()
+        self.timer = None
+        self.base = 0
+        self.next = 0
+
+        self.transmissions = 0
+        self.retransmissions = 0
+        self.timeouts = 0
+        self.payload_bits = 0
+        self.wire_bits = 0
+        self.occupancy = 0.0
+        self.started = None
+        self.finished = None
+        self.rtt_histogram = None
+
+        # Let it be just here
+        self.tag = "SlidingWindowSenderController"
+
+    def start(self) -> None:
+        '''Starts the controller'''
+
+        if self.scheduler == None:
+            raise ValueError("The controller is driven by the scheduler")
+
+        self.data = self.source.getData()
+        self.transceiver.setListener(self.onFeedback)
+
+        self.started = self.scheduler.now()
+        self._fillWindow()
+
+        if self.isFinished():
+            self._finish()
+
+    @abstractmethod
+    def onFeedback(self, acknowledgement: Acknowledgement) -> None:
+        '''Handle the feedback of the receiver
+
+        Parameters
+        ----------
+        acknowledgement : Acknowledgement
+            The feedback of the receiver
+        '''
+        pass
+
+    def onTimeout(self) -> None:
+        '''Handle the expired retransmission timer
+
+        The oldest package wasn't acknowledged in time, so it's sent again.
+        '''
+        self.retransmissions += 1
+        self._transmit(self.base)
+
+    def isFinished(self) -> bool:
+        '''Check if all the packages were acknowledged
+
+        Returns
+        -------
+        bool
+            True if there's nothing to send, False otherwise
+        '''
+        return self.offset == len(self.data) and self.base == self.next
+
+    def getStats(self) -> dict:
+        '''Get the statistics of the transmission
+
+        Returns
+        -------
+        dict
+            The statistics, the goodput is measured in bits per second of
+            the simulated time and is None if no time has passed
+        '''
+        elapsed = None
+        goodput = None
+        if self.finished != None:
+            elapsed = self.finished - self.started
+            if elapsed > 0:
+                goodput = self.payload_bits / elapsed
+
+        return {
+            "packages": len(self.packages),
+            "transmissions": self.transmissions,
+            "retransmissions": self.retransmissions,
+            "timeouts": self.timeouts,
+            "rto": self.estimator.getTimeout(),
+            "srtt": self.estimator.getSmoothedRTT(),
+            "window utilization": self.occupancy / max(self.transmissions, 1),
+            "efficiency": self.payload_bits / max(self.wire_bits, 1),
+            "wire per byte": self.wire_bits / max(self.payload_bits, 1),
+            "goodput": goodput,
+            "time": elapsed,
+        }
+
+    def report(self) -> None:
+        '''Log the statistics of the transmission'''
+
+        if self.logger == None:
+            return
+
+        message = ", ".join("{} : {}".format(key, self._formatValue(value))
+                            for key, value in self.getStats().items())
+        self.logger.log(self.tag, message)
+
+    def _registerMetrics(self, metrics) -> None:
+        '''Helper method registering the metrics of the controller
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        labels = {"controller": self.tag}
+        metrics.counter("arq_sender_packages_total", "Packages packed",
+                        labels, lambda: len(self.packages))
+        metrics.counter("arq_sender_transmissions_total", "Packages sent, including the repeated ones",
+                        labels, lambda: self.transmissions)
+        metrics.counter("arq_sender_retransmissions_total", "Packages sent again",
+                        labels, lambda: self.retransmissions)
+        metrics.counter("arq_sender_timeouts_total", "Expired retransmission timers",
+                        labels, lambda: self.timeouts)
+        metrics.counter("arq_sender_payload_bytes_total", "Bytes of the data sent",
+                        labels, lambda: self.payload_bits // 8)
+        metrics.counter("arq_sender_wire_bits_total", "Bits sent over the connection",
+                        labels, lambda: self.wire_bits)
+        metrics.gauge("arq_sender_window_occupancy", "Part of the window sent, but not acknowledged",
+                      labels, lambda: (self.next - self.base) / self.window)
+        metrics.gauge("arq_sender_rto_seconds", "Retransmission timeout",
+                      labels, self.estimator.getTimeout)
+        self.rtt_histogram = metrics.histogram(
+            "arq_sender_rtt_seconds", "Round-trip time of the packages sent once", labels)
+
+    def _fillWindow(self) -> None:
+        '''Helper method sending the new packages while the window has room'''
+
+        while self.next < self.base + self.window and self.offset < len(self.data):
+            self._packNext()
+            self.next += 1
+            self.payload_bits += len(self.packages[self.next - 1].getValue()) * 8
+            self._transmit(self.next - 1)
+
+    def _packNext(self) -> None:
+        '''Helper method packing the next part of the data'''
+
+        frame = self.data[self.offset:self.offset + self.codec.getFrameSize()]
+        self.offset += len(frame)
+
+        package = self.codec.pack(frame)[0]
+        package.setSequence(len(self.packages))
+
+        self.packages.append(package)
+        self.acknowledged.append(0)
+        self.repeated.append(0)
+        self.sent_at.append(None)
+
+    def _transmit(self, sequence: int) -> None:
+        '''Helper method sending a single package
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        '''
+        package = self.packages[sequence]
+
+        self.transmissions += 1
+        self.wire_bits += package.getBitsNumber()
+        self.occupancy += (self.next - self.base) / self.window
+
+        # The round-trip time of the repeated package is ambiguous
+        if self.sent_at[sequence] != None:
+            self.repeated[sequence] = 1
+
+        self.sent_at[sequence] = self.scheduler.now()
+
+        # A single timer guards all the outstanding packages (RFC 6298)
+        if self.timer == None:
+            self._startTimer()
+
+        # The connection alters the package it sends, so the original is kept
+        self.transceiver.transmit(package.copy())
+
+    def _acknowledge(self, sequence: int) -> None:
+        '''Helper method marking the package as acknowledged
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        '''
+        if self.acknowledged[sequence]:
+            return
+
+        self.acknowledged[sequence] = 1
+
+        # Karn's rule : only the packages sent once are measured
+        if not self.repeated[sequence]:
+            sample = self.scheduler.now() - self.sent_at[sequence]
+            self.estimator.update(sample)
+
+            if self.rtt_histogram != None:
+                self.rtt_histogram.record(sample)
+
+    def _advance(self, base: int) -> None:
+        '''Helper method sliding the window over the acknowledged packages
+
+        The timer is restarted every time the oldest package is acknowledged.
+
+        Parameters
+        ----------
+        base : int
+            Sequence number of the oldest package, which may be unacknowledged
+        '''
+        while base < self.next and self.acknowledged[base]:
+            base += 1
+
+        if base == self.base:
+            return
+
+        self.base = base
+
+        if self.timer != None:
+            self.timer.cancel()
+            self.timer = None
+
+        if self.base < self.next:
+            self._startTimer()
+
+    def _startTimer(self) -> None:
+        '''Helper method starting the retransmission timer'''
+
+        self.timer = self.scheduler.schedule(self.estimator.getTimeout(), self._expire)
+
+    def _expire(self) -> None:
+        '''Helper method handling the expired retransmission timer'''
+
+        self.timer = None
+        self.timeouts += 1
+
+        self.estimator.backoff()
+        self.onTimeout()
+
+        # The timer is started again by the transmission, but not necessarily
+        if self.timer == None and self.base < self.next:
+            self._startTimer()
+
+    def _finish(self) -> None:
+        '''Helper method saving the time when all the packages were acknowledged'''
+
+        # The late feedback may report the end again
+        if self.finished != None:
+            return
+
+        self.finished = self.scheduler.now()
+        self.report()
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
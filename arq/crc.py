@@ -0,0 +1,199 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import binascii
+import struct
+import zlib
+
+
+class CRC:
+    '''
+    Table-driven cyclic redundancy check implementation
+
+    Attributes
+    ----------
+    name : str
+        Name of the algorithm
+    width : int
+        Amount of the check bits
+    poly : int
+        The generator polynomial
+    init : int
+        Initial value of the register
+    reflected : bool
+        Whether the bytes are processed starting from the LSB
+    xorout : int
+        The value XORed with the final register
+    table : list
+        Precomputed register updates for every possible byte
+    slices : list
+        Tables for processing several bytes at once (slice-by-N)
+    native : callable
+        The standard library implementation of the same algorithm, if any
+
+    Methods
+    -------
+    calculate(data)
+        Calculate the check value of the data
+    update(crc, data)
+        Feed the data into the register
+    '''
+
+    # Amount of bytes processed at once by the sliced update
+    SLICES = 4
+
+    def __init__(self, name: str, width: int, poly: int, init: int, reflected: bool, xorout: int, native=None) -> None:
+        '''
+        Parameters
+        ----------
+        name : str
+            Name of the algorithm
+        width : int
+            Amount of the check bits
+        poly : int
+            The generator polynomial
+        init : int
+            Initial value of the register
+        reflected : bool
+            Whether the bytes are processed starting from the LSB
+        xorout : int
+            The value XORed with the final register
+        native : callable
+            The standard library implementation of the same algorithm
+        '''
+        # Check if the register can hold a whole byte
+        if width % 8 != 0:
+            raise ValueError("CRC width must be a multiple of 8")
+
+        self.name = name
+        self.width = width
+        self.poly = poly
+        self.init = init
+        self.reflected = reflected
+        self.xorout = xorout
+        self.native = native
+
+        self.mask = (1 << width) - 1
+        self.table = self._buildTable()
+
+        # Slice-by-N only pays off when a byte fills the whole register
+        self.slices = self._buildSlices() if width == 8 else None
+
+    def calculate(self, data: bytes) -> int:
+        '''Calculate the check value of the data
+
+        Parameters
+        ----------
+        data : bytes
+            The data to check
+
+        Returns
+        -------
+        int
+            The check value
+        '''
+        if self.native != None:
+            return self.native(data)
+
+        return self.update(self.init, data) ^ self.xorout
+
+    def update(self, crc: int, data: bytes) -> int:
+        '''Feed the data into the register
+
+        Parameters
+        ----------
+        crc : int
+            Current value of the register
+        data : bytes
+            The data to process
+
+        Returns
+        -------
+        int
+            New value of the register
+        '''
+        table = self.table
+
+        if self.slices != None:
+            # Process the whole slices first
+            tail = len(data) % self.SLICES
+            t3, t2, t1, t0 = self.slices
+            for b0, b1, b2, b3 in struct.iter_unpack("4B", data[:len(data) - tail]):
+                crc = t3[crc ^ b0] ^ t2[b1] ^ t1[b2] ^ t0[b3]
+
+            data = data[len(data) - tail:]
+
+        if self.reflected:
+            for byte in data:
+                crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        else:
+            shift = self.width - 8
+            for byte in data:
+                crc = table[((crc >> shift) ^ byte) & 0xFF] ^ ((crc << 8) & self.mask)
+
+        return crc
+
+    def _buildTable(self) -> list:
+        '''Helper method for the register update table calculation'''
+        table = list()
+
+        for byte in range(0, 256):
+            if self.reflected:
+                poly = int('{:0{}b}'.format(self.poly, self.width)[::-1], 2)
+
+                crc = byte
+                for index in range(0, 8):
+                    crc = (crc >> 1) ^ (poly if crc & 1 else 0)
+            else:
+                top = 1 << (self.width - 1)
+
+                crc = byte << (self.width - 8)
+                for index in range(0, 8):
+                    crc = ((crc << 1) ^ (self.poly if crc & top else 0)) & self.mask
+
+            table.append(crc)
+
+        return table
+
+    def _buildSlices(self) -> list:
+        '''Helper method for the slice-by-N tables calculation
+
+        The table of a slice maps a byte to the register after the byte is
+        followed by the given amount of zero bytes, which is possible since
+        a CRC is linear over XOR.
+        '''
+        slices = [self.table]
+        for index in range(1, self.SLICES):
+            previous = slices[-1]
+            slices.append([self.table[value] for value in previous])
+
+        # The first byte of the slice is shifted the most
+        slices.reverse()
+        return slices
+
+
+# The most common CRC algorithms
+CRC8 = CRC("crc8", 8, 0x07, 0x00, False, 0x00)
+CRC16 = CRC("crc16", 16, 0x1021, 0xFFFF, False, 0x0000,
+            lambda data: binascii.crc_hqx(data, 0xFFFF))
+CRC32 = CRC("crc32", 32, 0x04C11DB7, 0xFFFFFFFF, True, 0xFFFFFFFF,
+            zlib.crc32)
+
+CRCS = {crc.name: crc for crc in (CRC8, CRC16, CRC32)}
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,151 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.codec import Codec
+from arq.crc import CRC
+
+
+class CRCCodec(Codec):
+    '''
+    Encoder/decoder class implementation using a CRC instead of parity
+
+    Attributes
+    ----------
+    crc : CRC
+        The CRC algorithm to use
+
+    Methods
+    -------
+    calculateParity(data, bits)
+        Calculate the CRC of the data
+    checkParity(data, bits, parity)
+        Check if the CRC is correct
+    calculateChecksum(frame)
+        Calculate the CRC of the package data
+    getCheckWidth()
+        Get the amount of check bits of a package
+    getFailureProbability(ber, size)
+        Estimate the probability of a package to be reported as altered
+    '''
+
+    def __init__(self, package_size: int, pbits: int, crc: CRC, frame_size: int = 1) -> None:
+        '''
+        Parameters
+        ----------
+        package_size : int
+            Size of the package
+        pbits: int
+            Amount of parity bits
+        crc : CRC
+            The CRC algorithm to use
+        frame_size : int
+            Amount of bytes of the data of every package
+        '''
+        self.crc = crc
+
+        super(CRCCodec, self).__init__(package_size, pbits, frame_size)
+
+        # The CRC of every single byte package is known in advance
+        self.check_table = [self.calculateParity(byte, pbits)
+                            for byte in range(0, 256)]
+
+    def calculateParity(self, data: int, bits: int) -> int:
+        ''' Calculate the CRC of the data
+
+        Parameters
+        ----------
+        data: int
+            The data for calculation
+        bits:
+            The amount of parity bits, not used by the CRC
+
+        Returns
+        -------
+        int
+            The CRC of the data
+        '''
+        return self.crc.calculate(bytes([data]))
+
+    def checkParity(self, data: int, bits: int, parity: int) -> bool:
+        ''' Check if the CRC is correct
+
+        Parameters
+        ----------
+        data: int
+            The data for calculation
+        bits:
+            The amount of parity bits, not used by the CRC
+        parity : int
+            Received CRC
+
+        Returns
+        -------
+        bool
+            True if the CRC is correct, False otherwise
+        '''
+        return self.check_table[data] == parity
+
+    def calculateChecksum(self, frame: bytes) -> int:
+        ''' Calculate the CRC of the package data
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+
+        Returns
+        -------
+        int
+            The CRC of the package data
+        '''
+        if len(frame) == 1:
+            return self.check_table[frame[0]]
+
+        return self.crc.calculate(bytes(frame))
+
+    def getCheckWidth(self) -> int:
+        ''' Get the amount of check bits of a package
+
+        Returns
+        -------
+        int
+            Amount of check bits
+        '''
+        return self.crc.width
+
+    def getFailureProbability(self, ber: float, size: int = None) -> float:
+        ''' Estimate the probability of a package to be reported as altered
+
+        Parameters
+        ----------
+        ber : float
+            The probability of a bit to be flipped
+        size : int
+            Amount of bytes of the data, the frame size is used if it's None
+
+        Returns
+        -------
+        float
+            The probability of the package to fail the check
+        '''
+        bits = (size if size != None else self.frame_size) * 8
+
+        # The undetected errors are negligible for the CRC
+        return 1 - (1 - ber) ** bits
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -16,9 +16,10 @@
 
 import random
 from arq.data.idatasource import IDataSource
+from utils.profiler import span
 
 
-class BasicDataSource:
+class BasicDataSource(IDataSource):
     '''
     Basic data source implementation
 
@@ -26,23 +27,34 @@ class BasicDataSource:
     ----------
     size : int
         Size of the data to generate
+    rng : random.Random
+        The source of randomness
 
     Methods
     -------
     getData()
         Returns the data, which is used in the transmission
-    randomizeData(ssize)
+    getChunks(size)
+        Returns the data in chunks, so it can be streamed
+    randomizeData(size)
         Get random data
     '''
 
-    def __init__(self, size: int) -> None:
+    # Maximum amount of bytes generated at once
+    PIECE_SIZE = 1 << 20
+
+    def __init__(self, size: int, seed: int = None) -> None:
         '''
         Parameters
         ----------
         size : int
             Size of the data to generate
+        seed : int
+            The seed of the generated data, the random module is used if
+            it's None
         '''
         self.size = size
+        self.rng = random.Random(seed) if seed != None else random
 
     def getData(self) -> bytearray:
         '''Returns the data, which is used in the transmission
@@ -55,6 +67,36 @@ class BasicDataSource:
         data = self.randomizeData(self.size)
         return data
 
+    def getChunks(self, size: int):
+        '''Returns the data in chunks, so it can be streamed
+
+        Every chunk is generated when it's requested, so the whole data is
+        never kept in memory. The chunks hold the same bytes as the data of
+        the source with the same seed.
+
+        Parameters
+        ----------
+        size : int
+            Maximum amount of bytes of a chunk
+
+        Yields
+        ------
+        bytearray
+            The next part of the data
+        '''
+        # The bytes generated past the end of a chunk start the next one
+        pending = bytearray()
+        for offset in range(0, self.size, size):
+            length = min(size, self.size - offset)
+
+            missing = length - len(pending)
+            if missing > 0:
+                pending += self.randomizeData(missing + (-missing) % 4)
+
+            chunk = pending[:length]
+            del pending[:length]
+            yield chunk
+
     def randomizeData(self, size: int) -> bytearray:
         '''Get random data
 
@@ -68,13 +110,18 @@ class BasicDataSource:
         bytearray
             The generated bytes
         '''
-
-        # Generate random integers
-        data = bytearray()
-        for index in range(0, size):
-            data.append(random.randint(0, 255))
-
-        return data
+        with span("source"):
+            data = bytearray(size)
+
+            # Take the random bits in bulk, a piece at a time to avoid huge integers.
+            # Whole 32-bit words are taken, so the bytes don't depend on the pieces
+            for offset in range(0, size, self.PIECE_SIZE):
+                length = min(self.PIECE_SIZE, size - offset)
+                padded = length + (-length) % 4
+                piece = self.rng.getrandbits(padded * 8).to_bytes(padded, 'little')
+                data[offset:offset + length] = piece[:length]
+
+            return data
 
 
 if __name__ == '__main__':
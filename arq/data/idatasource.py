@@ -25,6 +25,8 @@ class IDataSource(ABC):
     -------
     getData()
         Returns the data, which is used in the transmission
+    getChunks(size)
+        Returns the data in chunks, so it can be streamed
     '''
 
     @abstractmethod
@@ -38,6 +40,26 @@ class IDataSource(ABC):
         '''
         pass
 
+    def getChunks(self, size: int):
+        '''Returns the data in chunks, so it can be streamed
+
+        The whole data is taken at once by default, the sources able to
+        produce the data gradually should override the method.
+
+        Parameters
+        ----------
+        size : int
+            Maximum amount of bytes of a chunk
+
+        Yields
+        ------
+        bytearray
+            The next part of the data
+        '''
+        data = self.getData()
+        for offset in range(0, len(data), size):
+            yield data[offset:offset + size]
+
 
 if __name__ == '__main__':
     print("This file shouldn't be used as a separate script")
@@ -0,0 +1,101 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import mmap
+from arq.data.idatasink import IDataSink
+
+
+class MmapFileSink(IDataSink):
+    '''
+    Data sink writing the received data into a file
+
+    The file is allocated for the whole data beforehand and mapped into
+    memory, so every part of the data is written straight at its offset.
+    The parts which weren't received intact are left zeroed.
+
+    Attributes
+    ----------
+    path : str
+        Path of the file to write
+    size : int
+        Size of the whole data (in bytes)
+    file : file
+        The opened file, None if it's closed or empty
+    mapping : mmap.mmap
+        The memory mapping of the file, None if it's closed or empty
+    written : int
+        Amount of bytes written
+
+    Methods
+    -------
+    write(offset, data)
+        Writes the received data at its offset in the stream
+    close()
+        Finishes the writing
+    '''
+
+    def __init__(self, path: str, size: int) -> None:
+        '''
+        Parameters
+        ----------
+        path : str
+            Path of the file to write, it's overwritten if it exists
+        size : int
+            Size of the whole data (in bytes)
+        '''
+        self.path = path
+        self.size = size
+        self.written = 0
+        self.mapping = None
+
+        self.file = open(path, 'w+b')
+        self.file.truncate(size)
+
+        # An empty file can't be mapped
+        if size > 0:
+            self.mapping = mmap.mmap(self.file.fileno(), size)
+
+    def write(self, offset: int, data: bytes) -> None:
+        '''Writes the received data at its offset in the stream
+
+        Parameters
+        ----------
+        offset : int
+            Offset of the data in the stream (in bytes)
+        data : bytes
+            The intact data received
+        '''
+        if offset < 0 or offset + len(data) > self.size:
+            raise ValueError("The data doesn't fit the file")
+
+        self.mapping[offset:offset + len(data)] = data
+        self.written += len(data)
+
+    def close(self) -> None:
+        '''Finishes the writing'''
+
+        if self.mapping != None:
+            self.mapping.flush()
+            self.mapping.close()
+            self.mapping = None
+
+        if self.file != None:
+            self.file.close()
+            self.file = None
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,111 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import mmap
+import os
+from arq.data.idatasource import IDataSource
+
+
+class MmapFileSource(IDataSource):
+    '''
+    Data source serving the contents of a file
+
+    The file is mapped into memory, so the data is served as read-only
+    views of the mapping without copying and only the pages in use are
+    kept in memory by the system.
+
+    Attributes
+    ----------
+    path : str
+        Path of the file to send
+    size : int
+        Size of the file (in bytes)
+    file : file
+        The opened file, None if it's empty
+    mapping : mmap.mmap
+        The memory mapping of the file, None if it's empty
+
+    Methods
+    -------
+    getData()
+        Returns the data, which is used in the transmission
+    getChunks(size)
+        Returns the data in chunks, so it can be streamed
+    close()
+        Closes the file
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+        Parameters
+        ----------
+        path : str
+            Path of the file to send
+        '''
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.file = None
+        self.mapping = None
+
+        # An empty file can't be mapped
+        if self.size > 0:
+            self.file = open(path, 'rb')
+            self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def getData(self) -> memoryview:
+        '''Returns the data, which is used in the transmission
+
+        Returns
+        --------
+        memoryview
+            The view of the whole file
+        '''
+        if self.mapping == None:
+            return memoryview(b'')
+
+        return memoryview(self.mapping)
+
+    def getChunks(self, size: int):
+        '''Returns the data in chunks, so it can be streamed
+
+        Parameters
+        ----------
+        size : int
+            Maximum amount of bytes of a chunk
+
+        Yields
+        ------
+        memoryview
+            The view of the next part of the file
+        '''
+        data = self.getData()
+        for offset in range(0, self.size, size):
+            yield data[offset:offset + size]
+
+    def close(self) -> None:
+        '''Closes the file
+
+        All the views of the data must be released before.
+        '''
+        if self.mapping != None:
+            self.mapping.close()
+            self.file.close()
+            self.mapping = None
+            self.file = None
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
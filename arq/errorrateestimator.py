@@ -0,0 +1,150 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from math import sqrt
+
+from arq.codec import Codec
+
+
+class ErrorRateEstimator:
+    '''
+    Running estimate of the bit error rate from the failed packages
+
+    The recent packages weigh more, so the estimate follows the changes of
+    the connection. The failures are counted separately for every codec and
+    turned into the bit error rate with the failure model of the codec.
+
+    Attributes
+    ----------
+    decay : float
+        The weight the counters keep after every package
+    estimate : float
+        The last estimate, kept while there are too few packages counted
+    counters : dict
+        Maps the codec to the weighted amounts of its packages and failures
+
+    Methods
+    -------
+    update(codec, failed)
+        Count the received package
+    getErrorRate()
+        Get the estimated bit error rate
+    '''
+
+    # The range of the estimated bit error rate
+    MINIMUM = 1e-9
+    MAXIMUM = 0.5
+
+    # Weighted amount of the packages of a codec needed for the estimate
+    MINIMUM_FRAMES = 32
+
+    # Steps of the bisection inverting the failure model
+    ITERATIONS = 40
+
+    def __init__(self, memory: int = 1000, initial: float = 0.0) -> None:
+        '''
+        Parameters
+        ----------
+        memory : int
+            Amount of the recent packages the estimate mostly depends on
+        initial : float
+            The estimate used before enough packages are received
+        '''
+        if memory < 1:
+            raise ValueError("Memory must hold at least one package")
+
+        self.decay = 1 - 1 / memory
+        self.estimate = initial
+        self.counters = dict()
+
+    def update(self, codec: Codec, failed: bool) -> None:
+        '''Count the received package
+
+        Parameters
+        ----------
+        codec : Codec
+            The codec of the package
+        failed : bool
+            Whether the package failed the check
+        '''
+        for counter in self.counters.values():
+            counter[0] *= self.decay
+            counter[1] *= self.decay
+
+        counter = self.counters.setdefault(codec, [0.0, 0.0])
+        counter[0] += 1
+        counter[1] += 1 if failed else 0
+
+    def getErrorRate(self) -> float:
+        '''Get the estimated bit error rate
+
+        Returns
+        -------
+        float
+            The bit error rate, which makes every codec fail as often as its
+            packages did, weighted by the amount of the packages
+        '''
+        total = 0.0
+        weighted = 0.0
+
+        for codec, (frames, failures) in self.counters.items():
+            if frames < self.MINIMUM_FRAMES:
+                continue
+
+            # Pulled away from zero failures towards a half for the few
+            # packages received, so a clean sample never reads as error-free
+            rate = (failures + 0.5) / (frames + 1)
+
+            total += frames
+            weighted += frames * self._invert(codec, rate)
+
+        if total != 0:
+            self.estimate = weighted / total
+
+        return self.estimate
+
+    def _invert(self, codec: Codec, rate: float) -> float:
+        '''Helper method finding the bit error rate for the failure rate
+
+        Parameters
+        ----------
+        codec : Codec
+            The codec of the packages
+        rate : float
+            The rate of the failed packages
+        '''
+        low = self.MINIMUM
+        high = self.MAXIMUM
+
+        if rate <= codec.getFailureProbability(low):
+            return low
+
+        if rate >= codec.getFailureProbability(high):
+            return high
+
+        # The failure probability grows with the bit error rate
+        for step in range(0, self.ITERATIONS):
+            middle = sqrt(low * high)
+            if codec.getFailureProbability(middle) < rate:
+                low = middle
+            else:
+                high = middle
+
+        return sqrt(low * high)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
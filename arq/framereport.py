@@ -0,0 +1,134 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.data.idatasource import IDataSource
+from arq.transceiver import Transceiver
+
+
+class FrameReport:
+    '''
+    Measures the throughput of a transmission for several frame sizes
+
+    The throughput is the share of the bits sent over the connection, which
+    are delivered as the data of intact packages, so both the overhead of
+    the check bits and the loss of the altered packages are accounted.
+
+    Attributes
+    ----------
+    create_codec : callable
+        Creates the codec for the given frame size
+    create_connection : callable
+        Connects the given transceivers
+    source : IDataSource
+        The source of data to send
+    frame_sizes : list
+        The frame sizes to measure
+
+    Methods
+    -------
+    run()
+        Measure the throughput for every frame size
+    format(rows)
+        Format the measured rows as text lines
+    '''
+
+    # From 64 B to 64 KiB
+    FRAME_SIZES = [64, 256, 1024, 4096, 16384, 65536]
+
+    def __init__(self, create_codec, create_connection, source: IDataSource, frame_sizes: list = FRAME_SIZES) -> None:
+        '''
+        Parameters
+        ----------
+        create_codec : callable
+            Creates the codec for the given frame size
+        create_connection : callable
+            Connects the given transceivers
+        source : IDataSource
+            The source of data to send
+        frame_sizes : list
+            The frame sizes to measure
+        '''
+        self.create_codec = create_codec
+        self.create_connection = create_connection
+        self.source = source
+        self.frame_sizes = frame_sizes
+
+    def run(self) -> list:
+        '''Measure the throughput for every frame size
+
+        Returns
+        -------
+        list
+            A dictionary with the statistics for every frame size
+        '''
+        data = self.source.getData()
+        rows = list()
+
+        for frame_size in self.frame_sizes:
+            codec = self.create_codec(frame_size)
+
+            # Use a new connection for every measurement
+            transmitter = Transceiver()
+            receiver = Transceiver()
+            self.create_connection(receiver, transmitter)
+
+            transmitter.transmit(codec.packBatch(data))
+            unpacked, mask = codec.unpackBatch(receiver.getReceived())
+
+            # Only the data of the intact packages is delivered
+            frames = len(mask)
+            failed = mask.count(0)
+            delivered = len(data) - failed * frame_size
+            if frames > 0 and not mask[-1]:
+                # The last package may be shorter than the others
+                delivered += frames * frame_size - len(data)
+
+            wire_bits = len(data) * 8 + frames * codec.getCheckWidth()
+
+            rows.append({
+                "frame_size": frame_size,
+                "frames": frames,
+                "failed": failed,
+                "overhead": frames * codec.getCheckWidth() / max(wire_bits, 1),
+                "throughput": delivered * 8 / max(wire_bits, 1),
+            })
+
+        return rows
+
+    def format(self, rows: list) -> list:
+        '''Format the measured rows as text lines
+
+        Parameters
+        ----------
+        rows : list
+            The statistics returned by run()
+
+        Returns
+        -------
+        list
+            The lines of the report
+        '''
+        lines = ["frame size | frames | failed | overhead | throughput"]
+        for row in rows:
+            lines.append("{:>10} | {:>6} | {:>6} | {:>7.3%} | {:>9.3%}".format(
+                row["frame_size"], row["frames"], row["failed"],
+                row["overhead"], row["throughput"]))
+
+        return lines
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
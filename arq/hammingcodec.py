@@ -0,0 +1,432 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.codec import Codec
+from arq.packagebatch import PackageBatch
+from utils.bits import xorBytes
+from utils.profiler import span
+
+
+class HammingCodec(Codec):
+    '''
+    Encoder/decoder class implementation using a Hamming code, which
+    corrects single bit errors instead of only detecting them
+
+    The data of a package is split into words, every word gets its own
+    Hamming check bits and, for the extended (SECDED) codes, an overall
+    parity bit, which allows to detect double bit errors. Words wider than
+    the data are padded with zero bits, which are never transmitted.
+
+    The words are grouped into units of whole bytes (a byte for the 4 and
+    8-bit words, two bytes for the 16-bit ones), the check bits of a
+    package are the check bits of all its units, the first unit being the
+    MSB.
+
+    Attributes
+    ----------
+    scheme : str
+        Name of the code
+    word_size : int
+        Amount of data bits of a word
+    extended : bool
+        Whether the overall parity bit is added to every word
+    rbits : int
+        Amount of Hamming check bits of a word
+    unit_size : int
+        Amount of bytes of a unit
+    unit_errors : dict
+        Maps the syndrome of a unit to the bits to flip in its data
+    correction_table : bytes
+        Maps the syndrome of a single byte package to the bits to flip
+    status_table : bytes
+        Maps the syndrome of a single byte package to 1 if it can be corrected
+
+    Methods
+    -------
+    unpackBatch(batch)
+        Unpack the whole batch at once, correcting it where possible
+    calculateParity(data, bits)
+        Calculate the check bits of the data
+    calculateChecksum(frame)
+        Calculate the check bits of the package data
+    getCheckWidth()
+        Get the amount of check bits of a package
+    getChecksumWidth(size)
+        Get the amount of check bits of the data of the given size
+    getFailureProbability(ber, size)
+        Estimate the probability of a package to be reported as altered
+    '''
+
+    # Data bits of a word and the presence of the overall parity bit
+    SCHEMES = {
+        "hamming74": (4, False),
+        "secded8": (8, True),
+        "secded16": (16, True),
+    }
+
+    def __init__(self, package_size: int, pbits: int, scheme: str, frame_size: int = 1) -> None:
+        '''
+        Parameters
+        ----------
+        package_size : int
+            Size of the package
+        pbits: int
+            Amount of parity bits
+        scheme : str
+            Name of the code, one of HammingCodec.SCHEMES
+        frame_size : int
+            Amount of bytes of the data of every package
+        '''
+        if scheme not in self.SCHEMES:
+            raise ValueError("Unknown Hamming code : {}".format(scheme))
+
+        self.scheme = scheme
+        self.word_size, self.extended = self.SCHEMES[scheme]
+        self.unit_size = max(1, self.word_size // 8)
+
+        # The check bits have to address every bit of the code word
+        self.rbits = 1
+        while (1 << self.rbits) < self.word_size + self.rbits + 1:
+            self.rbits += 1
+
+        self.columns = self._buildColumns()
+
+        # Check bits of every byte of a unit, XORed together
+        self.unit_tables = list()
+        for index in range(0, self.unit_size):
+            shift = (self.unit_size - 1 - index) * 8
+            self.unit_tables.append(bytes(
+                self._encodeUnit(byte << shift) for byte in range(0, 256)))
+
+        # Binary digits of the check bits of every unit
+        self.unit_digits = ['{:0{}b}'.format(check, self._getUnitCheckWidth()).encode('ascii')
+                            for check in range(0, 256)]
+
+        self.unit_errors = self._buildUnitErrors()
+
+        super(HammingCodec, self).__init__(package_size, pbits, frame_size)
+
+        self.correction_table, self.status_table = self._buildSyndromeTables()
+
+    def unpackBatch(self, batch: PackageBatch) -> tuple:
+        '''Unpack the whole batch at once, correcting it where possible
+
+        Parameters
+        ----------
+        batch : PackageBatch
+            The batch to unpack
+
+        Returns
+        -------
+        tuple
+            The corrected data and the validity mask, which holds 1 for
+            every intact or corrected package and 0 for every altered one
+        '''
+        # Only the packages of a single byte can be looked up in the tables,
+        # the rest are measured by decodeFrame()
+        if self.frame_size != 1:
+            return self._unpackFrames(batch)
+
+        with span("codec.unpack"):
+            value = bytes(batch.getValue())
+            syndromes = xorBytes(self._calculateBatchParity(value),
+                                 batch.getParityBits())
+
+            corrected = xorBytes(value, syndromes.translate(self.correction_table))
+            # The packages looked up in the tables skip decodeFrame()
+            mask = bytearray(syndromes.translate(self.status_table))
+            if self.decoded_counter != None:
+                self._countDecoded(len(mask), mask.count(0))
+
+            return bytearray(corrected), mask
+
+    def calculateParity(self, data: int, bits: int) -> int:
+        ''' Calculate the check bits of the data
+
+        Parameters
+        ----------
+        data: int
+            The data for calculation
+        bits:
+            The amount of parity bits, not used by the Hamming code
+
+        Returns
+        -------
+        int
+            Check bits of all the words, the first word being the MSB
+        '''
+        return self._encodeUnit(data << ((self.unit_size - 1) * 8))
+
+    def calculateChecksum(self, frame: bytes) -> int:
+        ''' Calculate the check bits of the package data
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+
+        Returns
+        -------
+        int
+            Check bits of all the units, the first unit being the MSB
+        '''
+        if len(frame) == 1:
+            return self.calculateParity(frame[0], self.pbits)
+
+        checks = self._calculateUnitChecks(frame)
+        return int(b''.join(map(self.unit_digits.__getitem__, checks)), 2)
+
+    def _decodeFrame(self, frame: bytes, parity: int) -> bytes:
+        '''Helper method checking and correcting the package data
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+        parity : int
+            Received check bits
+        '''
+        if len(frame) == 1:
+            syndrome = self.calculateParity(frame[0], self.pbits) ^ parity
+            if not self.status_table[syndrome]:
+                return None
+
+            return bytes([frame[0] ^ self.correction_table[syndrome]])
+
+        syndromes = self.calculateChecksum(frame) ^ parity
+        if syndromes == 0:
+            return frame
+
+        # Pad the data up to the whole units
+        data = bytearray(frame)
+        data.extend(bytes(-len(frame) % self.unit_size))
+
+        width = self._getUnitCheckWidth()
+        units = len(data) // self.unit_size
+        digits = '{:0{}b}'.format(syndromes, units * width)
+
+        for unit in range(0, units):
+            syndrome = int(digits[unit * width:(unit + 1) * width], 2)
+            if syndrome == 0:
+                continue
+
+            # The syndrome of more errors than the code can correct
+            error = self.unit_errors.get(syndrome)
+            if error == None:
+                return None
+
+            start = unit * self.unit_size
+            for index in range(0, self.unit_size):
+                data[start + index] ^= (error >> ((self.unit_size - 1 - index) * 8)) & 0xFF
+
+        # The padding can't be altered by a correctable error
+        if any(data[len(frame):]):
+            return None
+
+        return bytes(data[:len(frame)])
+
+    def getCheckWidth(self) -> int:
+        ''' Get the amount of check bits of a package
+
+        Returns
+        -------
+        int
+            Amount of check bits
+        '''
+        return self.getChecksumWidth(self.frame_size)
+
+    def getChecksumWidth(self, size: int) -> int:
+        ''' Get the amount of check bits of the data of the given size
+
+        Parameters
+        ----------
+        size : int
+            Amount of bytes of the data
+
+        Returns
+        -------
+        int
+            Amount of check bits
+        '''
+        units = (size + self.unit_size - 1) // self.unit_size
+        return units * self._getUnitCheckWidth()
+
+    def getFailureProbability(self, ber: float, size: int = None) -> float:
+        ''' Estimate the probability of a package to be reported as altered
+
+        Parameters
+        ----------
+        ber : float
+            The probability of a bit to be flipped
+        size : int
+            Amount of bytes of the data, the frame size is used if it's None
+
+        Returns
+        -------
+        float
+            The probability of any word to have more than one flipped bit,
+            though Hamming(7,4) may miscorrect such a word instead
+        '''
+        bits = (size if size != None else self.frame_size) * 8
+        words, rest = divmod(bits, self.word_size)
+
+        success = self._getWordSuccess(ber, self.word_size) ** words
+        if rest != 0:
+            success *= self._getWordSuccess(ber, rest)
+
+        return 1 - success
+
+    def _getWordSuccess(self, ber: float, bits: int) -> float:
+        '''Helper method returning the probability of a word to be corrected
+
+        Parameters
+        ----------
+        ber : float
+            The probability of a bit to be flipped
+        bits : int
+            Amount of the data bits of the word
+        '''
+        return (1 - ber) ** bits + bits * ber * (1 - ber) ** (bits - 1)
+
+    def _getWordCheckWidth(self) -> int:
+        '''Helper method returning the amount of check bits of a word'''
+        return self.rbits + (1 if self.extended else 0)
+
+    def _getUnitCheckWidth(self) -> int:
+        '''Helper method returning the amount of check bits of a unit'''
+        return len(self._splitWords(0)) * self._getWordCheckWidth()
+
+    def _buildColumns(self) -> list:
+        '''Helper method for the parity-check matrix calculation
+
+        Every data bit gets a position of the code word, which is not a
+        power of two, starting from the MSB of the word. The position is
+        also the syndrome of the error in this bit.
+        '''
+        columns = list()
+
+        position = 1
+        while len(columns) < self.word_size:
+            position += 1
+            if position & (position - 1) != 0:
+                columns.append(position)
+
+        return columns
+
+    def _encodeWord(self, word: int) -> int:
+        '''Helper method for the check bits calculation of a single word'''
+        check = 0
+        for index, column in enumerate(self.columns):
+            if (word >> (self.word_size - 1 - index)) & 1:
+                check ^= column
+
+        if not self.extended:
+            return check
+
+        # The overall parity covers both the data and the check bits
+        overall = (bin(word).count("1") + bin(check).count("1")) & 1
+        return (check << 1) | overall
+
+    def _encodeUnit(self, data: int) -> int:
+        '''Helper method for the check bits calculation of a single unit'''
+        parity = 0
+        for word in self._splitWords(data):
+            parity = (parity << self._getWordCheckWidth()) | self._encodeWord(word)
+
+        return parity
+
+    def _splitWords(self, data: int) -> list:
+        '''Helper method splitting the unit data into words'''
+        if self.word_size >= 8:
+            return [data]
+
+        words = list()
+        for shift in reversed(range(0, 8, self.word_size)):
+            words.append((data >> shift) & ((1 << self.word_size) - 1))
+
+        return words
+
+    def _calculateUnitChecks(self, frame: bytes) -> bytes:
+        '''Helper method calculating the check bits of every unit of the data'''
+        frame = bytes(frame)
+        if self.unit_size == 1:
+            return frame.translate(self.unit_tables[0])
+
+        # Pad the data up to the whole units
+        frame += bytes(-len(frame) % self.unit_size)
+
+        checks = frame[0::self.unit_size].translate(self.unit_tables[0])
+        for index in range(1, self.unit_size):
+            checks = xorBytes(checks, frame[index::self.unit_size].translate(self.unit_tables[index]))
+
+        return checks
+
+    def _buildUnitErrors(self) -> dict:
+        '''Helper method mapping the syndromes of a unit to its errors
+
+        Only the syndromes of at most a single bit error per word are
+        correctable, all the others are missing from the map.
+        '''
+        word_width = self._getWordCheckWidth()
+        words = len(self._splitWords(0))
+
+        # The syndromes of a single word and the data bits to flip
+        errors = {0: 0}
+        for index in range(0, word_width):
+            errors[1 << index] = 0
+
+        for bit in range(0, self.word_size):
+            error = 1 << (self.word_size - 1 - bit)
+            errors[self._encodeWord(error)] = error
+
+        # Combine the syndromes of all the words of the unit
+        combined = {0: 0}
+        for word in range(0, words):
+            shift = (words - 1 - word) * self.word_size
+            check_shift = (words - 1 - word) * word_width
+
+            merged = dict()
+            for syndrome, error in combined.items():
+                for word_syndrome, word_error in errors.items():
+                    key = syndrome | (word_syndrome << check_shift)
+                    merged[key] = error | (word_error << shift)
+
+            combined = merged
+
+        return combined
+
+    def _buildSyndromeTables(self) -> tuple:
+        '''Helper method for the syndrome decoding tables of a single byte
+
+        A single byte package only uses the first byte of the unit, so the
+        errors in the rest of the unit (the padding) can't be corrected.
+        '''
+        shift = (self.unit_size - 1) * 8
+
+        correction = bytearray(256)
+        status = bytearray(256)
+        for syndrome, error in self.unit_errors.items():
+            if error & ((1 << shift) - 1):
+                continue
+
+            correction[syndrome] = error >> shift
+            status[syndrome] = 1
+
+        return bytes(correction), bytes(status)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,130 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.crc import CRC
+from arq.crccodec import CRCCodec
+from arq.hammingcodec import HammingCodec
+
+
+class HybridCodec(CRCCodec):
+    '''
+    Encoder/decoder class implementation for the Type-II hybrid ARQ
+
+    The packages are checked with the CRC only. When a package fails the
+    check, the Hamming check bits of its data are sent as the incremental
+    redundancy, which corrects the buffered package instead of sending it
+    again.
+
+    Attributes
+    ----------
+    fec : HammingCodec
+        The code of the incremental redundancy
+
+    Methods
+    -------
+    calculateRedundancy(frame)
+        Calculate the incremental redundancy of the package data
+    combine(frame, parity, redundancy)
+        Correct the package data with the incremental redundancy
+    getRedundancySize(size)
+        Get the amount of bytes of the incremental redundancy
+    '''
+
+    def __init__(self, package_size: int, pbits: int, crc: CRC, scheme: str, frame_size: int = 1) -> None:
+        '''
+        Parameters
+        ----------
+        package_size : int
+            Size of the package
+        pbits: int
+            Amount of parity bits
+        crc : CRC
+            The CRC algorithm to use
+        scheme : str
+            Name of the Hamming code of the redundancy, one of HammingCodec.SCHEMES
+        frame_size : int
+            Amount of bytes of the data of every package
+        '''
+        super(HybridCodec, self).__init__(package_size, pbits, crc, frame_size)
+
+        self.fec = HammingCodec(package_size, pbits, scheme, frame_size)
+
+    def calculateRedundancy(self, frame: bytes) -> bytes:
+        ''' Calculate the incremental redundancy of the package data
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package
+
+        Returns
+        -------
+        bytes
+            The Hamming check bits of the data
+        '''
+        checksum = self.fec.calculateChecksum(bytes(frame))
+        return checksum.to_bytes(self.getRedundancySize(len(frame)), 'big')
+
+    def combine(self, frame: bytes, parity: int, redundancy: bytes) -> bytes:
+        ''' Correct the package data with the incremental redundancy
+
+        Parameters
+        ----------
+        frame: bytes
+            The data of the package, which failed the check
+        parity : int
+            Received CRC of the package
+        redundancy : bytes
+            Received incremental redundancy of the package
+
+        Returns
+        -------
+        bytes
+            The corrected data of the package, None if it can't be corrected
+        '''
+        # The padding bits of the redundancy don't belong to the code
+        width = self.fec.getChecksumWidth(len(frame))
+        checksum = int.from_bytes(redundancy, 'big') & ((1 << width) - 1)
+
+        corrected = self.fec.decodeFrame(bytes(frame), checksum)
+
+        # The correction is only trusted, once the CRC confirms it
+        if corrected != None:
+            corrected = self._decodeFrame(corrected, parity)
+
+        if self.decoded_counter != None:
+            self._countDecoded(1, corrected == None)
+
+        return corrected
+
+    def getRedundancySize(self, size: int) -> int:
+        ''' Get the amount of bytes of the incremental redundancy
+
+        Parameters
+        ----------
+        size : int
+            Amount of bytes of the data
+
+        Returns
+        -------
+        int
+            Amount of bytes of the redundancy
+        '''
+        return (self.fec.getChecksumWidth(size) + 7) // 8
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,119 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.package import Package
+
+
+class LinkAdaptation:
+    '''
+    Selection of the frame size and the code for the bit error rate
+
+    Every profile is a codec with its own frame size and check bits. Both
+    sides of the connection share the list, so a profile is referred to by
+    its index.
+
+    Attributes
+    ----------
+    profiles : list
+        The codecs to choose from
+    hysteresis : float
+        The relative gain of the efficiency needed to switch the profile
+
+    Methods
+    -------
+    getProfiles()
+        Get the codecs to choose from
+    getEfficiency(profile, ber)
+        Estimate the share of the bits sent, which are delivered data
+    select(ber, current)
+        Select the profile for the bit error rate
+    '''
+
+    def __init__(self, profiles: list, hysteresis: float = 0.05) -> None:
+        '''
+        Parameters
+        ----------
+        profiles : list
+            The codecs to choose from
+        hysteresis : float
+            The relative gain of the efficiency needed to switch the profile
+        '''
+        if len(profiles) == 0:
+            raise ValueError("At least one profile is required")
+
+        self.profiles = profiles
+        self.hysteresis = hysteresis
+
+    def getProfiles(self) -> list:
+        '''Get the codecs to choose from
+
+        Returns
+        -------
+        list
+            The codecs to choose from
+        '''
+        return self.profiles
+
+    def getEfficiency(self, profile: int, ber: float) -> float:
+        '''Estimate the share of the bits sent, which are delivered data
+
+        Parameters
+        ----------
+        profile : int
+            Index of the profile
+        ber : float
+            The probability of a bit to be flipped
+
+        Returns
+        -------
+        float
+            The share of the data bits in a package, which isn't sent again
+        '''
+        codec = self.profiles[profile]
+
+        data_bits = codec.getFrameSize() * 8
+        wire_bits = data_bits + codec.getCheckWidth() + Package.SEQUENCE_BITS
+
+        return data_bits / wire_bits * (1 - codec.getFailureProbability(ber))
+
+    def select(self, ber: float, current: int) -> int:
+        '''Select the profile for the bit error rate
+
+        Parameters
+        ----------
+        ber : float
+            The probability of a bit to be flipped
+        current : int
+            Index of the profile in use
+
+        Returns
+        -------
+        int
+            Index of the profile to use
+        '''
+        efficiency = [self.getEfficiency(index, ber)
+                      for index in range(0, len(self.profiles))]
+        best = max(range(0, len(self.profiles)), key=efficiency.__getitem__)
+
+        # Keep the profile unless the gain is worth the switch
+        if efficiency[best] > efficiency[current] * (1 + self.hysteresis):
+            return best
+
+        return current
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
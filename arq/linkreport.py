@@ -0,0 +1,71 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+
+class LinkReport:
+    '''
+    The feedback with the bit error rate estimated by the receiver
+
+    Attributes
+    ----------
+    ber : float
+        The estimated probability of a bit to be flipped
+
+    Methods
+    -------
+    getErrorRate()
+        Get the estimated bit error rate
+    getBitsNumber()
+        Get the amount of bits sent over the connection
+    '''
+
+    __slots__ = ('ber',)
+
+    # The single precision rate and the type of the feedback
+    BITS = 32 + 8
+
+    def __init__(self, ber: float) -> None:
+        '''
+        Parameters
+        ----------
+        ber : float
+            The estimated probability of a bit to be flipped
+        '''
+        self.ber = ber
+
+    def getErrorRate(self) -> float:
+        ''' Get the estimated bit error rate
+
+        Returns
+        ----------
+        float
+            The estimated probability of a bit to be flipped
+        '''
+        return self.ber
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the feedback
+        '''
+        return self.BITS
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
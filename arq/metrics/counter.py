@@ -0,0 +1,111 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+
+class Counter:
+    '''
+    The metric which only grows
+
+    The counter either keeps its own value or reads it from the function,
+    so the statistics the components already keep cost nothing until the
+    snapshot is taken.
+
+    Attributes
+    ----------
+    name : str
+        Name of the metric
+    help : str
+        Description of the metric
+    labels : dict
+        Labels telling the series of the metric apart
+    value : float
+        The value of the counter
+    function : callable
+        The function returning the value, None if the value is kept
+
+    Methods
+    -------
+    inc(amount)
+        Increase the counter
+    getValue()
+        Get the value of the counter
+    getSnapshot()
+        Get the state of the metric
+    '''
+
+    TYPE = "counter"
+
+    __slots__ = ('name', 'help', 'labels', 'value', 'function')
+
+    def __init__(self, name: str, help: str = "", labels: dict = None, function=None) -> None:
+        '''
+        Parameters
+        ----------
+        name : str
+            Name of the metric
+        help : str
+            Description of the metric
+        labels : dict
+            Labels telling the series of the metric apart
+        function : callable
+            The function returning the value, None to keep the value
+        '''
+        self.name = name
+        self.help = help
+        self.labels = dict(labels) if labels != None else dict()
+        self.value = 0
+        self.function = function
+
+    def inc(self, amount: float = 1) -> None:
+        '''Increase the counter
+
+        Parameters
+        ----------
+        amount : float
+            The non-negative amount to add
+        '''
+        if amount < 0:
+            raise ValueError("Counter can only grow")
+
+        self.value += amount
+
+    def getValue(self) -> float:
+        '''Get the value of the counter
+
+        Returns
+        -------
+        float
+            The value of the counter
+        '''
+        if self.function != None:
+            return self.function()
+
+        return self.value
+
+    def getSnapshot(self) -> dict:
+        '''Get the state of the metric
+
+        Returns
+        -------
+        dict
+            The name, type, labels and value of the metric
+        '''
+        return {"name": self.name, "type": self.TYPE, "help": self.help,
+                "labels": self.labels, "value": self.getValue()}
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,70 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.metrics.counter import Counter
+
+
+class Gauge(Counter):
+    '''
+    The metric which goes up and down
+
+    Methods
+    -------
+    set(value)
+        Set the value of the gauge
+    inc(amount)
+        Increase the gauge
+    dec(amount)
+        Decrease the gauge
+    '''
+
+    TYPE = "gauge"
+
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        '''Set the value of the gauge
+
+        Parameters
+        ----------
+        value : float
+            The new value
+        '''
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        '''Increase the gauge
+
+        Parameters
+        ----------
+        amount : float
+            The amount to add
+        '''
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        '''Decrease the gauge
+
+        Parameters
+        ----------
+        amount : float
+            The amount to subtract
+        '''
+        self.value -= amount
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
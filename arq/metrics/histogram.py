@@ -0,0 +1,204 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import math
+
+
+class Histogram:
+    '''
+    The metric which records the distribution of the values
+
+    The histogram is built like the HDR histogram : the values are counted
+    in units of the lowest discernible value, every power of two of them
+    is split into the same amount of linear buckets, so every value is
+    kept with the given amount of significant decimal digits. Recording a
+    value takes constant time and the memory only depends on the range and
+    the precision.
+
+    Attributes
+    ----------
+    name : str
+        Name of the metric
+    help : str
+        Description of the metric
+    labels : dict
+        Labels telling the series of the metric apart
+    unit : float
+        The lowest discernible value
+    highest : float
+        The highest value tracked, the greater ones are counted as it
+    sub_bits : int
+        Amount of bits of the linear buckets of the first power of two
+    counts : list
+        Amount of the values of every bucket
+    count : int
+        Amount of the values recorded
+    sum : float
+        Sum of the values recorded
+    min : float
+        The lowest value recorded, None if there's none
+    max : float
+        The highest value recorded, None if there's none
+
+    Methods
+    -------
+    record(value)
+        Record the value
+    getQuantile(quantile)
+        Estimate the value below which the part of the values lies
+    getSnapshot()
+        Get the state of the metric
+    '''
+
+    TYPE = "histogram"
+
+    # The quantiles of the snapshot
+    QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+    __slots__ = ('name', 'help', 'labels', 'unit', 'highest', 'sub_bits', 'counts',
+                 'count', 'sum', 'min', 'max')
+
+    def __init__(self, name: str, help: str = "", labels: dict = None, unit: float = 1e-6, highest: float = 3600.0, digits: int = 2) -> None:
+        '''
+        Parameters
+        ----------
+        name : str
+            Name of the metric
+        help : str
+            Description of the metric
+        labels : dict
+            Labels telling the series of the metric apart
+        unit : float
+            The lowest discernible value
+        highest : float
+            The highest value tracked
+        digits : int
+            Amount of the significant decimal digits kept, in range [1, 5]
+        '''
+        if unit <= 0 or highest < unit:
+            raise ValueError("The histogram has incorrect range")
+
+        if digits not in range(1, 6):
+            raise ValueError("The histogram keeps from 1 to 5 significant digits")
+
+        self.name = name
+        self.help = help
+        self.labels = dict(labels) if labels != None else dict()
+        self.unit = unit
+        self.highest = highest
+        self.sub_bits = math.ceil(math.log2(2 * 10 ** digits))
+
+        self.counts = [0] * (self._getIndex(int(highest / unit)) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value: float) -> None:
+        '''Record the value
+
+        Parameters
+        ----------
+        value : float
+            The non-negative value to record
+        '''
+        if value < 0:
+            raise ValueError("Histogram only records non-negative values")
+
+        units = int(min(value, self.highest) / self.unit)
+        self.counts[self._getIndex(units)] += 1
+
+        self.count += 1
+        self.sum += value
+        if self.min == None or value < self.min:
+            self.min = value
+        if self.max == None or value > self.max:
+            self.max = value
+
+    def getQuantile(self, quantile: float) -> float:
+        '''Estimate the value below which the part of the values lies
+
+        Parameters
+        ----------
+        quantile : float
+            The part of the values in range [0, 1]
+
+        Returns
+        -------
+        float
+            The middle of the bucket holding the quantile, None if there are
+            no values
+        '''
+        if self.count == 0:
+            return None
+
+        # The rank of the value, counting from one
+        rank = max(1, math.ceil(quantile * self.count))
+
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if total >= rank:
+                break
+
+        lower, upper = self._getRange(index)
+        value = (lower + upper) / 2 * self.unit
+
+        # The middle of the bucket may lie beyond the values recorded
+        return min(max(value, self.min), self.max)
+
+    def getSnapshot(self) -> dict:
+        '''Get the state of the metric
+
+        Returns
+        -------
+        dict
+            The name, type, labels and the summary of the values
+        '''
+        return {"name": self.name, "type": self.TYPE, "help": self.help,
+                "labels": self.labels, "count": self.count, "sum": self.sum,
+                "min": self.min, "max": self.max,
+                "mean": self.sum / self.count if self.count else None,
+                "quantiles": {str(quantile): self.getQuantile(quantile)
+                              for quantile in self.QUANTILES}}
+
+    def _getIndex(self, units: int) -> int:
+        '''Helper method returning the index of the bucket of the value'''
+
+        shift = units.bit_length() - self.sub_bits
+        if shift <= 0:
+            return units
+
+        # Every next power of two adds the half of the linear buckets
+        half = 1 << (self.sub_bits - 1)
+        return (1 << self.sub_bits) + (shift - 1) * half + (units >> shift) - half
+
+    def _getRange(self, index: int) -> tuple:
+        '''Helper method returning the lowest and the highest value of the bucket'''
+
+        size = 1 << self.sub_bits
+        if index < size:
+            return index, index + 1
+
+        half = size >> 1
+        shift = (index - size) // half + 1
+        mantissa = (index - size) % half + half
+
+        return mantissa << shift, (mantissa + 1) << shift
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,257 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import json
+import math
+
+from arq.metrics.counter import Counter
+from arq.metrics.gauge import Gauge
+from arq.metrics.histogram import Histogram
+
+
+class MetricsRegistry:
+    '''
+    The registry of the metrics shared by the components
+
+    Every metric is identified by its name and labels, asking for it again
+    returns the same metric. The snapshot of all the metrics is exported
+    as JSON or as the Prometheus text format, the histograms are exported
+    as the Prometheus summaries.
+
+    Attributes
+    ----------
+    metrics : dict
+        The metrics by their names and labels
+
+    Methods
+    -------
+    counter(name, help, labels, function)
+        Get the counter
+    gauge(name, help, labels, function)
+        Get the gauge
+    histogram(name, help, labels, unit, highest, digits)
+        Get the histogram
+    getSnapshot()
+        Get the state of all the metrics
+    toJSON()
+        Export the metrics as JSON
+    toPrometheus()
+        Export the metrics as the Prometheus text format
+    writeJSON(path)
+        Write the metrics to the JSON file
+    writePrometheus(path)
+        Write the metrics to the Prometheus text file
+    '''
+
+    def __init__(self) -> None:
+        self.metrics = dict()
+
+    def counter(self, name: str, help: str = "", labels: dict = None, function=None) -> Counter:
+        '''Get the counter
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric
+        help : str
+            Description of the metric
+        labels : dict
+            Labels telling the series of the metric apart
+        function : callable
+            The function returning the value, None to keep the value
+
+        Returns
+        -------
+        Counter
+            The counter registered before or the new one
+        '''
+        return self._register(Counter, name, help, labels, function=function)
+
+    def gauge(self, name: str, help: str = "", labels: dict = None, function=None) -> Gauge:
+        '''Get the gauge
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric
+        help : str
+            Description of the metric
+        labels : dict
+            Labels telling the series of the metric apart
+        function : callable
+            The function returning the value, None to keep the value
+
+        Returns
+        -------
+        Gauge
+            The gauge registered before or the new one
+        '''
+        return self._register(Gauge, name, help, labels, function=function)
+
+    def histogram(self, name: str, help: str = "", labels: dict = None, unit: float = 1e-6, highest: float = 3600.0, digits: int = 2) -> Histogram:
+        '''Get the histogram
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric
+        help : str
+            Description of the metric
+        labels : dict
+            Labels telling the series of the metric apart
+        unit : float
+            The lowest discernible value
+        highest : float
+            The highest value tracked
+        digits : int
+            Amount of the significant decimal digits kept
+
+        Returns
+        -------
+        Histogram
+            The histogram registered before or the new one
+        '''
+        return self._register(Histogram, name, help, labels,
+                              unit=unit, highest=highest, digits=digits)
+
+    def getSnapshot(self) -> list:
+        '''Get the state of all the metrics
+
+        Returns
+        -------
+        list
+            The snapshots of the metrics ordered by their names
+        '''
+        return [self.metrics[key].getSnapshot() for key in sorted(self.metrics)]
+
+    def toJSON(self) -> str:
+        '''Export the metrics as JSON
+
+        Returns
+        -------
+        str
+            The JSON document with the list of the metrics
+        '''
+        return json.dumps({"metrics": self.getSnapshot()}, indent=2)
+
+    def toPrometheus(self) -> str:
+        '''Export the metrics as the Prometheus text format
+
+        Returns
+        -------
+        str
+            The metrics, every name is described once
+        '''
+        lines = list()
+        described = set()
+        for metric in self.getSnapshot():
+            name = metric["name"]
+            kind = "summary" if metric["type"] == Histogram.TYPE else metric["type"]
+            if name not in described:
+                described.add(name)
+                lines.append("# HELP {} {}".format(name, self._escape(metric["help"])))
+                lines.append("# TYPE {} {}".format(name, kind))
+
+            labels = metric["labels"]
+            if metric["type"] != Histogram.TYPE:
+                lines.append("{}{} {}".format(name, self._formatLabels(labels),
+                                              self._formatNumber(metric["value"])))
+                continue
+
+            for quantile, value in metric["quantiles"].items():
+                series = dict(labels, quantile=quantile)
+                lines.append("{}{} {}".format(name, self._formatLabels(series),
+                                              self._formatNumber(value)))
+
+            lines.append("{}_sum{} {}".format(name, self._formatLabels(labels),
+                                              self._formatNumber(metric["sum"])))
+            lines.append("{}_count{} {}".format(name, self._formatLabels(labels),
+                                                self._formatNumber(metric["count"])))
+
+        return "\n".join(lines) + "\n"
+
+    def writeJSON(self, path: str) -> None:
+        '''Write the metrics to the JSON file
+
+        Parameters
+        ----------
+        path : str
+            Path of the file
+        '''
+        with open(path, 'w') as file:
+            file.write(self.toJSON())
+
+    def writePrometheus(self, path: str) -> None:
+        '''Write the metrics to the Prometheus text file
+
+        Parameters
+        ----------
+        path : str
+            Path of the file
+        '''
+        with open(path, 'w') as file:
+            file.write(self.toPrometheus())
+
+    def _register(self, kind, name: str, help: str, labels: dict, **kwargs):
+        '''Helper method returning the metric, which is created if it's new'''
+
+        labels = labels if labels != None else dict()
+        key = (name, tuple(sorted((key, str(value)) for key, value in labels.items())))
+
+        metric = self.metrics.get(key)
+        if metric == None:
+            metric = kind(name, help, dict(key[1]), **kwargs)
+            self.metrics[key] = metric
+        elif not isinstance(metric, kind) or kind == Counter and isinstance(metric, Gauge):
+            raise ValueError("Metric {} is registered with another type".format(name))
+
+        return metric
+
+    def _formatLabels(self, labels: dict) -> str:
+        '''Helper method formatting the labels of the series'''
+
+        if not labels:
+            return ""
+
+        pairs = ('{}="{}"'.format(key, self._escape(value, True))
+                 for key, value in labels.items())
+        return "{" + ",".join(pairs) + "}"
+
+    def _formatNumber(self, value) -> str:
+        '''Helper method formatting the value of the series'''
+
+        if value == None:
+            return "NaN"
+
+        if isinstance(value, float):
+            if math.isinf(value):
+                return "+Inf" if value > 0 else "-Inf"
+            return repr(value)
+
+        return str(value)
+
+    def _escape(self, text: str, quoted: bool = False) -> str:
+        '''Helper method escaping the text of the Prometheus format'''
+
+        text = str(text).replace("\\", "\\\\").replace("\n", "\\n")
+        if quoted:
+            text = text.replace('"', '\\"')
+
+        return text
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
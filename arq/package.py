@@ -29,6 +29,12 @@ class Package:
         Amount of the parity bits
     size : int
         Size of the data
+    frame_size : int
+        Maximum amount of bytes of the data
+    width : int
+        Amount of the check bits
+    sequence : int
+        Sequence number of the package, None if it isn't numbered
 
     Methods
     -------
@@ -36,7 +42,12 @@ class Package:
         Starts the controller
     '''
 
-    def __init__(self, size: int, pbits: int) -> None:
+    __slots__ = ('value', 'parity', 'pbits', 'size', 'frame_size', 'width', 'sequence')
+
+    # Amount of bits of the sequence number sent with the package
+    SEQUENCE_BITS = 32
+
+    def __init__(self, size: int, pbits: int, frame_size: int = 1, width: int = 1) -> None:
         '''
         Parameters
         ----------
@@ -44,6 +55,10 @@ class Package:
             Amount of the parity bits
         size : int
             Size of the data
+        frame_size : int
+            Maximum amount of bytes of the data
+        width : int
+            Amount of the check bits
         '''
         # Check if the size of parity bits is correct
         if pbits >= size / 2 or size not in range(5, 8):
@@ -55,6 +70,9 @@ class Package:
 
         self.pbits = pbits
         self.size = size
+        self.frame_size = frame_size
+        self.width = width
+        self.sequence = None
 
     def setValue(self, value: bytearray) -> None:
         ''' Set the data
@@ -65,7 +83,7 @@ class Package:
             The binary data to use
         '''
         # Check if the size of the package is correct
-        if len(value) * 8 != self.size + self.pbits:
+        if len(value) not in range(1, self.frame_size + 1) or self.size + self.pbits != 8:
             raise ValueError("The package has incorrect size")
 
         self.value = value
@@ -120,6 +138,65 @@ class Package:
         '''
         return self.pbits
 
+    def getFrameSize(self) -> int:
+        ''' Get the maximum amount of bytes of the data
+
+        Returns
+        ----------
+        int
+            Maximum amount of bytes of the data
+        '''
+        return self.frame_size
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the data, the check bits and the sequence number
+        '''
+        bits = len(self.value) * 8 + self.width
+        if self.sequence != None:
+            bits += self.SEQUENCE_BITS
+
+        return bits
+
+    def setSequence(self, sequence: int) -> None:
+        ''' Set the sequence number
+
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the package
+        '''
+        self.sequence = sequence
+
+    def getSequence(self) -> int:
+        ''' Get the sequence number
+
+        Returns
+        ----------
+        int
+            Sequence number of the package, None if it isn't numbered
+        '''
+        return self.sequence
+
+    def copy(self) -> 'Package':
+        ''' Copy the package, so the copy can be altered separately
+
+        Returns
+        ----------
+        Package
+            The copy of the package
+        '''
+        package = Package(self.size, self.pbits, self.frame_size, self.width)
+        package.value = self.value
+        package.parity = self.parity
+        package.sequence = self.sequence
+
+        return package
+
 
 if __name__ == '__main__':
     print("This file shouldn't be used as a separate script!")
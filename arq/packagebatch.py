@@ -0,0 +1,278 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.package import Package
+from utils.bits import packBits, unpackBits, writeBits
+
+
+class PackageBatch:
+    '''
+    A batch of packages stored as whole buffers instead of separate objects
+
+    The data of the packages is kept in a single buffer, frame_size bytes
+    per package (the last one may be shorter). Single parity bits are
+    packed into a bitmap, wider checks (e.g. CRC) take the whole amount of
+    bytes per package. Slicing the batch returns a view, which shares both
+    buffers with the original one.
+
+    Attributes
+    ----------
+    value : bytearray
+        The binary data of all the packages
+    parity : bytearray
+        Parity bits of all the packages
+    offset : int
+        Index of the first package of the batch in the parity buffer
+    width : int
+        Amount of the check bits of every package
+    pbits : int
+        Amount of the parity bits
+    size : int
+        Size of the data
+    frame_size : int
+        Amount of bytes of the data of every package
+
+    Methods
+    -------
+    setValue(value)
+        Set the data of all the packages
+    getValue()
+        Get the data of all the packages
+    setParityBits(value)
+        Set the parity bits of all the packages
+    getParityBits()
+        Get the parity bits of all the packages
+    getParityBitmap()
+        Get the packed parity bits of the batch
+    getCheckSize()
+        Get the amount of bytes taken by the check bits of a package
+    getFrameSize()
+        Get the amount of bytes of the data of every package
+    getBitsNumber()
+        Get the amount of bits sent over the connection
+    '''
+
+    __slots__ = ('value', 'parity', 'offset', 'width', 'pbits', 'size', 'frame_size')
+
+    def __init__(self, size: int, pbits: int, value: bytearray, parity: bytes, width: int = 1, frame_size: int = 1) -> None:
+        '''
+        Parameters
+        ----------
+        size : int
+            Size of the data
+        pbits : int
+            Amount of the parity bits
+        value : bytearray
+            The binary data of all the packages
+        parity : bytes
+            Parity bits of all the packages, one byte per package for the
+            single bit checks, the whole amount of bytes otherwise
+        width : int
+            Amount of the check bits of every package
+        frame_size : int
+            Amount of bytes of the data of every package
+        '''
+        # Check if the size of parity bits is correct
+        if pbits >= size / 2 or size not in range(5, 8):
+            raise ValueError(
+                "Parity bits number should be less than the half of the package")
+
+        self.value = value
+        self.width = width
+        self.frame_size = frame_size
+        self.offset = 0
+
+        # Check if every package has its parity bits
+        if len(self) * self.getCheckSize() != len(parity):
+            raise ValueError("The batch has incorrect amount of parity bits")
+
+        if width == 1:
+            self.parity = bytearray(packBits(parity))
+        else:
+            self.parity = bytearray(parity)
+
+        self.pbits = pbits
+        self.size = size
+
+    def __len__(self) -> int:
+        return (len(self.value) + self.frame_size - 1) // self.frame_size
+
+    def __getitem__(self, key: slice) -> 'PackageBatch':
+        if not isinstance(key, slice):
+            raise TypeError("The batch can only be sliced")
+
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError("The batch can't be sliced with a step")
+
+        stop = max(start, stop)
+
+        # Share the buffers instead of copying them
+        view = PackageBatch.__new__(PackageBatch)
+        view.value = memoryview(self.value)[start * self.frame_size:stop * self.frame_size]
+        view.parity = self.parity
+        view.offset = self.offset + start
+        view.width = self.width
+        view.pbits = self.pbits
+        view.size = self.size
+        view.frame_size = self.frame_size
+
+        return view
+
+    def __iter__(self):
+        parity = self.getParityBits()
+        check_size = self.getCheckSize()
+
+        # Materialize the packages only for the code expecting them
+        for index in range(0, len(self)):
+            offset = index * check_size
+            start = index * self.frame_size
+
+            package = Package(self.size, self.pbits, self.frame_size, self.width)
+            package.setValue(bytes(self.value[start:start + self.frame_size]))
+            package.setParityBits(int.from_bytes(
+                parity[offset:offset + check_size], 'big'))
+
+            yield package
+
+    def setValue(self, value: bytearray) -> None:
+        ''' Set the data of all the packages
+
+        Parameters
+        ----------
+        value : bytearray
+            The binary data to use
+        '''
+        # Check if the size of the batch is correct
+        if len(value) != len(self.value):
+            raise ValueError("The batch has incorrect size")
+
+        # Write in place, so the views stay consistent
+        self.value[:] = value
+
+    def getValue(self) -> bytearray:
+        ''' Get the data of all the packages
+
+        Returns
+        ----------
+        bytearray
+            The binary data to use
+        '''
+        return self.value
+
+    def setParityBits(self, value: bytes) -> None:
+        ''' Set the parity bits of all the packages
+
+        Parameters
+        ----------
+        value : bytes
+            Parity bits, one byte per package for the single bit checks,
+            the whole amount of bytes otherwise
+        '''
+        # Check if every package has its parity bits
+        check_size = self.getCheckSize()
+        if len(value) != len(self) * check_size:
+            raise ValueError("The batch has incorrect amount of parity bits")
+
+        if self.width == 1:
+            writeBits(self.parity, self.offset, value)
+        else:
+            offset = self.offset * check_size
+            self.parity[offset:offset + len(value)] = value
+
+    def getParityBits(self) -> bytes:
+        ''' Get the parity bits of all the packages
+
+        Returns
+        ----------
+        bytes
+            Parity bits, one byte per package for the single bit checks,
+            the whole amount of bytes otherwise
+        '''
+        if self.width == 1:
+            return unpackBits(self.parity, self.offset, len(self))
+
+        check_size = self.getCheckSize()
+        offset = self.offset * check_size
+
+        return bytes(self.parity[offset:offset + len(self) * check_size])
+
+    def getParityBitmap(self) -> bytes:
+        ''' Get the packed parity bits of the batch
+
+        Returns
+        ----------
+        bytes
+            Parity bits packed into a bitmap, the first package being the MSB
+        '''
+        if self.width != 1:
+            raise ValueError("Only single parity bits are packed into a bitmap")
+
+        return packBits(self.getParityBits())
+
+    def getCheckSize(self) -> int:
+        ''' Get the amount of bytes taken by the check bits of a package
+
+        Returns
+        ----------
+        int
+            Amount of bytes per package, 1 for the single bit checks
+        '''
+        return (self.width + 7) // 8
+
+    def getFrameSize(self) -> int:
+        ''' Get the amount of bytes of the data of every package
+
+        Returns
+        ----------
+        int
+            Amount of bytes of the data of every package
+        '''
+        return self.frame_size
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the data and the check bits of all the packages
+        '''
+        return len(self.value) * 8 + len(self) * self.width
+
+    def getSize(self) -> int:
+        ''' Get the size of the data
+
+        Returns
+        ----------
+        int
+            Size of the data
+        '''
+        return self.size
+
+    def getParityBitsNumber(self) -> int:
+        ''' Get the amount of the parity bits
+
+        Returns
+        ----------
+        int
+            Amount of the parity bits
+        '''
+        return self.pbits
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,206 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import itertools
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+class ParameterSweep:
+    '''
+    Runs the transmission for every point of the parameter grid
+
+    Every point of the grid is run the given amount of times, the runs are
+    spread over the worker processes. Every run gets its own seed derived
+    from the seed of the sweep, so the results don't depend on the worker
+    which runs it and the whole sweep can be reproduced.
+
+    Attributes
+    ----------
+    function : callable
+        Runs the transmission for the given point and returns its
+        statistics, it's called in the worker processes, so it must be
+        picklable
+    grid : dict
+        The values of every parameter
+    repetitions : int
+        Amount of the runs of every point
+    seed : int
+        Seed of the seeds of the runs, None for the random ones
+    workers : int
+        Amount of the worker processes, None for the amount of the CPUs
+
+    Methods
+    -------
+    getPoints()
+        Get the parameters of every run
+    run()
+        Run the sweep
+    parseGrid(text, kind)
+        Parse the values of the parameter
+    '''
+
+    def __init__(self, function, grid: dict, repetitions: int = 1, seed: int = None, workers: int = None) -> None:
+        '''
+        Parameters
+        ----------
+        function : callable
+            Runs the transmission for the given point and returns its
+            statistics
+        grid : dict
+            The values of every parameter
+        repetitions : int
+            Amount of the runs of every point
+        seed : int
+            Seed of the seeds of the runs, None for the random ones
+        workers : int
+            Amount of the worker processes, None for the amount of the CPUs
+        '''
+        if repetitions < 1:
+            raise ValueError("Every point must be run at least once")
+
+        if workers != None and workers < 1:
+            raise ValueError("The sweep needs at least one worker")
+
+        self.function = function
+        self.grid = grid
+        self.repetitions = repetitions
+        self.seed = seed
+        self.workers = workers
+
+    def getPoints(self) -> list:
+        '''Get the parameters of every run
+
+        Returns
+        -------
+        list
+            A dictionary with the number of the run, the repetition, the
+            seed and the values of the parameters for every run
+        '''
+        points = list()
+
+        for values in itertools.product(*self.grid.values()):
+            for repetition in range(self.repetitions):
+                point = dict(zip(self.grid.keys(), values))
+                seed = self._getSeed(point, repetition)
+
+                points.append({"run": len(points), "repetition": repetition, "seed": seed})
+                points[-1].update(point)
+
+        return points
+
+    def run(self):
+        '''Run the sweep
+
+        Yields
+        ------
+        dict
+            The point of the run and its statistics, as soon as the run is
+            finished
+        '''
+        points = self.getPoints()
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            futures = {executor.submit(self.function, point): point for point in points}
+
+            try:
+                for future in as_completed(futures):
+                    row = dict(futures[future])
+                    row.update(future.result())
+                    yield row
+            except BaseException:
+                # Don't wait for the rest of the runs
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _getSeed(self, point: dict, repetition: int) -> int:
+        '''Helper method getting the seed of the run
+
+        The seed only depends on the seed of the sweep, the values of the
+        parameters and the repetition, so the same point gets the same seed
+        whatever the rest of the grid is.
+
+        Parameters
+        ----------
+        point : dict
+            The values of the parameters
+        repetition : int
+            Number of the run of the point
+        '''
+        if self.seed == None:
+            return random.getrandbits(32)
+
+        text = json.dumps([self.seed, point, repetition], sort_keys=True)
+        return random.Random(text).getrandbits(32)
+
+    @staticmethod
+    def parseGrid(text: str, kind: type) -> list:
+        '''Parse the values of the parameter
+
+        The values are either separated by commas or given as a range
+        start:stop[:step] of the integers (the stop is included), or as
+        a range start:stop:count of the floats, which are spaced evenly on
+        the logarithmic scale, as the error rates usually are.
+
+        Parameters
+        ----------
+        text : str
+            The values of the parameter
+        kind : type
+            The type of the values, int or float
+
+        Returns
+        -------
+        list
+            The values of the parameter
+
+        Raises
+        ------
+        ValueError
+            If the values can't be parsed
+        '''
+        if ':' not in text:
+            return [kind(value) for value in text.split(',')]
+
+        bounds = text.split(':')
+        if kind == int:
+            if len(bounds) not in (2, 3):
+                raise ValueError("The range of the integers is start:stop[:step]")
+
+            start, stop = int(bounds[0]), int(bounds[1])
+            step = int(bounds[2]) if len(bounds) == 3 else 1
+            if step < 1:
+                raise ValueError("The step of the range must be positive")
+
+            return list(range(start, stop + 1, step))
+
+        if len(bounds) != 3:
+            raise ValueError("The range of the floats is start:stop:count")
+
+        start, stop, count = float(bounds[0]), float(bounds[1]), int(bounds[2])
+        if start <= 0 or stop <= 0 or count < 1:
+            raise ValueError("The logarithmic range needs positive bounds and count")
+
+        if count == 1:
+            return [start]
+
+        ratio = (stop / start) ** (1 / (count - 1))
+        return [start * ratio ** index for index in range(count - 1)] + [stop]
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,91 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+
+class ProfileSwitch:
+    '''
+    The announcement of the profile used from the given package on
+
+    The announcement precedes the first package of the profile, so the
+    receiver knows how to decode every package, including the repeated ones.
+
+    Attributes
+    ----------
+    sequence : int
+        Sequence number of the first package of the profile
+    profile : int
+        Index of the profile
+
+    Methods
+    -------
+    getSequence()
+        Get the sequence number of the first package of the profile
+    getProfile()
+        Get the index of the profile
+    getBitsNumber()
+        Get the amount of bits sent over the connection
+    '''
+
+    __slots__ = ('sequence', 'profile')
+
+    # The sequence number, the type of the frame and the profile
+    BITS = 32 + 8 + 8
+
+    def __init__(self, sequence: int, profile: int) -> None:
+        '''
+        Parameters
+        ----------
+        sequence : int
+            Sequence number of the first package of the profile
+        profile : int
+            Index of the profile
+        '''
+        self.sequence = sequence
+        self.profile = profile
+
+    def getSequence(self) -> int:
+        ''' Get the sequence number of the first package of the profile
+
+        Returns
+        ----------
+        int
+            Sequence number of the first package of the profile
+        '''
+        return self.sequence
+
+    def getProfile(self) -> int:
+        ''' Get the index of the profile
+
+        Returns
+        ----------
+        int
+            Index of the profile
+        '''
+        return self.profile
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the announcement
+        '''
+        return self.BITS
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
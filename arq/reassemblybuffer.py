@@ -0,0 +1,337 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from utils.bits import unpackBits, writeBits
+
+# Maps every byte to the flag showing if it has any bit set
+NONZERO_TABLE = bytes([0] + [1] * 255)
+
+
+class ReassemblyBuffer:
+    '''
+    The buffer reassembling the received data from its packages
+
+    The data is written into a single preallocated buffer at the offsets of
+    the packages. The packages which weren't received intact yet are kept
+    in a bitmap, the first package being the MSB of the first byte. Every
+    next level of the bitmap holds a bit for every byte of the previous
+    one, which is set if the byte has any bit set, so the next missing
+    package is found in logarithmic time. The bookkeeping takes about a
+    bit per package.
+
+    Attributes
+    ----------
+    data : bytearray
+        The reassembled data
+    frame_size : int
+        Amount of bytes of the data of every package
+    frames : int
+        Amount of the packages
+    levels : list
+        The levels of the bitmap of the missing packages, the first one
+        holds a bit per package
+    missing : int
+        Amount of the packages not received intact yet
+    received : int
+        Amount of the packages received, including the altered ones
+    failed : int
+        Amount of the altered packages received
+
+    Methods
+    -------
+    store(index, value)
+        Store the data of an intact package
+    storeFrames(index, value, mask)
+        Store the data of several consecutive packages
+    markFailed(index)
+        Count the altered package
+    isMissing(index)
+        Check if the package wasn't received intact yet
+    nextMissing(index)
+        Find the first missing package starting from the index
+    getMissingCount()
+        Get the amount of the packages not received intact yet
+    getReceivedCount()
+        Get the amount of the packages received
+    getFailedCount()
+        Get the amount of the altered packages received
+    getData()
+        Get the reassembled data
+    '''
+
+    __slots__ = ('data', 'frame_size', 'frames', 'levels', 'missing', 'received', 'failed')
+
+    def __init__(self, size: int, frame_size: int = 1) -> None:
+        '''
+        Parameters
+        ----------
+        size : int
+            Amount of bytes of the whole data
+        frame_size : int
+            Amount of bytes of the data of every package
+        '''
+        if size < 0 or frame_size < 1:
+            raise ValueError("The buffer has incorrect size")
+
+        self.data = bytearray(size)
+        self.frame_size = frame_size
+        self.frames = (size + frame_size - 1) // frame_size
+
+        self.missing = self.frames
+        self.received = 0
+        self.failed = 0
+
+        # Every package is missing at first
+        self.levels = list()
+        count = self.frames
+        while True:
+            level = bytearray(b'\xff' * (count // 8))
+            if count % 8:
+                level.append((0xff << (8 - count % 8)) & 0xff)
+            self.levels.append(level)
+
+            if len(level) <= 1:
+                break
+            count = len(level)
+
+    def __len__(self) -> int:
+        return self.frames
+
+    def store(self, index: int, value: bytes) -> None:
+        '''Store the data of an intact package
+
+        The data of the package already stored is kept.
+
+        Parameters
+        ----------
+        index : int
+            Index of the package
+        value : bytes
+            The data of the package
+        '''
+        start = self._getOffset(index, len(value))
+        self.received += 1
+
+        if self.isMissing(index):
+            self.data[start:start + len(value)] = value
+            self._clear(index)
+            self.missing -= 1
+
+    def storeFrames(self, index: int, value: bytes, mask: bytes) -> None:
+        '''Store the data of several consecutive packages
+
+        Only the intact packages are stored, the altered ones are counted.
+
+        Parameters
+        ----------
+        index : int
+            Index of the first package
+        value : bytes
+            The data of the packages
+        mask : bytes
+            The validity flags of the packages, 1 for every intact package
+            and 0 for every altered one
+        '''
+        count = len(mask)
+        if count == 0:
+            return
+
+        start = self._getOffset(index, len(value))
+        if index + count > self.frames or (count - 1) * self.frame_size >= len(value):
+            raise ValueError("The flags don't match the packages")
+
+        self.received += count
+        self.failed += mask.count(0)
+
+        # Keep the data of the packages already stored
+        current = unpackBits(self.levels[0], index, count)
+        intact = int.from_bytes(bytes(mask).translate(NONZERO_TABLE), 'big')
+        missing = int.from_bytes(current, 'big')
+        copied = (missing & intact).to_bytes(count, 'big')
+        flags = (missing & ~intact).to_bytes(count, 'big')
+
+        # Copy the runs of the intact packages, which were missing
+        view = memoryview(value)
+        position = copied.find(1)
+        while position != -1:
+            end = copied.find(0, position)
+            if end == -1:
+                end = count
+
+            self.data[start + position * self.frame_size:start + end * self.frame_size] = \
+                view[position * self.frame_size:end * self.frame_size]
+            position = copied.find(1, end)
+
+        self.missing -= current.count(1) - flags.count(1)
+        self._writeFlags(index, flags)
+
+    def markFailed(self, index: int) -> None:
+        '''Count the altered package
+
+        Parameters
+        ----------
+        index : int
+            Index of the package
+        '''
+        if index < 0 or index >= self.frames:
+            raise IndexError("The package is out of the buffer")
+
+        self.received += 1
+        self.failed += 1
+
+    def isMissing(self, index: int) -> bool:
+        '''Check if the package wasn't received intact yet
+
+        Parameters
+        ----------
+        index : int
+            Index of the package
+
+        Returns
+        -------
+        bool
+            True if the package is missing, False otherwise
+        '''
+        if index < 0 or index >= self.frames:
+            raise IndexError("The package is out of the buffer")
+
+        return bool(self.levels[0][index >> 3] & (0x80 >> (index & 7)))
+
+    def nextMissing(self, index: int = 0) -> int:
+        '''Find the first missing package starting from the index
+
+        Parameters
+        ----------
+        index : int
+            Index of the package to start from
+
+        Returns
+        -------
+        int
+            Index of the missing package, -1 if there's none
+        '''
+        return self._findSet(0, max(index, 0))
+
+    def getMissingCount(self) -> int:
+        '''Get the amount of the packages not received intact yet
+
+        Returns
+        -------
+        int
+            Amount of the missing packages
+        '''
+        return self.missing
+
+    def getReceivedCount(self) -> int:
+        '''Get the amount of the packages received
+
+        Returns
+        -------
+        int
+            Amount of the packages received, including the altered ones
+        '''
+        return self.received
+
+    def getFailedCount(self) -> int:
+        '''Get the amount of the altered packages received
+
+        Returns
+        -------
+        int
+            Amount of the altered packages
+        '''
+        return self.failed
+
+    def getData(self) -> bytearray:
+        '''Get the reassembled data
+
+        Returns
+        -------
+        bytearray
+            The data, the missing packages are zeroed
+        '''
+        return self.data
+
+    def _getOffset(self, index: int, length: int) -> int:
+        '''Helper method returning the offset of the package in the data
+
+        Parameters
+        ----------
+        index : int
+            Index of the package
+        length : int
+            Amount of bytes to write at the offset
+        '''
+        if index < 0 or index >= self.frames:
+            raise IndexError("The package is out of the buffer")
+
+        offset = index * self.frame_size
+        if offset + length > len(self.data):
+            raise ValueError("The data doesn't fit the buffer")
+
+        return offset
+
+    def _clear(self, index: int) -> None:
+        '''Helper method clearing the bit of the package on every level'''
+
+        for level in self.levels:
+            position = index >> 3
+            level[position] &= ~(0x80 >> (index & 7)) & 0xff
+
+            # The next level changes only if the whole byte is clear now
+            if level[position]:
+                break
+            index = position
+
+    def _writeFlags(self, index: int, flags: bytes) -> None:
+        '''Helper method overwriting the bits of the packages on every level'''
+
+        for number, level in enumerate(self.levels):
+            writeBits(level, index, flags)
+
+            if number + 1 == len(self.levels):
+                break
+
+            # Recalculate the bits of the bytes holding the altered bits
+            first = index >> 3
+            last = (index + len(flags) + 7) >> 3
+            flags = bytes(level[first:last]).translate(NONZERO_TABLE)
+            index = first
+
+    def _findSet(self, number: int, index: int) -> int:
+        '''Helper method finding the first set bit of the level from the index'''
+
+        level = self.levels[number]
+        position = index >> 3
+        if position >= len(level):
+            return -1
+
+        value = level[position] & (0xff >> (index & 7))
+        if not value:
+            # The next level shows which byte has any bit set
+            if number + 1 == len(self.levels):
+                return -1
+
+            position = self._findSet(number + 1, position + 1)
+            if position == -1:
+                return -1
+            value = level[position]
+
+        return position * 8 + 8 - value.bit_length()
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
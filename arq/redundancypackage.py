@@ -0,0 +1,78 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from arq.package import Package
+
+
+class RedundancyPackage(Package):
+    '''
+    The package carrying the incremental redundancy of another package
+
+    The redundancy is sent as the data of the package, so the connection
+    alters it the same way, but it has no check bits of its own.
+
+    Methods
+    -------
+    getBitsNumber()
+        Get the amount of bits sent over the connection
+    '''
+
+    __slots__ = ()
+
+    # The type of the package
+    TYPE_BITS = 8
+
+    def __init__(self, size: int, pbits: int, frame_size: int = 1) -> None:
+        '''
+        Parameters
+        ----------
+        pbits : int
+            Amount of the parity bits
+        size : int
+            Size of the data
+        frame_size : int
+            Maximum amount of bytes of the redundancy
+        '''
+        super(RedundancyPackage, self).__init__(size, pbits, frame_size, 0)
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the redundancy, the sequence number and the type
+        '''
+        return super(RedundancyPackage, self).getBitsNumber() + self.TYPE_BITS
+
+    def copy(self) -> 'RedundancyPackage':
+        ''' Copy the package, so the copy can be altered separately
+
+        Returns
+        ----------
+        RedundancyPackage
+            The copy of the package
+        '''
+        package = RedundancyPackage(self.size, self.pbits, self.frame_size)
+        package.value = self.value
+        package.parity = self.parity
+        package.sequence = self.sequence
+
+        return package
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
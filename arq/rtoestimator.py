@@ -0,0 +1,187 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+
+class RTOEstimator:
+    '''
+    Retransmission timeout estimator (Jacobson/Karels)
+
+    The timeout follows the smoothed round-trip time and its variance, the
+    way it's described in RFC 6298. The estimator doesn't read any clock by
+    itself, so the samples may be measured with the virtual clock of the
+    simulation as well as with the real one.
+
+    Attributes
+    ----------
+    initial : float
+        The timeout used before the first sample (in seconds)
+    minimum : float
+        The lower bound of the timeout (in seconds)
+    maximum : float
+        The upper bound of the timeout (in seconds)
+    granularity : float
+        The least margin over the smoothed round-trip time (in seconds)
+    srtt : float
+        Smoothed round-trip time, None before the first sample
+    rttvar : float
+        Round-trip time variation, None before the first sample
+    rto : float
+        Retransmission timeout estimated from the samples (in seconds)
+    backoffs : int
+        Amount of times the timeout was doubled since the last sample
+    samples : int
+        Amount of the samples taken
+
+    Methods
+    -------
+    update(sample)
+        Update the estimation with a new round-trip time sample
+    backoff()
+        Double the timeout after it has expired
+    getTimeout()
+        Get the current retransmission timeout
+    getSmoothedRTT()
+        Get the smoothed round-trip time
+    getRTTVariance()
+        Get the round-trip time variation
+    '''
+
+    # Gains of the smoothed round-trip time and its variation
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    # The weight of the variation in the timeout
+    K = 4
+
+    def __init__(self, initial: float = 1.0, minimum: float = 1e-3, maximum: float = 60.0, granularity: float = 1e-2) -> None:
+        '''
+        Parameters
+        ----------
+        initial : float
+            The timeout used before the first sample (in seconds)
+        minimum : float
+            The lower bound of the timeout (in seconds)
+        maximum : float
+            The upper bound of the timeout (in seconds)
+        granularity : float
+            The least margin over the smoothed round-trip time, so the steady
+            round-trip time doesn't shrink the timeout to the bare mean
+            (in seconds)
+        '''
+        if minimum <= 0 or minimum > maximum:
+            raise ValueError("Timeout bounds must be positive and ordered")
+
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.granularity = granularity
+
+        self.srtt = None
+        self.rttvar = None
+        self.rto = self._clamp(initial)
+        self.backoffs = 0
+        self.samples = 0
+
+    def update(self, sample: float) -> float:
+        '''Update the estimation with a new round-trip time sample
+
+        According to Karn's rule the samples of the repeated packages are
+        ambiguous, so they shouldn't be passed here.
+
+        Parameters
+        ----------
+        sample : float
+            The measured round-trip time (in seconds)
+
+        Returns
+        -------
+        float
+            The new retransmission timeout
+        '''
+        if self.srtt == None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar += self.BETA * (abs(self.srtt - sample) - self.rttvar)
+            self.srtt += self.ALPHA * (sample - self.srtt)
+
+        self.samples += 1
+
+        # The fresh estimation also drops the backoff
+        self.rto = self._clamp(self.srtt + max(self.granularity, self.K * self.rttvar))
+        self.backoffs = 0
+
+        return self.rto
+
+    def backoff(self) -> float:
+        '''Double the timeout after it has expired
+
+        The doubled timeout is kept until the next sample (Karn's rule), it
+        never grows over the maximum.
+
+        Returns
+        -------
+        float
+            The new retransmission timeout
+        '''
+        if self.getTimeout() < self.maximum:
+            self.backoffs += 1
+
+        return self.getTimeout()
+
+    def getTimeout(self) -> float:
+        '''Get the current retransmission timeout
+
+        Returns
+        -------
+        float
+            Current retransmission timeout (in seconds)
+        '''
+        return self._clamp(self.rto * 2 ** self.backoffs)
+
+    def getSmoothedRTT(self) -> float:
+        '''Get the smoothed round-trip time
+
+        Returns
+        -------
+        float
+            Smoothed round-trip time, None before the first sample
+        '''
+        return self.srtt
+
+    def getRTTVariance(self) -> float:
+        '''Get the round-trip time variation
+
+        Returns
+        -------
+        float
+            Round-trip time variation, None before the first sample
+        '''
+        return self.rttvar
+
+    def _clamp(self, timeout: float) -> float:
+        '''Helper method keeping the timeout in its bounds
+
+        Parameters
+        ----------
+        timeout : float
+            The timeout to check
+        '''
+        return min(max(timeout, self.minimum), self.maximum)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,212 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+from utils.bits import packBits, unpackBits
+
+
+class SelectiveAcknowledgement:
+    '''
+    The cumulative feedback with the selective acknowledgement (SACK) block
+
+    The block lists the runs of the packages received after the missing
+    one. It's encoded either as the lengths of the gaps and the runs, or as
+    a bitmap, whichever is shorter.
+
+    Attributes
+    ----------
+    cumulative : int
+        Sequence number of the next expected package, every package before
+        it was received
+    encoding : int
+        The encoding of the block
+    block : bytes
+        The encoded runs of the received packages
+
+    Methods
+    -------
+    getCumulative()
+        Get the sequence number of the next expected package
+    getRuns()
+        Get the runs of the packages received after the missing one
+    isPositive()
+        Check if the feedback acknowledges the packages
+    getBitsNumber()
+        Get the amount of bits sent over the connection
+    '''
+
+    __slots__ = ('cumulative', 'encoding', 'block')
+
+    # The cumulative sequence number, the type of the feedback and the encoding
+    HEADER_BITS = 32 + 8 + 8
+
+    # The encodings of the block
+    RUN_LENGTH = 0
+    BITMAP = 1
+
+    def __init__(self, cumulative: int, runs: list = ()) -> None:
+        '''
+        Parameters
+        ----------
+        cumulative : int
+            Sequence number of the next expected package
+        runs : list
+            The sorted pairs of the first and the past-the-end sequence
+            numbers of the packages received after the cumulative one
+        '''
+        self.cumulative = cumulative
+        self.encoding = self.RUN_LENGTH
+        self.block = self._encodeRuns(runs)
+
+        # The bitmap covers every package after the missing one
+        if len(runs) != 0:
+            span = runs[-1][1] - cumulative - 1
+            if (span + 7) // 8 < len(self.block):
+                self.encoding = self.BITMAP
+                self.block = self._encodeBitmap(runs, span)
+
+    def getCumulative(self) -> int:
+        ''' Get the sequence number of the next expected package
+
+        Returns
+        ----------
+        int
+            Sequence number of the next expected package
+        '''
+        return self.cumulative
+
+    def getRuns(self) -> list:
+        ''' Get the runs of the packages received after the missing one
+
+        Returns
+        ----------
+        list
+            The sorted pairs of the first and the past-the-end sequence
+            numbers of the received packages
+        '''
+        if self.encoding == self.BITMAP:
+            return self._decodeBitmap()
+
+        return self._decodeRuns()
+
+    def isPositive(self) -> bool:
+        ''' Check if the feedback acknowledges the packages
+
+        Returns
+        ----------
+        bool
+            Always True, the missing packages are the gaps between the runs
+        '''
+        return True
+
+    def getBitsNumber(self) -> int:
+        ''' Get the amount of bits sent over the connection
+
+        Returns
+        ----------
+        int
+            Amount of bits of the feedback
+        '''
+        return self.HEADER_BITS + len(self.block) * 8
+
+    def _encodeRuns(self, runs: list) -> bytes:
+        '''Helper method encoding the lengths of the gaps and the runs
+
+        Every length is encoded as a variable-length integer (LEB128).
+
+        Parameters
+        ----------
+        runs : list
+            The runs of the received packages
+        '''
+        block = bytearray()
+        previous = self.cumulative
+
+        for start, end in runs:
+            for length in (start - previous, end - start):
+                while length > 0x7F:
+                    block.append(0x80 | (length & 0x7F))
+                    length >>= 7
+                block.append(length)
+
+            previous = end
+
+        return bytes(block)
+
+    def _decodeRuns(self) -> list:
+        '''Helper method decoding the lengths of the gaps and the runs'''
+
+        lengths = list()
+        length = 0
+        shift = 0
+
+        for byte in self.block:
+            length |= (byte & 0x7F) << shift
+            shift += 7
+
+            if byte < 0x80:
+                lengths.append(length)
+                length = 0
+                shift = 0
+
+        runs = list()
+        previous = self.cumulative
+
+        for index in range(0, len(lengths), 2):
+            start = previous + lengths[index]
+            previous = start + lengths[index + 1]
+            runs.append((start, previous))
+
+        return runs
+
+    def _encodeBitmap(self, runs: list, span: int) -> bytes:
+        '''Helper method encoding the runs as a bitmap
+
+        Parameters
+        ----------
+        runs : list
+            The runs of the received packages
+        span : int
+            Amount of the packages after the missing one
+        '''
+        flags = bytearray(span)
+        first = self.cumulative + 1
+
+        for start, end in runs:
+            flags[start - first:end - first] = b'\x01' * (end - start)
+
+        return packBits(flags)
+
+    def _decodeBitmap(self) -> list:
+        '''Helper method decoding the runs from the bitmap'''
+
+        flags = unpackBits(self.block, 0, len(self.block) * 8)
+        first = self.cumulative + 1
+
+        runs = list()
+        start = flags.find(1)
+        while start != -1:
+            end = flags.find(0, start)
+            if end == -1:
+                end = len(flags)
+
+            runs.append((first + start, first + end))
+            start = flags.find(1, end)
+
+        return runs
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
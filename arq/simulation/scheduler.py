@@ -0,0 +1,230 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import heapq
+import itertools
+
+
+class Event:
+    '''
+    An event scheduled for the given virtual time
+
+    Attributes
+    ----------
+    time : float
+        The virtual time of the event (in seconds)
+    callback : callable
+        The function called when the event happens
+    args : tuple
+        The arguments of the callback
+    cancelled : bool
+        Whether the event was cancelled
+
+    Methods
+    -------
+    cancel()
+        Cancel the event
+    '''
+
+    __slots__ = ('time', 'callback', 'args', 'cancelled')
+
+    def __init__(self, time: float, callback, args: tuple) -> None:
+        '''
+        Parameters
+        ----------
+        time : float
+            The virtual time of the event (in seconds)
+        callback : callable
+            The function called when the event happens
+        args : tuple
+            The arguments of the callback
+        '''
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        '''Cancel the event'''
+        self.cancelled = True
+
+
+class Scheduler:
+    '''
+    Discrete-event scheduler with a virtual clock
+
+    The events are kept in a priority queue ordered by their time, and the
+    clock jumps straight to the time of the next event, so the simulation
+    never waits for the real time to pass. The events of the same time
+    happen in the order they were scheduled.
+
+    Attributes
+    ----------
+    time : float
+        Current virtual time (in seconds)
+    events : list
+        The priority queue of the scheduled events
+
+    Methods
+    -------
+    now()
+        Get the current virtual time
+    schedule(delay, callback, *args)
+        Schedule the callback after the delay
+    scheduleAt(time, callback, *args)
+        Schedule the callback at the given time
+    step()
+        Process the next event
+    run(until)
+        Process the events until there are none left
+    runUntil(predicate)
+        Process the events until the predicate becomes true
+    isEmpty()
+        Check if there are no events left
+    '''
+
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.events = list()
+
+        # Keeps the order of the events of the same time
+        self.counter = itertools.count()
+
+    def now(self) -> float:
+        '''Get the current virtual time
+
+        Returns
+        -------
+        float
+            Current virtual time (in seconds)
+        '''
+        return self.time
+
+    def schedule(self, delay: float, callback, *args) -> Event:
+        '''Schedule the callback after the delay
+
+        Parameters
+        ----------
+        delay : float
+            The delay from the current virtual time (in seconds)
+        callback : callable
+            The function called when the event happens
+        args : tuple
+            The arguments of the callback
+
+        Returns
+        -------
+        Event
+            The scheduled event, which may be cancelled
+        '''
+        if delay < 0:
+            raise ValueError("Events can't be scheduled in the past")
+
+        return self.scheduleAt(self.time + delay, callback, *args)
+
+    def scheduleAt(self, time: float, callback, *args) -> Event:
+        '''Schedule the callback at the given time
+
+        Parameters
+        ----------
+        time : float
+            The virtual time of the event (in seconds)
+        callback : callable
+            The function called when the event happens
+        args : tuple
+            The arguments of the callback
+
+        Returns
+        -------
+        Event
+            The scheduled event, which may be cancelled
+        '''
+        if time < self.time:
+            raise ValueError("Events can't be scheduled in the past")
+
+        event = Event(time, callback, args)
+        heapq.heappush(self.events, (time, next(self.counter), event))
+
+        return event
+
+    def step(self) -> bool:
+        '''Process the next event
+
+        Returns
+        -------
+        bool
+            True if an event was processed, False if there are none left
+        '''
+        while self.events:
+            time, index, event = heapq.heappop(self.events)
+            if event.cancelled:
+                continue
+
+            # Move the clock straight to the event
+            self.time = time
+            event.callback(*event.args)
+
+            return True
+
+        return False
+
+    def run(self, until: float = None) -> None:
+        '''Process the events until there are none left
+
+        Parameters
+        ----------
+        until : float
+            The virtual time to stop at, all the events by default
+        '''
+        while self.events:
+            if until != None and self.events[0][0] > until:
+                self.time = until
+                return
+
+            self.step()
+
+    def runUntil(self, predicate) -> bool:
+        '''Process the events until the predicate becomes true
+
+        Parameters
+        ----------
+        predicate : callable
+            The function checked before every event
+
+        Returns
+        -------
+        bool
+            The value of the predicate after the last processed event
+        '''
+        while not predicate():
+            if not self.step():
+                return predicate()
+
+        return True
+
+    def isEmpty(self) -> bool:
+        '''Check if there are no events left
+
+        Returns
+        -------
+        bool
+            True if there are no events left, False otherwise
+        '''
+        return not any(not event.cancelled for time, index, event in self.events)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -14,6 +14,10 @@
     limitations under the License.
 '''
 
+import asyncio
+import collections
+import threading
+
 from arq.connection import iconnection as IConnection
 
 
@@ -21,24 +25,86 @@ class Transceiver:
     '''
     The class which handles data transmission using the connection
 
+    The received data is kept in a bounded FIFO inbox. When the inbox is
+    full, the backpressure policy decides what happens to the new data :
+    the connection waits for a free slot ("block"), the oldest data is
+    dropped ("drop-oldest") or the new data is rejected ("reject"). The
+    blocking policy needs the inbox to be drained by another thread.
+
     Attributes
     ----------
     id : int
         Transceiver ID in the connection
-    data : list
+    inbox : collections.deque
         The received data
+    capacity : int
+        Maximum amount of the received data kept in the inbox
+    policy : str
+        The backpressure policy used when the inbox is full
+    dropped : int
+        Amount of the received data dropped or rejected because of the policy
+    condition : threading.Condition
+        Wakes up the threads waiting for the inbox
     connection : IConnection
         The established connection to use
+    listener : callable
+        The function called with the received data
+    transmitted_counter : Counter
+        Amount of the data transmitted, None without the metrics
+    received_counter : Counter
+        Amount of the data received, None without the metrics
 
     Methods
     -------
-    start()
-        Starts the controller
+    transmit(data)
+        Transmit the data to another transceiver
+    receive(data)
+        Receive the data from another transceiver
+    getReceived(block, timeout)
+        Get the received data
+    getReceivedAsync(timeout)
+        Wait for the received data in a coroutine
+    isDataReceived()
+        Check if the data is received
+    getInboxSize()
+        Get the amount of the received data in the inbox
+    setMetrics(metrics)
+        Sets the registry of the metrics
     '''
 
-    def __init__(self) -> None:
+    # Backpressure policies
+    BLOCK = "block"
+    DROP_OLDEST = "drop-oldest"
+    REJECT = "reject"
+
+    POLICIES = (BLOCK, DROP_OLDEST, REJECT)
+
+    def __init__(self, capacity: int = 16, policy: str = BLOCK) -> None:
+        '''
+        Parameters
+        ----------
+        capacity : int
+            Maximum amount of the received data kept in the inbox
+        policy : str
+            The backpressure policy used when the inbox is full
+        '''
+        if capacity < 1:
+            raise ValueError("Inbox capacity must be positive")
+
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown backpressure policy : {}".format(policy))
+
         self.id = -1
-        self.data = None
+        self.listener = None
+
+        self.inbox = collections.deque()
+        self.capacity = capacity
+        self.policy = policy
+        self.dropped = 0
+        self.condition = threading.Condition()
+
+        self.transmitted_counter = None
+        self.received_counter = None
 
     def establishConnection(self, connection: IConnection, id: int) -> None:
         '''Establishes the connection between transceivers
@@ -59,39 +125,113 @@ class Transceiver:
         Parameters
         ----------
         data : list
-            The data to transmit
+            The data to transmit, a list of packages or a package batch
         '''
         # Check if a connection exists
         if id == -1:
             return
 
+        if self.transmitted_counter != None:
+            self.transmitted_counter.inc()
+
         self.connection.send(data, self.id)
 
-    def receive(self, data: list) -> None:
+    def receive(self, data: list) -> bool:
         '''Receive the data from another transceiver
 
         Parameters
         ----------
         data : list
-            The received data
+            The received data, a list of packages or a package batch
+
+        Returns
+        -------
+        bool
+            True if the data is accepted, False if it is rejected
         '''
-        self.data = data
+        if self.received_counter != None:
+            self.received_counter.inc()
+
+        # The listener consumes the data instead of the inbox
+        if self.listener != None:
+            self.listener(data)
+            return True
+
+        with self.condition:
+            if len(self.inbox) >= self.capacity:
+                if self.policy == self.REJECT:
+                    self.dropped += 1
+                    return False
+
+                if self.policy == self.DROP_OLDEST:
+                    self.inbox.popleft()
+                    self.dropped += 1
+                else:
+                    self.condition.wait_for(lambda: len(self.inbox) < self.capacity)
+
+            self.inbox.append(data)
+            self.condition.notify_all()
 
-    def getReceived(self) -> dict:
+        return True
+
+    def setListener(self, listener) -> None:
+        '''Set the function called with the received data
+
+        The data passed to the listener isn't kept in the inbox.
+
+        Parameters
+        ----------
+        listener : callable
+            The function to call, None to remove the listener
+        '''
+        self.listener = listener
+
+    def getReceived(self, block: bool = False, timeout: float = None) -> list:
         '''Get the received data
 
+        Parameters
+        ----------
+        block : bool
+            Whether to wait for the data, if the inbox is empty
+        timeout : float
+            Maximum time to wait (in seconds), no limit by default
+
         Returns
         -------
         list
-            The received data
+            The oldest received data, None if there is no data
         '''
-        # Remove the data from the transceiver instance
-        data = self.data
-        self.data = None
+        with self.condition:
+            if block:
+                self.condition.wait_for(lambda: len(self.inbox) > 0, timeout)
+
+            if len(self.inbox) == 0:
+                return None
+
+            # Remove the data from the transceiver instance
+            data = self.inbox.popleft()
+            self.condition.notify_all()
 
         # Return the local copy
         return data
 
+    async def getReceivedAsync(self, timeout: float = None) -> list:
+        '''Wait for the received data in a coroutine
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait (in seconds), no limit by default
+
+        Returns
+        -------
+        list
+            The oldest received data, None if there is no data
+        '''
+        # Wait in the executor, so the event loop isn't blocked
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.getReceived, True, timeout)
+
     def isDataReceived(self) -> bool:
         '''Check if the data is received
 
@@ -100,7 +240,38 @@ class Transceiver:
         bool
             true, if the data is present, false otherwise
         '''
-        return self.data != None
+        return len(self.inbox) > 0
+
+    def getInboxSize(self) -> int:
+        '''Get the amount of the received data in the inbox
+
+        Returns
+        -------
+        int
+            Amount of the received data
+        '''
+        return len(self.inbox)
+
+    def setMetrics(self, metrics) -> None:
+        '''Sets the registry of the metrics
+
+        Every transmission or reception counts once, whether it holds a
+        package, a batch or a list of packages.
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry to report the metrics to
+        '''
+        labels = {"transceiver": self.id}
+        self.transmitted_counter = metrics.counter(
+            "arq_transceiver_transmitted_total", "Transmissions of the transceiver", labels)
+        self.received_counter = metrics.counter(
+            "arq_transceiver_received_total", "Receptions of the transceiver", labels)
+        metrics.counter("arq_transceiver_dropped_total", "Received data dropped or rejected by the inbox",
+                        labels, lambda: self.dropped)
+        metrics.gauge("arq_transceiver_inbox_depth", "Amount of the received data in the inbox",
+                      labels, self.getInboxSize)
 
 
 if __name__ == '__main__':
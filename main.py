@@ -14,76 +14,562 @@
     limitations under the License.
 '''
 
+import math
+import os
+import sys
+import time
+import random
 import threading
 import argparse
+import cProfile
+import tracemalloc
+from functools import partial
 
 from arq.connection.bdnoisyconnection import BidirectionalNoisyConnection
 from arq.connection.bsconnection import BinarySymmetricConnection
+from arq.connection.geconnection import GilbertElliottConnection
 from arq.transceiver import Transceiver
-from arq.data.basicdatasource import BasicDataSource as Source
+from arq.data.basicdatasource import BasicDataSource
+from arq.data.idatasource import IDataSource
+from arq.data.mmapfilesink import MmapFileSink
+from arq.data.mmapfilesource import MmapFileSource
 from arq.controllers.receivercontroller import ReceiverController
 from arq.controllers.sendercontroller import SenderController
+from arq.controllers.adaptivereceivercontroller import AdaptiveReceiverController
+from arq.controllers.adaptivesendercontroller import AdaptiveSenderController
+from arq.controllers.hybridreceivercontroller import HybridReceiverController
+from arq.controllers.hybridsendercontroller import HybridSenderController
+from arq.controllers.gbnreceivercontroller import GoBackNReceiverController
+from arq.controllers.gbnsendercontroller import GoBackNSenderController
+from arq.controllers.sackreceivercontroller import SelectiveAckReceiverController
+from arq.controllers.sacksendercontroller import SelectiveAckSenderController
+from arq.controllers.streamreceivercontroller import StreamReceiverController
+from arq.controllers.streamsendercontroller import StreamSenderController
+from arq.controllers.srreceivercontroller import SelectiveRepeatReceiverController
+from arq.controllers.srsendercontroller import SelectiveRepeatSenderController
+from arq.controllers.swreceivercontroller import SlidingWindowReceiverController
+from arq.controllers.swsendercontroller import SlidingWindowSenderController
 from arq.codec import Codec
+from arq.crccodec import CRCCodec
+from arq.hammingcodec import HammingCodec
+from arq.hybridcodec import HybridCodec
+from arq.crc import CRCS
+from arq.framereport import FrameReport
+from arq.linkadaptation import LinkAdaptation
+from arq.metrics.metricsregistry import MetricsRegistry
+from arq.parametersweep import ParameterSweep
+from arq.rtoestimator import RTOEstimator
+from arq.simulation.scheduler import Scheduler
 from utils.logger import Logger
+from utils.profiler import Profiler
+from utils.resultcache import ResultCache
+from utils.resultwriter import ResultWriter
 
+# The arguments, which don't change the statistics of the run
+UNCACHED_ARGUMENTS = ['output', 'log_level', 'log_file', 'no_cache', 'cache_dir', 'cache_size',
+                      'metrics_json', 'metrics_prometheus', 'profile', 'trace_memory',
+                      'profile_report', 'frame_report', 'repetitions', 'workers', 'results',
+                      'run', 'repetition']
+
+
+def createConnection(args, a: Transceiver, b: Transceiver):
+    '''Create the desired connection between the transceivers'''
+    if (args.connection_type == 1):
+        return BidirectionalNoisyConnection(a, b, args.probability)
+    elif (args.connection_type == 2):
+        return BinarySymmetricConnection(a, b, args.probability, args.seed)
+    elif (args.connection_type == 3):
+        return GilbertElliottConnection(a, b, args.probability, args.bad_probability,
+                                        args.good_to_bad, args.bad_to_good)
+
+
+def createSource(args) -> IDataSource:
+    '''Create the source of the data to send'''
+    if args.input != None:
+        return MmapFileSource(args.input)
+
+    return BasicDataSource(args.data_size, args.seed)
+
+
+def createCodec(args, frame_size: int, name: str = None) -> Codec:
+    '''Create the desired codec for the given frame size'''
+    name = name if name != None else args.codec
+
+    if (name == 'parity'):
+        return Codec(args.package_size, args.parity_bits, frame_size)
+    elif (name in CRCS):
+        return CRCCodec(args.package_size, args.parity_bits, CRCS[name], frame_size)
+    else:
+        return HammingCodec(args.package_size, args.parity_bits, name, frame_size)
+
+
+def createAdaptation(args) -> LinkAdaptation:
+    '''Create the profiles of the link adaptation'''
+    profiles = list()
+    for profile in args.profiles.split(','):
+        name, frame_size = profile.split(':')
+        profiles.append(createCodec(args, int(frame_size), name))
+
+    return LinkAdaptation(profiles)
+
+
+def createParser(sweep: bool = False) -> argparse.ArgumentParser:
+    '''Create the parser of the arguments of a single run or of the sweep'''
+
+    # The swept parameters take the grids of values instead of a single one
+    grid = ' (comma-separated values or a range)' if sweep else ''
+    description = 'Basic ARQ system written in Python.'
+    if sweep:
+        description = 'Run the ARQ system for every point of the parameter grid.'
 
-def main():
-    # Obtain arguments from the call
     parser = argparse.ArgumentParser(
-        description='Basic ARQ system written in Python.')
-    parser.add_argument('--probability', type=float,
-                        help='Probability of bit toggling')
+        prog='main.py sweep' if sweep else None, description=description)
+    parser.add_argument('--probability', type=str if sweep else float,
+                        help='Probability of bit toggling' + grid, required=sweep)
     parser.add_argument('--data_size', type=int,
-                        help='Size of the data to generate (in bytes)', required=True)
-    parser.add_argument('--package_size', type=int,
-                        help='Size of the package data in range [5,7] (in bits)', required=True)
-    parser.add_argument('--parity_bits', type=int,
-                        help='Amount of parity bits', required=True)
-    parser.add_argument('--connection-type', type=int,
+                        help='Size of the data to generate (in bytes)')
+    parser.add_argument('--input',
+                        help='Path of the file to send instead of the generated data')
+    if not sweep:
+        parser.add_argument('--output',
+                            help='Path of the file to write the received data to, when it is streamed or sent with the ARQ')
+    parser.add_argument('--seed', type=int,
+                        help='Seed of the generated data and the noise, so the run can be reproduced')
+    parser.add_argument('--package_size', type=str if sweep else int,
+                        help='Size of the package data in range [5,7] (in bits)' + grid, required=True)
+    parser.add_argument('--parity_bits', type=str if sweep else int,
+                        help='Amount of parity bits' + grid, required=True)
+    parser.add_argument('--connection-type', type=str if sweep else int,
                         help='''\
                             Connection type for the ARQ system
 
                             Possible values :
                              - 1 : Bidirectional noisy connection
                              - 2 : Bidirectional binary symmetric noisy connection
-                            ''', required=True)
+                             - 3 : Bidirectional Gilbert-Elliott burst noisy connection
+                            ''' + grid, required=True)
+    parser.add_argument('--bad_probability', type=float, default=0.5,
+                        help='Probability of bit toggling in the bad state of the burst connection')
+    parser.add_argument('--good_to_bad', type=float, default=1e-4,
+                        help='Probability of the burst connection to switch to the bad state after a bit')
+    parser.add_argument('--bad_to_good', type=float, default=0.1,
+                        help='Probability of the burst connection to switch to the good state after a bit')
+    parser.add_argument('--codec', choices=['parity'] + list(CRCS) + list(HammingCodec.SCHEMES),
+                        default='parity', help='Error detection or correction code to use')
+    parser.add_argument('--frame_size', type=int, default=1,
+                        help='Size of the data of every package (in bytes)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Pack the whole data into a single batch')
+    parser.add_argument('--chunk_size', type=int,
+                        help='Stream the data in chunks of the given size (in bytes) instead of sending it at once')
+    parser.add_argument('--log_level', choices=list(Logger.LEVELS), default='info',
+                        help='The lowest level of the messages written')
+    parser.add_argument('--log_file',
+                        help='Path of the file to write the messages to instead of the console')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Run the transmission even if its statistics are cached')
+    parser.add_argument('--cache_dir', default='.arq_cache',
+                        help='Path of the directory of the cached statistics')
+    parser.add_argument('--cache_size', type=float, default=256,
+                        help='Maximum size of the cached statistics (in MiB)')
+    if sweep:
+        parser.add_argument('--repetitions', type=int, default=1,
+                            help='Amount of the runs of every point of the grid')
+        parser.add_argument('--workers', type=int,
+                            help='Amount of the worker processes, the amount of the CPUs by default')
+        parser.add_argument('--results', default='sweep.csv',
+                            help='Path of the CSV or JSONL (.jsonl) file to write the results to')
+    else:
+        parser.add_argument('--metrics_json',
+                            help='Path of the JSON file to write the metrics of the transmission to')
+        parser.add_argument('--metrics_prometheus',
+                            help='Path of the Prometheus text file to write the metrics of the transmission to')
+        parser.add_argument('--profile', action='store_true',
+                            help='Profile the run with cProfile and time its stages')
+        parser.add_argument('--trace-memory', action='store_true',
+                            help='Trace the memory allocated by the stages of the run with tracemalloc')
+        parser.add_argument('--profile_report', default='profile.txt',
+                            help='Path of the report of the profiling')
+        parser.add_argument('--frame_report', action='store_true',
+                            help='Report the throughput for several frame sizes')
+    parser.add_argument('--inbox_capacity', type=int, default=16,
+                        help='Maximum amount of the received data kept by a transceiver')
+    parser.add_argument('--backpressure', choices=Transceiver.POLICIES, default=Transceiver.BLOCK,
+                        help='What happens to the received data, when the inbox is full')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Simulate the timing with the virtual clock instead of the real time')
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='Propagation delay of the simulated connection (in seconds)')
+    parser.add_argument('--bitrate', type=float,
+                        help='Transmission rate of the simulated connection (in bits per second)')
+    parser.add_argument('--arq', choices=['none', 'sr', 'gbn', 'sack', 'adaptive', 'hybrid'], default='none',
+                        help='''\
+                            Retransmission protocol to use
+
+                            Possible values :
+                             - none : Send the data once
+                             - sr : Selective Repeat
+                             - gbn : Go-Back-N
+                             - sack : Selective Repeat with the SACK feedback
+                             - adaptive : Selective Repeat with the link adaptation
+                             - hybrid : Type-II hybrid ARQ with the incremental redundancy
+                            ''')
+    parser.add_argument('--window', type=int,
+                        help='Maximum amount of the packages sent, but not acknowledged yet, 4096 with SACK and 8 otherwise')
+    parser.add_argument('--rto', type=float, default=1.0,
+                        help='Retransmission timeout used before the round-trip time is measured (in seconds)')
+    parser.add_argument('--sack_interval', type=int, default=2048,
+                        help='Amount of the received packages acknowledged by a single SACK feedback, at most a half of the window')
+    parser.add_argument('--ack_delay', type=float, default=0.01,
+                        help='Maximum time the SACK feedback waits for the next package (in seconds)')
+    parser.add_argument('--profiles', default='crc32:64,crc32:256,crc32:1024,secded16:64,secded16:256',
+                        help='Comma-separated codec:frame_size profiles of the link adaptation, the first one is used at first')
+    parser.add_argument('--report_interval', type=int, default=64,
+                        help='Amount of the received packages between the reports of the bit error rate')
+    parser.add_argument('--redundancy', choices=list(HammingCodec.SCHEMES), default='secded16',
+                        help='Hamming code of the incremental redundancy of the hybrid ARQ')
+
+    return parser
+
+
+def checkArguments(parser: argparse.ArgumentParser, args) -> None:
+    '''Check the arguments, which depend on each other'''
+
+    if args.arq == 'hybrid' and args.codec not in CRCS:
+        parser.error("the hybrid ARQ checks the packages with a CRC codec")
+
+    if args.input != None:
+        args.data_size = os.path.getsize(args.input)
+    elif args.data_size == None:
+        parser.error("either --data_size or --input is required")
+
+    if args.output != None and args.chunk_size == None and args.arq == 'none':
+        parser.error("the received data is written to the file, when it is streamed or sent with the ARQ only")
+
+    if args.chunk_size != None and (args.arq != 'none' or args.chunk_size < 1):
+        parser.error("the data is streamed in chunks of at least a byte without the ARQ only")
+
+    # A single SACK feedback acknowledges many packages, so it needs a wide window
+    if args.window == None:
+        args.window = 4096 if args.arq == 'sack' else 8
+
+
+def createControllers(args, transmitter: Transceiver, receiver: Transceiver) -> tuple:
+    '''Create the controllers of the desired protocol and the codecs they use'''
+
+    codec = createCodec(args, args.frame_size)
+    sink = MmapFileSink(args.output, args.data_size) if args.output != None else None
+    if args.arq == 'sr':
+        r_controller = SelectiveRepeatReceiverController(receiver, codec, args.window, sink)
+        s_controller = SelectiveRepeatSenderController(
+            transmitter, codec, createSource(args), args.window, RTOEstimator(args.rto))
+    elif args.arq == 'gbn':
+        r_controller = GoBackNReceiverController(receiver, codec, args.window, sink)
+        s_controller = GoBackNSenderController(
+            transmitter, codec, createSource(args), args.window, RTOEstimator(args.rto))
+    elif args.arq == 'sack':
+        r_controller = SelectiveAckReceiverController(
+            receiver, codec, args.window, args.sack_interval, args.ack_delay, sink)
+        s_controller = SelectiveAckSenderController(
+            transmitter, codec, createSource(args), args.window, RTOEstimator(args.rto))
+    elif args.arq == 'adaptive':
+        adaptation = createAdaptation(args)
+        r_controller = AdaptiveReceiverController(
+            receiver, adaptation, args.window, args.report_interval, sink=sink)
+        s_controller = AdaptiveSenderController(
+            transmitter, adaptation, createSource(args), args.window, RTOEstimator(args.rto))
+        return r_controller, s_controller, adaptation.getProfiles()
+    elif args.arq == 'hybrid':
+        codec = HybridCodec(args.package_size, args.parity_bits, CRCS[args.codec],
+                            args.redundancy, args.frame_size)
+        r_controller = HybridReceiverController(receiver, codec, args.window, sink)
+        s_controller = HybridSenderController(
+            transmitter, codec, createSource(args), args.window, RTOEstimator(args.rto))
+    elif args.chunk_size != None:
+        r_controller = StreamReceiverController(receiver, codec, sink)
+        s_controller = StreamSenderController(
+            transmitter, codec, createSource(args), args.chunk_size, args.batch)
+    else:
+        r_controller = ReceiverController(receiver, codec)
+        s_controller = SenderController(
+            transmitter, codec, createSource(args), args.batch)
+
+    return r_controller, s_controller, [codec]
+
+
+def createCache(args) -> ResultCache:
+    '''Create the cache of the statistics of the runs'''
+
+    # The statistics of the run without the seed can't be repeated
+    if args.no_cache or args.seed == None:
+        return None
+
+    version = ResultCache.hashSources(os.path.dirname(os.path.abspath(__file__)))
+    return ResultCache(args.cache_dir, int(args.cache_size * (1 << 20)), version)
+
+
+def describeRun(args) -> dict:
+    '''Describe the configuration of the run, which its statistics depend on'''
+
+    config = {key: value for key, value in vars(args).items()
+              if key not in UNCACHED_ARGUMENTS}
+
+    # The file may be changed under the same path
+    if args.input != None:
+        status = os.stat(args.input)
+        config["input"] = [os.path.abspath(args.input), status.st_size, status.st_mtime_ns]
+
+    return config
+
+
+def collectStats(r_controller: ReceiverController, s_controller: SenderController) -> dict:
+    '''Collect the statistics of the finished transmission'''
+
+    stats = {
+        "received": r_controller.received,
+        "failed": r_controller.failed,
+        "failure rate": r_controller.failed / max(r_controller.received, 1),
+    }
+    if isinstance(r_controller, SlidingWindowReceiverController):
+        stats.update(r_controller.getStats())
+    if isinstance(s_controller, SlidingWindowSenderController):
+        stats.update(s_controller.getStats())
+
+    return stats
+
+
+def main():
+    # The sweep has the arguments of its own
+    if len(sys.argv) > 1 and sys.argv[1] == 'sweep':
+        sweep(sys.argv[2:])
+        return
+
+    # Obtain arguments from the call
+    parser = createParser()
 
     # Parse the arguments
     args = parser.parse_args()
+    checkArguments(parser, args)
+
+    # The native connections take the noise from the random module
+    if args.seed != None:
+        random.seed(args.seed)
+
+    # Set the logger
+    logger = Logger(Logger.LEVELS[args.log_level], args.log_file)
+
+    # Compare the frame sizes instead of a single transmission
+    if args.frame_report:
+        report = FrameReport(lambda frame_size: createCodec(args, frame_size),
+                             lambda a, b: createConnection(args, a, b),
+                             createSource(args))
+        for line in report.format(report.run()):
+            logger.log("FrameReport", line)
+
+        return
+
+    # The run writing the files is never skipped
+    cache = None
+    if args.output == None and args.metrics_json == None and args.metrics_prometheus == None \
+            and not args.profile and not args.trace_memory:
+        cache = createCache(args)
+
+    if cache != None:
+        config = describeRun(args)
+        key = cache.getKey(config)
+        stats = cache.get(key)
+        if stats != None:
+            logger.log("ResultCache", ", ".join("{} : {}".format(name, value)
+                                                for name, value in stats.items()))
+            return
 
     # Establish the connection
-    transmitter = Transceiver()
-    receiver = Transceiver()
+    transmitter = Transceiver(args.inbox_capacity, args.backpressure)
+    receiver = Transceiver(args.inbox_capacity, args.backpressure)
 
     # Create the desired connection
-    if (args.connection_type == 1):
-        connection = BidirectionalNoisyConnection(
-            receiver, transmitter, args.probability)
-    elif (args.connection_type == 2):
-        connection = BinarySymmetricConnection(
-            receiver, transmitter, args.probability)
+    connection = createConnection(args, receiver, transmitter)
 
     # Create the transmitters
-    codec = Codec(args.package_size, args.parity_bits)
-    r_controller = ReceiverController(receiver, codec)
-    s_controller = SenderController(
-        transmitter, codec, Source(args.data_size))
+    r_controller, s_controller, codecs = createControllers(args, transmitter, receiver)
 
     # Set the logger
-    logger = Logger()
     r_controller.setLogger(logger)
     s_controller.setLogger(logger)
 
-    # Start the sender controller
-    s_controller.start()
+    # Collect the metrics of all the components
+    metrics = None
+    if args.metrics_json != None or args.metrics_prometheus != None:
+        metrics = MetricsRegistry()
+        for component in (transmitter, receiver, connection, r_controller, s_controller):
+            component.setMetrics(metrics)
+
+        for codec in codecs:
+            codec.setMetrics(metrics)
+
+    # Measure the stages of the run only if it's asked for
+    profiler = None
+    profile = None
+    snapshot = None
+    if args.profile or args.trace_memory:
+        profiler = Profiler(args.trace_memory)
+        profiler.enable()
+
+        if args.trace_memory:
+            tracemalloc.start()
+        if args.profile:
+            profile = cProfile.Profile()
+            profile.enable()
+
+    started = time.perf_counter()
+    run(args, connection, r_controller, s_controller)
+
+    if cache != None:
+        stats = collectStats(r_controller, s_controller)
+        stats["wall time"] = time.perf_counter() - started
+        cache.put(key, config, stats)
+        cache.evict()
+
+    if profiler != None:
+        if profile != None:
+            profile.disable()
+        if args.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+        profiler.disable()
+        profiler.write(args.profile_report, profile, snapshot)
+
+    if args.metrics_json != None:
+        metrics.writeJSON(args.metrics_json)
+    if args.metrics_prometheus != None:
+        metrics.writePrometheus(args.metrics_prometheus)
+
+
+def run(args, connection, r_controller: ReceiverController, s_controller: SenderController) -> None:
+    '''Run the transmission between the controllers'''
+
+    # Run the whole transmission on the virtual clock, the retransmission
+    # protocols are driven by its events
+    if args.simulate or args.arq != 'none':
+        scheduler = Scheduler()
+        connection.setScheduler(scheduler, args.delay, args.bitrate)
+        r_controller.setScheduler(scheduler)
+        s_controller.setScheduler(scheduler)
+
+        if args.arq != 'none':
+            r_controller.start()
+            s_controller.start()
+            scheduler.run()
+            r_controller.report()
+            return
 
-    # Start the receiver controller
+        if args.chunk_size != None:
+            r_controller.start()
+            s_controller.start()
+            scheduler.run()
+            r_controller.report()
+            return
+
+        s_controller.start()
+        r_controller.start()
+        return
+
+    # Every chunk is handled by the receiver as soon as it's sent
+    if args.chunk_size != None:
+        r_controller.start()
+        s_controller.start()
+        r_controller.report()
+        return
+
+    # Start the receiver controller, it waits for the data in the inbox
     r_thread = threading.Thread(target=r_controller.start)
     r_thread.start()
 
+    # Start the sender controller
+    s_controller.start()
+
     # Wait for the receiver
     r_thread.join()
 
 
+def sweep(argv: list) -> None:
+    '''Run the transmission for every point of the parameter grid'''
+
+    parser = createParser(sweep=True)
+    args = parser.parse_args(argv)
+
+    # Every run would overwrite the same file
+    args.output = None
+    checkArguments(parser, args)
+
+    try:
+        grid = {
+            "probability": ParameterSweep.parseGrid(args.probability, float),
+            "package_size": ParameterSweep.parseGrid(args.package_size, int),
+            "parity_bits": ParameterSweep.parseGrid(args.parity_bits, int),
+            "connection_type": ParameterSweep.parseGrid(args.connection_type, int),
+        }
+        cache = createCache(args)
+        runner = ParameterSweep(partial(runPoint, args, cache), grid,
+                                args.repetitions, args.seed, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+
+    logger = Logger(Logger.LEVELS[args.log_level], args.log_file)
+    total = math.prod(len(values) for values in grid.values()) * args.repetitions
+
+    # The results are written as soon as the runs finish
+    writer = ResultWriter(args.results)
+    try:
+        for finished, row in enumerate(runner.run(), 1):
+            writer.write(row)
+            logger.log("ParameterSweep", "Finished : {} of {}, probability : {}, package size : {}, "
+                       "parity bits : {}, connection type : {}", finished, total, row["probability"],
+                       row["package_size"], row["parity_bits"], row["connection_type"])
+    finally:
+        writer.close()
+
+        if cache != None:
+            cache.evict()
+
+
+def runPoint(args, cache: ResultCache, point: dict) -> dict:
+    '''Run the transmission for the point of the sweep and get its statistics'''
+
+    args = argparse.Namespace(**vars(args))
+    vars(args).update(point)
+
+    # The run is seeded, so it doesn't depend on the worker which runs it,
+    # and the virtual clock keeps it in a single thread
+    random.seed(args.seed)
+    args.simulate = True
+
+    if cache != None:
+        config = describeRun(args)
+        key = cache.getKey(config)
+        stats = cache.get(key)
+        if stats != None:
+            stats["cached"] = True
+            return stats
+
+    transmitter = Transceiver(args.inbox_capacity, args.backpressure)
+    receiver = Transceiver(args.inbox_capacity, args.backpressure)
+    connection = createConnection(args, receiver, transmitter)
+    r_controller, s_controller, _ = createControllers(args, transmitter, receiver)
+
+    started = time.perf_counter()
+    run(args, connection, r_controller, s_controller)
+
+    stats = collectStats(r_controller, s_controller)
+    stats["wall time"] = time.perf_counter() - started
+
+    if cache != None:
+        cache.put(key, config, stats)
+
+    stats["cached"] = False
+    return stats
+
+
 if __name__ == '__main__':
     main()
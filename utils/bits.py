@@ -0,0 +1,125 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+def xorBytes(a: bytes, b: bytes) -> bytes:
+    '''XOR two buffers of the same length byte by byte
+
+    Parameters
+    ----------
+    a : bytes
+        The first buffer
+    b : bytes
+        The second buffer
+
+    Returns
+    -------
+    bytes
+        The result of the XOR operation
+    '''
+    if len(a) != len(b):
+        raise ValueError("Buffers must have the same length")
+
+    result = int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')
+    return result.to_bytes(len(a), 'big')
+
+
+# Translation tables between the flag bytes and the binary digits
+FLAGS_TO_DIGITS = b'0' + b'1' * 255
+DIGITS_TO_FLAGS = bytes(range(0, 48)) + b'\x00\x01' + bytes(range(50, 256))
+
+
+def packBits(flags: bytes) -> bytes:
+    '''Pack the flags into a bitmap, the first flag being the MSB
+
+    Parameters
+    ----------
+    flags : bytes
+        The flags, one byte per flag; every non-zero byte is set
+
+    Returns
+    -------
+    bytes
+        The bitmap, padded with zero bits up to the whole byte
+    '''
+    if len(flags) == 0:
+        return bytes()
+
+    size = (len(flags) + 7) // 8
+    digits = bytes(flags).translate(FLAGS_TO_DIGITS)
+    digits += b'0' * (size * 8 - len(flags))
+
+    return int(digits, 2).to_bytes(size, 'big')
+
+
+def unpackBits(bitmap: bytes, offset: int, count: int) -> bytes:
+    '''Unpack the flags from a bitmap
+
+    Parameters
+    ----------
+    bitmap : bytes
+        The bitmap, the first flag being the MSB
+    offset : int
+        Index of the first flag to unpack
+    count : int
+        Amount of flags to unpack
+
+    Returns
+    -------
+    bytes
+        The flags, one byte (0 or 1) per flag
+    '''
+    if count == 0:
+        return bytes()
+
+    # Only convert the bytes holding the requested flags
+    first = offset // 8
+    last = (offset + count + 7) // 8
+    region = bytes(bitmap[first:last])
+
+    digits = format(int.from_bytes(region, 'big'), '0{}b'.format(len(region) * 8))
+    shift = offset - first * 8
+
+    return digits[shift:shift + count].encode('ascii').translate(DIGITS_TO_FLAGS)
+
+
+def writeBits(bitmap: bytearray, offset: int, flags: bytes) -> None:
+    '''Overwrite the flags of a bitmap in place
+
+    Parameters
+    ----------
+    bitmap : bytearray
+        The bitmap to alter
+    offset : int
+        Index of the first flag to overwrite
+    flags : bytes
+        The new flags, one byte per flag
+    '''
+    if len(flags) == 0:
+        return
+
+    # Rebuild only the bytes holding the altered flags
+    first = offset // 8
+    last = (offset + len(flags) + 7) // 8
+    shift = offset - first * 8
+
+    region = bytearray(unpackBits(bitmap, first * 8, (last - first) * 8))
+    region[shift:shift + len(flags)] = flags
+
+    bitmap[first:last] = packBits(region)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -14,6 +14,11 @@
     limitations under the License.
 '''
 
+import atexit
+import collections
+import sys
+import threading
+import time
 from datetime import datetime
 
 
@@ -22,17 +27,87 @@ class Logger:
     This class encapsulates the logging feature for the console
     or file output
 
+    The messages below the level are dropped at once. The others are put
+    into a ring buffer with their arguments and formatted and written by a
+    background thread in batches, so logging costs the caller an append
+    only. The oldest messages are dropped, if the buffer is full. The
+    binary data in the arguments is truncated, so the payloads don't flood
+    the output.
+
+    Attributes
+    ----------
+    level : int
+        The lowest level of the messages written
+    output : file
+        The destination of the messages
+    payload_limit : int
+        Maximum amount of bytes of the binary data written
+    records : collections.deque
+        The ring buffer of the messages, which aren't written yet
+    dropped : int
+        Amount of the messages dropped because of the full buffer
+    writer : threading.Thread
+        The thread writing the messages, None if they are written at once
+    stopped : threading.Event
+        The signal to stop the writer
+
     Methods
     -------
-    log(message)
+    log(tag, message, *args, level)
         Writes the message to the destination
+    isEnabled(level)
+        Check if the messages of the level are written
+    flush()
+        Wait until all the messages are written
+    close()
+        Write the rest of the messages and stop the writer
     '''
 
-    def __init__(self):
-        # TODO
-        pass
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+    LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+
+    # Time the writer sleeps, when there's nothing to write (in seconds)
+    INTERVAL = 0.05
+
+    def __init__(self, level: int = INFO, path: str = None, capacity: int = 4096, payload_limit: int = 64, background: bool = True) -> None:
+        '''
+        Parameters
+        ----------
+        level : int
+            The lowest level of the messages written
+        path : str
+            Path of the file to write the messages to, the console is used
+            if it's None
+        capacity : int
+            Maximum amount of the messages waiting to be written
+        payload_limit : int
+            Maximum amount of bytes of the binary data written
+        background : bool
+            Whether the messages are written by the background thread
+        '''
+        if capacity < 1:
+            raise ValueError("Logger must keep at least one message")
+
+        self.level = level
+        self.output = open(path, 'w') if path != None else sys.stdout
+        self.payload_limit = payload_limit
+        self.records = collections.deque(maxlen=capacity)
+        self.dropped = 0
+        self.writer = None
+        self.stopped = threading.Event()
+
+        if background:
+            self.writer = threading.Thread(target=self._run, name="Logger", daemon=True)
+            self.writer.start()
 
-    def log(self, tag: str, message: str) -> None:
+            # The daemon thread is stopped abruptly at exit
+            atexit.register(self.close)
+
+    def log(self, tag: str, message: str, *args, level: int = INFO) -> None:
         '''Writes the message to the destination
 
         Parameters
@@ -40,14 +115,147 @@ class Logger:
         tag : str
             The tag of the class/method/function to write
         message : str
-            The message to write
+            The message to write, the arguments are put into its
+            replacement fields when it's written
+        args
+            The arguments of the message
+        level : int
+            The level of the message
         '''
-        if not message or not tag:
+        if level < self.level or not message or not tag:
+            return
+
+        record = (time.time(), level, tag, message, args)
+        if self.writer == None:
+            self._write([record])
             return
 
-        # Current implementation can only print the message to console
-        timestamp = datetime.now().time()
-        print("{} | [{}] {}".format(timestamp, tag, message))
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+
+        # Appending to the deque is atomic, so the caller never waits
+        self.records.append(record)
+
+    def isEnabled(self, level: int) -> bool:
+        '''Check if the messages of the level are written
+
+        Parameters
+        ----------
+        level : int
+            The level of the messages
+
+        Returns
+        -------
+        bool
+            True if the messages are written, False otherwise
+        '''
+        return level >= self.level
+
+    def flush(self) -> None:
+        '''Wait until all the messages are written'''
+
+        while self.records and self.writer != None and self.writer.is_alive():
+            time.sleep(self.INTERVAL / 10)
+
+        self.output.flush()
+
+    def close(self) -> None:
+        '''Write the rest of the messages and stop the writer'''
+
+        if self.writer != None:
+            self.stopped.set()
+            self.writer.join()
+            self.writer = None
+            atexit.unregister(self.close)
+
+        # The messages are written by the caller from now on
+        self._drain()
+
+        if self.dropped:
+            self._write([(time.time(), self.WARNING, "Logger",
+                          "Dropped {} messages", (self.dropped,))])
+            self.dropped = 0
+
+        if self.output is sys.stdout:
+            self.output.flush()
+        else:
+            self.output.close()
+            self.output = sys.stdout
+
+    def _run(self) -> None:
+        '''Helper method writing the messages in the background'''
+
+        while not self.stopped.is_set():
+            if not self._drain():
+                self.stopped.wait(self.INTERVAL)
+
+    def _drain(self) -> bool:
+        '''Helper method writing all the messages of the buffer
+
+        Returns
+        -------
+        bool
+            True if anything was written, False otherwise
+        '''
+        batch = list()
+        while True:
+            try:
+                batch.append(self.records.popleft())
+            except IndexError:
+                break
+
+        if batch:
+            self._write(batch)
+
+        return len(batch) > 0
+
+    def _write(self, batch: list) -> None:
+        '''Helper method formatting and writing the messages at once
+
+        Parameters
+        ----------
+        batch : list
+            The messages to write
+        '''
+        lines = list()
+        for timestamp, level, tag, message, args in batch:
+            if args:
+                message = message.format(*(self._formatArgument(arg) for arg in args))
+
+            prefix = "{} | ".format(datetime.fromtimestamp(timestamp).time())
+            if level != self.INFO:
+                prefix += "{} ".format(self._getLevelName(level))
+
+            lines.append("{}[{}] {}\n".format(prefix, tag, message))
+
+        self.output.write("".join(lines))
+        self.output.flush()
+
+    def _formatArgument(self, argument):
+        '''Helper method truncating the binary data of the message
+
+        Parameters
+        ----------
+        argument
+            The argument of the message
+        '''
+        if not isinstance(argument, (bytes, bytearray, memoryview)):
+            return argument
+
+        size = len(argument)
+        if size <= self.payload_limit:
+            return bytes(argument)
+
+        return "{}... ({} bytes)".format(bytes(argument[:self.payload_limit]), size)
+
+    def _getLevelName(self, level: int) -> str:
+        '''Helper method returning the name of the level'''
+
+        for name, value in self.LEVELS.items():
+            if value == level:
+                return name.upper()
+
+        return str(level)
 
 
 if __name__ == '__main__':
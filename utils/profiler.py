@@ -0,0 +1,290 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import contextlib
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+# The span used while the profiling is disabled
+DISABLED_SPAN = contextlib.nullcontext()
+
+
+def span(name: str):
+    '''Measure the stage of the pipeline
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage
+
+    Returns
+    -------
+    context manager
+        The span of the active profiler, the shared empty one if the
+        profiling is disabled
+    '''
+    if Profiler.active == None:
+        return DISABLED_SPAN
+
+    return Profiler.active.span(name)
+
+
+class Profiler:
+    '''
+    This class collects the time and the memory of the pipeline stages
+
+    The stages are measured by the spans, which may be nested, so the time
+    and the memory of a stage include the ones of the stages inside it.
+    The memory is only measured while tracemalloc is tracing, the peak of
+    a stage is measured from the memory used when it started.
+
+    Attributes
+    ----------
+    active : Profiler
+        The profiler the spans are reported to, None if it's disabled
+    memory : bool
+        Whether the memory of the stages is measured
+    stages : dict
+        The statistics of every stage
+    lock : threading.Lock
+        Guards the statistics reported by several threads
+    local : threading.local
+        The spans open in every thread
+
+    Methods
+    -------
+    span(name)
+        Measure the stage of the pipeline
+    enable()
+        Report the spans to the profiler
+    disable()
+        Stop reporting the spans
+    getStages()
+        Get the statistics of the stages
+    format()
+        Format the statistics of the stages as a table
+    write(path, profile, snapshot)
+        Write the report of the run to the file
+    '''
+
+    active = None
+
+    # Amount of the functions and allocations written to the report
+    TOP = 25
+
+    def __init__(self, memory: bool = False) -> None:
+        '''
+        Parameters
+        ----------
+        memory : bool
+            Whether the memory of the stages is measured, tracemalloc has
+            to be tracing
+        '''
+        self.memory = memory
+        self.stages = dict()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def span(self, name: str) -> 'Span':
+        '''Measure the stage of the pipeline
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage
+
+        Returns
+        -------
+        Span
+            The context manager measuring the stage
+        '''
+        return Span(self, name)
+
+    def enable(self) -> None:
+        '''Report the spans to the profiler'''
+
+        Profiler.active = self
+
+    def disable(self) -> None:
+        '''Stop reporting the spans'''
+
+        if Profiler.active is self:
+            Profiler.active = None
+
+    def getStages(self) -> dict:
+        '''Get the statistics of the stages
+
+        Returns
+        -------
+        dict
+            The amount of calls, the time (in seconds), the memory allocated
+            and not freed and the peak memory (in bytes) of every stage by
+            its name
+        '''
+        with self.lock:
+            return {name: dict(stage) for name, stage in self.stages.items()}
+
+    def format(self) -> list:
+        '''Format the statistics of the stages as a table
+
+        Returns
+        -------
+        list
+            The lines of the table, the slowest stage first
+        '''
+        stages = sorted(self.getStages().items(), key=lambda item: -item[1]["time"])
+
+        header = "{:<20} | {:>10} | {:>10} | {:>12}".format("stage", "calls", "time, s", "per call, us")
+        if self.memory:
+            header += " | {:>12} | {:>12}".format("allocated, B", "peak, B")
+
+        lines = [header]
+        for name, stage in stages:
+            line = "{:<20} | {:>10} | {:>10.4f} | {:>12.2f}".format(
+                name, stage["calls"], stage["time"], stage["time"] / stage["calls"] * 1e6)
+            if self.memory:
+                line += " | {:>12} | {:>12}".format(stage["allocated"], stage["peak"])
+            lines.append(line)
+
+        return lines
+
+    def write(self, path: str, profile=None, snapshot: tracemalloc.Snapshot = None) -> None:
+        '''Write the report of the run to the file
+
+        Parameters
+        ----------
+        path : str
+            Path of the report
+        profile : cProfile.Profile
+            The profile of the functions called, None to skip it
+        snapshot : tracemalloc.Snapshot
+            The memory allocated by the end of the run, None to skip it
+        '''
+        lines = ["Stages", ""] + self.format()
+
+        if snapshot != None:
+            lines += ["", "Memory allocated by the end of the run (top {})".format(self.TOP), ""]
+            for statistic in snapshot.statistics('lineno')[:self.TOP]:
+                lines.append(str(statistic))
+
+        if profile != None:
+            output = io.StringIO()
+            statistics = pstats.Stats(profile, stream=output)
+            statistics.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.TOP)
+            lines += ["", "Functions (top {})".format(self.TOP), output.getvalue()]
+
+        with open(path, 'w') as file:
+            file.write("\n".join(lines) + "\n")
+
+    def _getStack(self) -> list:
+        '''Helper method returning the spans open in the current thread'''
+
+        stack = getattr(self.local, 'stack', None)
+        if stack == None:
+            stack = self.local.stack = list()
+
+        return stack
+
+    def _record(self, name: str, elapsed: float, allocated: int, peak: int) -> None:
+        '''Helper method adding the span to the statistics of its stage'''
+
+        with self.lock:
+            stage = self.stages.get(name)
+            if stage == None:
+                stage = self.stages[name] = {"calls": 0, "time": 0.0, "allocated": 0, "peak": 0}
+
+            stage["calls"] += 1
+            stage["time"] += elapsed
+            stage["allocated"] += allocated
+            stage["peak"] = max(stage["peak"], peak)
+
+
+class Span:
+    '''
+    The context manager measuring a single call of the stage
+
+    Attributes
+    ----------
+    profiler : Profiler
+        The profiler to report to
+    name : str
+        Name of the stage
+    started : float
+        Time when the span started
+    current : int
+        Memory used when the span started
+    peak : int
+        The highest memory used by the spans inside this one
+    saved_peak : int
+        The peak memory of tracemalloc before the span started
+    '''
+
+    __slots__ = ('profiler', 'name', 'started', 'current', 'peak', 'saved_peak')
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        '''
+        Parameters
+        ----------
+        profiler : Profiler
+            The profiler to report to
+        name : str
+            Name of the stage
+        '''
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> 'Span':
+        self.current = 0
+        self.peak = 0
+        self.saved_peak = 0
+
+        # The peak of tracemalloc is reset to measure the span alone
+        if self.profiler.memory and tracemalloc.is_tracing():
+            self.current, self.saved_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        self.profiler._getStack().append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        elapsed = time.perf_counter() - self.started
+
+        stack = self.profiler._getStack()
+        stack.pop()
+
+        allocated = 0
+        peak = 0
+        if self.profiler.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.peak)
+            allocated = current - self.current
+
+            # The enclosing span can't see the peak reset by this one
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak, self.saved_peak)
+
+            peak -= self.current
+
+        self.profiler._record(self.name, elapsed, allocated, peak)
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,220 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+class ResultCache:
+    '''
+    This class keeps the statistics of the runs on the disk
+
+    Every entry is a JSON file named by the hash of the configuration of
+    the run and the version of the code, so the entries of the changed
+    code are never returned. The modification time of an entry is updated
+    every time it's read, the least recently used entries are removed once
+    the cache grows over its capacity. The entries are written atomically,
+    so several processes may share the cache.
+
+    Attributes
+    ----------
+    directory : str
+        Path of the directory of the cache
+    capacity : int
+        Maximum size of the entries (in bytes)
+    version : str
+        The version of the code
+
+    Methods
+    -------
+    getKey(config)
+        Get the key of the configuration
+    get(key)
+        Get the statistics of the run
+    put(key, config, stats)
+        Store the statistics of the run
+    evict()
+        Remove the least recently used entries over the capacity
+    getSize()
+        Get the size of the entries
+    hashSources(root)
+        Get the version of the Python code in the directory
+    '''
+
+    def __init__(self, directory: str, capacity: int, version: str = '') -> None:
+        '''
+        Parameters
+        ----------
+        directory : str
+            Path of the directory of the cache, it's created if it's missing
+        capacity : int
+            Maximum size of the entries (in bytes)
+        version : str
+            The version of the code
+        '''
+        if capacity < 0:
+            raise ValueError("Capacity of the cache can't be negative")
+
+        self.directory = directory
+        self.capacity = capacity
+        self.version = version
+
+        os.makedirs(directory, exist_ok=True)
+
+    def getKey(self, config: dict) -> str:
+        '''Get the key of the configuration
+
+        Parameters
+        ----------
+        config : dict
+            The configuration of the run, it must be serializable to JSON
+
+        Returns
+        -------
+        str
+            The hash of the configuration and the version of the code
+        '''
+        text = json.dumps({"version": self.version, "config": config}, sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key: str) -> dict:
+        '''Get the statistics of the run
+
+        Parameters
+        ----------
+        key : str
+            The key of the configuration
+
+        Returns
+        -------
+        dict
+            The statistics stored, None if there's no such entry
+        '''
+        path = self._getPath(key)
+
+        try:
+            with open(path) as file:
+                entry = json.load(file)
+
+            # The entry is used now
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return entry["stats"]
+
+    def put(self, key: str, config: dict, stats: dict) -> None:
+        '''Store the statistics of the run
+
+        Parameters
+        ----------
+        key : str
+            The key of the configuration
+        config : dict
+            The configuration of the run, it's stored for the reference
+        stats : dict
+            The statistics of the run
+        '''
+        # The entry only appears once it's written completely
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump({"config": config, "stats": stats}, file)
+
+            os.replace(temporary, self._getPath(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def evict(self) -> None:
+        '''Remove the least recently used entries over the capacity'''
+
+        entries = self._getEntries()
+        size = sum(entry.stat().st_size for entry in entries)
+
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            if size <= self.capacity:
+                break
+
+            size -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                # Another process has removed it already
+                pass
+
+    def getSize(self) -> int:
+        '''Get the size of the entries
+
+        Returns
+        -------
+        int
+            The size of all the entries (in bytes)
+        '''
+        return sum(entry.stat().st_size for entry in self._getEntries())
+
+    @staticmethod
+    def hashSources(root: str) -> str:
+        '''Get the version of the Python code in the directory
+
+        Parameters
+        ----------
+        root : str
+            Path of the directory, the hidden directories are skipped
+
+        Returns
+        -------
+        str
+            The hash of the paths and the contents of the Python files
+        '''
+        digest = hashlib.sha256()
+
+        for directory, directories, files in os.walk(root):
+            directories[:] = sorted(name for name in directories if not name.startswith('.'))
+
+            for name in sorted(files):
+                if not name.endswith('.py'):
+                    continue
+
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, 'rb') as file:
+                    digest.update(file.read())
+
+        return digest.hexdigest()
+
+    def _getPath(self, key: str) -> str:
+        '''Helper method getting the path of the entry
+
+        Parameters
+        ----------
+        key : str
+            The key of the configuration
+        '''
+        return os.path.join(self.directory, key + '.json')
+
+    def _getEntries(self) -> list:
+        '''Helper method listing the entries of the cache'''
+
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries
+                    if entry.name.endswith('.json') and entry.is_file()]
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")
@@ -0,0 +1,87 @@
+'''
+    Copyright 2022 Illia Shvarov
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+'''
+
+import csv
+import json
+
+
+class ResultWriter:
+    '''
+    This class writes the results of the runs to a file as they come
+
+    The results are written as JSON lines, if the path ends with .jsonl,
+    and as CSV otherwise. The columns of the CSV file are taken from the
+    first result, the missing values are left empty. Every result is
+    flushed at once, so the file can be read while the runs go on.
+
+    Attributes
+    ----------
+    path : str
+        Path of the file to write
+    file : file
+        The opened file, None if it's closed
+    writer : csv.DictWriter
+        The writer of the CSV rows, None until the first one or for JSON
+
+    Methods
+    -------
+    write(row)
+        Writes the result of the run
+    close()
+        Closes the file
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+        Parameters
+        ----------
+        path : str
+            Path of the file to write, it's overwritten if it exists
+        '''
+        self.path = path
+        self.writer = None
+        self.file = open(path, 'w', newline='')
+
+    def write(self, row: dict) -> None:
+        '''Writes the result of the run
+
+        Parameters
+        ----------
+        row : dict
+            The result of the run
+        '''
+        if self.path.endswith('.jsonl'):
+            self.file.write(json.dumps(row) + '\n')
+        else:
+            if self.writer == None:
+                self.writer = csv.DictWriter(self.file, list(row), restval='',
+                                             extrasaction='ignore')
+                self.writer.writeheader()
+
+            self.writer.writerow(row)
+
+        self.file.flush()
+
+    def close(self) -> None:
+        '''Closes the file'''
+
+        if self.file != None:
+            self.file.close()
+            self.file = None
+
+
+if __name__ == '__main__':
+    print("This file shouldn't be used as a separate script!")